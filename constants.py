@@ -4,8 +4,9 @@ Ce fichier centralise toutes les constantes et valeurs de configuration statique
 du projet. Cela facilite la modification des paramètres sans avoir à chercher
 dans tout le code.
 """
-# Importations nécessaires
-from pynput import keyboard  # Pour définir les touches des raccourcis
+# Ce module est importé par le serveur de reconnaissance et le processus audio :
+# il ne doit rien importer qui nécessite un écran (pynput, Qt). Les touches des
+# raccourcis (objets pynput) sont définies dans core/shortcut_listener.py.
 
 # --- Configuration de la Reconnaissance Vocale ---
 # Seuil de sensibilité initial. Sera ajusté par le calibrage.
@@ -14,6 +15,102 @@ DEFAULT_ENERGY_THRESHOLD: int = 4000
 DEFAULT_PAUSE_THRESHOLD: float = 0.8
 # Durée maximale d'enregistrement (en secondes) pour une seule phrase.
 PHRASE_TIME_LIMIT_SECONDS: int = 15
+# Durée maximale (en secondes) d'un appel à l'API de reconnaissance.
+RECOGNITION_TIMEOUT_SECONDS: float = 10.0
+# Délai (en secondes) pendant lequel l'UI attend la fin d'un thread qu'elle arrête.
+# Le processus audio est attendu séparément (AUDIO_ENGINE_STOP_TIMEOUT_SECONDS) :
+# un thread de reconnaissance bloqué dans un appel à l'API ne retient pas le micro.
+WORKER_STOP_TIMEOUT_SECONDS: float = 0.2
+
+
+# --- Configuration du Serveur de Reconnaissance Partagé (optionnel) ---
+# Socket Unix du serveur partagé par tous les utilisateurs de la machine, dans le
+# dossier du service (RuntimeDirectory=pyvoicetochat de systemd).
+RECOGNITION_SERVER_SOCKET: str = "/run/pyvoicetochat/recognition.sock"
+# Nombre de requêtes simultanées vers l'API (moteur google).
+RECOGNITION_SERVER_WORKERS: int = 8
+# Nombre maximal de phrases décodées ensemble (moteur hors ligne).
+RECOGNITION_SERVER_BATCH_SIZE: int = 8
+# Attente maximale (en secondes) pour compléter un lot incomplet.
+RECOGNITION_SERVER_BATCH_WINDOW_SECONDS: float = 0.05
+# Nombre maximal de phrases en attente par client ; au-delà, la phrase est refusée.
+RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT: int = 4
+# Nombre de latences récentes conservées par client pour les statistiques.
+RECOGNITION_SERVER_STATS_WINDOW: int = 1000
+
+
+# --- Configuration de la Réduction de Bruit (activable dans l'interface) ---
+# Durée (en secondes) d'une trame d'analyse spectrale.
+DENOISE_FRAME_SECONDS: float = 0.032
+# Durée (en secondes) du silence en début de phrase utilisée pour estimer le bruit.
+DENOISE_NOISE_ESTIMATE_SECONDS: float = 0.25
+# Poids de l'ancien profil de bruit lors de sa mise à jour à chaque phrase (0 à 1).
+DENOISE_PROFILE_SMOOTHING: float = 0.8
+# Facteur de sur-soustraction du bruit estimé.
+DENOISE_OVER_SUBTRACTION: float = 1.5
+# Gain minimal (en amplitude) appliqué à une composante jugée bruitée.
+DENOISE_GAIN_FLOOR: float = 0.1
+# Facteur temps réel (durée du traitement / durée de la phrase) au-delà duquel
+# la réduction de bruit est contournée pour le reste de la session.
+DENOISE_MAX_REAL_TIME_FACTOR: float = 1.0
+
+# --- Configuration de l'Enregistrement des Sessions (optionnel) ---
+# Dossier où sont écrits les segments du journal des sessions.
+RECORDER_DIR: str = "recordings"
+# Taille (en octets) d'un segment du journal.
+RECORDER_SEGMENT_BYTES: int = 16 * 1024 * 1024
+# Nombre maximal de segments conservés ; les plus anciens sont supprimés.
+RECORDER_MAX_SEGMENTS: int = 20
+# Taille totale maximale (en octets) des segments conservés.
+RECORDER_MAX_BYTES: int = 256 * 1024 * 1024
+
+# --- Configuration des Microphones ---
+# Durée (en secondes) du sondage simultané de tous les micros. L'utilisateur parle pendant ce temps.
+MIC_PROBE_SECONDS: float = 3.0
+# Intervalle (en secondes) entre deux vérifications des cartes son branchées/débranchées
+# (lecture d'un dossier : PortAudio n'est réinitialisé que si elles ont changé).
+MIC_HOTPLUG_POLL_SECONDS: float = 5.0
+
+# --- Configuration du Processus Audio ---
+# Durée d'audio (en secondes) conservée dans le tampon partagé avec le processus audio.
+AUDIO_RING_SECONDS: int = 30
+# Fréquence d'échantillonnage maximale prévue pour dimensionner le tampon partagé.
+AUDIO_RING_MAX_SAMPLE_RATE: int = 48000
+# Nombre de relances consécutives du processus audio avant d'abandonner.
+AUDIO_ENGINE_MAX_RESTARTS: int = 3
+# Délai (en secondes) laissé au processus audio pour s'arrêter avant d'être tué.
+AUDIO_ENGINE_STOP_TIMEOUT_SECONDS: float = 1.0
+
+
+# --- Configuration de l'Indicateur d'Enregistrement ---
+# Affiche un vumètre du niveau d'entrée à côté du cercle rouge.
+SHOW_LEVEL_METER: bool = True
+# Intervalle (en secondes) entre deux lectures du niveau dans le tampon partagé.
+# Les blocs audio intermédiaires sont agrégés (pic) au lieu d'être tous transmis.
+LEVEL_METER_INTERVAL_SECONDS: float = 0.05
+# Fréquence maximale de rafraîchissement du vumètre (images par seconde).
+LEVEL_METER_MAX_FPS: int = 20
+# Niveau RMS correspondant à un vumètre plein.
+LEVEL_METER_FULL_SCALE: int = 8000
+
+
+# --- Configuration de l'Interface ---
+# Intervalle minimal (en millisecondes) entre deux livraisons d'événements des
+# threads de travail à l'interface. Les mises à jour intermédiaires sont fusionnées.
+UI_FRAME_BUDGET_MS: int = 33
+
+
+# --- Configuration du Profileur (diagnostic) ---
+# Dossier où sont écrits les profils.
+PROFILER_DIR: str = "profiles"
+# Durée (en secondes) d'un profilage lancé depuis le menu de l'icône.
+PROFILER_DEFAULT_SECONDS: float = 10.0
+# Durée maximale (en secondes) d'un profilage demandé par le socket de contrôle.
+PROFILER_MAX_SECONDS: float = 120.0
+# Intervalle (en secondes) entre deux relevés des piles de tous les threads.
+PROFILER_SAMPLE_INTERVAL_SECONDS: float = 0.01
+# Nom du socket Unix local acceptant les demandes de profilage (voir scripts/profile_app.py).
+PROFILER_SOCKET_NAME: str = "pyvoicetochat-profiler.sock"
 
 
 # --- Configuration des Fichiers ---
@@ -24,10 +121,6 @@ ICON_FILE: str = "icon.png"
 
 
 # --- Configuration des Raccourcis Clavier ---
-# Ensemble des touches pour le raccourci qui démarre/arrête la reconnaissance.
-RECOGNITION_SHORTCUT: set = {keyboard.Key.ctrl, keyboard.Key.alt, keyboard.KeyCode.from_char('v')}
-# Ensemble des touches pour le raccourci qui lance la définition de la cible.
-DEFINE_TARGET_SHORTCUT: set = {keyboard.Key.ctrl, keyboard.Key.alt, keyboard.KeyCode.from_char('b')}
 # Représentation textuelle des raccourcis, affichée sur les boutons.
 RECOGNITION_SHORTCUT_STR: str = "Ctrl+Alt+V"
 DEFINE_TARGET_SHORTCUT_STR: str = "Ctrl+Alt+B"
@@ -0,0 +1,232 @@
+# core/audio_engine.py
+"""
+Ce module exécute la capture du microphone et le traitement du signal
+(détection de parole, mesure du niveau) dans un processus enfant dédié.
+
+Le processus audio ne partage donc pas le GIL avec la boucle d'événements Qt,
+les hooks pynput et les appels à l'API de reconnaissance : une frappe clavier
+ou un redessin de l'interface ne peut plus provoquer de perte d'audio.
+
+Le code du processus audio est dans core/audio_process.py, qui n'importe ni
+Qt ni pynput. Le processus audio écrit le PCM et les caractéristiques de
+chaque bloc dans un `SharedAudioRing`. Seuls de petits messages de contrôle transitent par un
+tube : début d'écoute, bornes de chaque phrase détectée, erreurs.
+Le parent peut aussi y demander un profilage du processus audio (voir
+core/profiler.py). Si le processus audio meurt (plantage du pilote, signal...), `AudioEngine`
+le détecte et le relance automatiquement. L'arrêt passe par un événement
+partagé entre les processus : le micro est libéré dans le bloc suivant, même
+si le thread de reconnaissance est encore occupé par un appel à l'API.
+"""
+
+# Importations nécessaires
+import multiprocessing  # Pour le processus audio et le tube de contrôle
+import multiprocessing.connection  # Pour attendre la fin du processus audio sans le récolter
+import threading  # Pour protéger le processus audio pendant une relance
+from typing import Optional  # Pour l'annotation de type
+import speech_recognition as sr  # Pour le format AudioData
+from core.audio_ring import SharedAudioRing
+from core.audio_process import audio_process_main  # Point d'entrée du processus audio
+from constants import (PHRASE_TIME_LIMIT_SECONDS, AUDIO_RING_SECONDS, AUDIO_RING_MAX_SAMPLE_RATE,
+                       AUDIO_ENGINE_MAX_RESTARTS, AUDIO_ENGINE_STOP_TIMEOUT_SECONDS)
+
+
+class AudioEngineError(Exception):
+    """Erreur fatale du processus audio (microphone introuvable, relances épuisées...)."""
+
+
+class AudioEngine:
+    """
+    Pilote le processus audio depuis le processus de l'interface.
+
+    Crée le tampon partagé, lance le processus audio, reçoit ses messages et
+    le relance s'il meurt sans avoir signalé d'erreur. Toutes les méthodes sauf
+    `request_stop`, `request_profile` et `release` sont appelées depuis un même
+    thread (celui de la reconnaissance).
+
+    Attributes:
+        ready (bool): Vrai une fois l'ajustement au bruit ambiant terminé.
+        finished (bool): Toujours faux : un micro ne s'épuise pas (voir `ReplayEngine`).
+        restarts (int): Nombre de relances consécutives après un plantage.
+        sample_rate (int): Fréquence d'échantillonnage annoncée par le processus audio.
+        sample_width (int): Taille d'un échantillon annoncée par le processus audio.
+        captured_at (float): Horodatage (epoch, secondes) de la fin de la dernière
+                             phrase renvoyée par `next_utterance`, mesuré à la capture.
+    """
+
+    def __init__(self, energy_threshold: int, pause_threshold: float, device_index: int = None,
+                 phrase_time_limit: float = PHRASE_TIME_LIMIT_SECONDS, wav_path: str = None):
+        """
+        Prépare le moteur audio (aucun processus n'est lancé avant `start`).
+
+        Args:
+            energy_threshold (int): Seuil de sensibilité initial.
+            pause_threshold (float): Silence (s) qui termine une phrase.
+            device_index (int, optional): L'index du microphone à utiliser.
+            phrase_time_limit (float): Durée maximale (s) d'une phrase.
+            wav_path (str, optional): Fichier WAV lu à la place du microphone (tests).
+        """
+        self._params = {
+            "wav_path": wav_path,
+            "device_index": device_index,
+            "energy_threshold": energy_threshold,
+            "pause_threshold": pause_threshold,
+            "phrase_time_limit": phrase_time_limit,
+        }
+        # `spawn` : le processus audio ne doit pas hériter des threads Qt et pynput
+        self._context = multiprocessing.get_context("spawn")
+        # Partagé avec le processus audio, y compris après une relance
+        self._stop_event = self._context.Event()
+        self._ring = None
+        self._process = None
+        # Protège `_process` : `release` peut être appelé pendant une relance
+        self._process_lock = threading.Lock()
+        self._conn = None
+        self._level_cursor = 0
+        # Demande de profilage en attente d'envoi au processus audio
+        self._profile_request = None
+        self.ready = False
+        self.finished = False
+        self.restarts = 0
+        self.sample_rate = None
+        self.sample_width = None
+        self.captured_at = None
+
+    def start(self) -> None:
+        """Crée le tampon partagé et lance le processus audio."""
+        self._ring = SharedAudioRing.create(AUDIO_RING_SECONDS * AUDIO_RING_MAX_SAMPLE_RATE * 2)
+        self._spawn()
+
+    def _spawn(self) -> None:
+        """Lance (ou relance) le processus audio sur le tampon existant, sauf si l'arrêt est demandé."""
+        parent_conn, child_conn = self._context.Pipe()
+        with self._process_lock:
+            if self._stop_event.is_set():
+                # Arrêt demandé entre-temps : le micro ne doit pas être rouvert
+                child_conn.close()
+                parent_conn.close()
+                return
+            self._process = self._context.Process(
+                target=audio_process_main,
+                args=(child_conn, self._stop_event, self._ring.name, self._params),
+                name="pyvoicetochat-audio",
+                daemon=True,
+            )
+            self._process.start()
+        # Seul l'enfant garde son extrémité : sa mort fermera le tube côté parent
+        child_conn.close()
+        self._conn = parent_conn
+        self.ready = False
+
+    def _restart_after_crash(self) -> None:
+        """Relance le processus audio mort, ou lève une erreur si les relances sont épuisées."""
+        self._process.join(timeout=AUDIO_ENGINE_STOP_TIMEOUT_SECONDS)
+        exitcode = self._process.exitcode
+        self._conn.close()
+        if self._stop_event.is_set():
+            # Le processus s'est arrêté parce que l'arrêt a été demandé : pas de relance
+            return
+        if self.restarts >= AUDIO_ENGINE_MAX_RESTARTS:
+            raise AudioEngineError(f"Le processus audio s'est arrêté (code {exitcode}).")
+        self.restarts += 1
+        self._spawn()
+
+    def next_utterance(self, timeout: float) -> Optional[sr.AudioData]:
+        """
+        Attend la prochaine phrase détectée par le processus audio.
+
+        Args:
+            timeout (float): Temps d'attente maximal en secondes.
+
+        Returns:
+            Optional[sr.AudioData]: La phrase, ou None si rien n'est arrivé
+                                    (délai écoulé, message de contrôle, relance).
+
+        Raises:
+            AudioEngineError: Si le processus audio signale une erreur fatale
+                              ou si les relances sont épuisées.
+        """
+        try:
+            if self._profile_request:
+                # Le tube n'est utilisé que depuis ce thread : la demande est envoyée ici
+                request, self._profile_request = self._profile_request, None
+                self._conn.send(("profile",) + request)
+            if not self._conn.poll(timeout):
+                if not self._process.is_alive():
+                    self._restart_after_crash()
+                return None
+            message = self._conn.recv()
+        except (EOFError, OSError):
+            # Le tube a été fermé : le processus audio est mort
+            self._restart_after_crash()
+            return None
+
+        kind = message[0]
+        if kind == "ready":
+            self.ready = True
+            self.sample_rate, self.sample_width = message[1], message[2]
+        elif kind == "error":
+            raise AudioEngineError(message[1])
+        elif kind == "utterance":
+            data = self._ring.read(message[1], message[2])
+            if data is not None:
+                # Une phrase reçue intacte : le processus audio est de nouveau stable
+                self.restarts = 0
+                self.captured_at = message[3]
+                return sr.AudioData(data, self.sample_rate, self.sample_width)
+        return None
+
+    def current_level(self) -> int:
+        """Niveau RMS maximal depuis l'appel précédent, lu dans le tampon partagé."""
+        level, self._level_cursor = self._ring.peak_level(self._level_cursor)
+        return level
+
+    def request_profile(self, duration: float, directory: str) -> None:
+        """
+        Demande un profilage du processus audio (fichiers « audio.* » dans `directory`).
+        Appelable depuis n'importe quel thread ; la demande part au prochain `next_utterance`.
+        """
+        self._profile_request = (duration, directory)
+
+    def request_stop(self) -> None:
+        """
+        Demande l'arrêt du processus audio, qui libère le micro au bloc suivant.
+        Appelable depuis n'importe quel thread, même avant `start`.
+        """
+        self._stop_event.set()
+
+    def release(self, timeout: float = AUDIO_ENGINE_STOP_TIMEOUT_SECONDS) -> None:
+        """
+        Arrête le processus audio et attend qu'il ait libéré le micro, en le
+        terminant s'il ne s'est pas arrêté après `timeout` secondes.
+
+        Appelable depuis n'importe quel thread : l'UI l'appelle à l'arrêt d'une
+        session sans attendre la fin du thread de reconnaissance (qui peut être
+        bloqué dans un appel à l'API), pour qu'une nouvelle session n'ouvre jamais
+        le micro alors que l'ancien processus le capture encore.
+        """
+        self._stop_event.set()
+        with self._process_lock:
+            process = self._process
+        if process is None:
+            return
+        # Attente sur le descripteur du processus : il n'est pas récolté ici, ce
+        # que ferait `join` en concurrence avec le thread de reconnaissance
+        if not multiprocessing.connection.wait([process.sentinel], timeout):
+            process.terminate()
+            multiprocessing.connection.wait([process.sentinel], timeout)
+
+    def stop(self) -> None:
+        """Arrête le processus audio et libère le tampon partagé."""
+        self._stop_event.set()
+        if self._process:
+            self._process.join(timeout=AUDIO_ENGINE_STOP_TIMEOUT_SECONDS)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+        if self._ring:
+            self._ring.close()
+            self._ring.unlink()
+            self._ring = None
@@ -0,0 +1,62 @@
+# core/audio_levels.py
+"""
+Ce module calcule l'énergie (RMS) et l'amplitude maximale des blocs PCM, et
+convertit un bloc multicanal en mono.
+
+Il remplace le module standard `audioop`, obsolète depuis Python 3.11 et
+supprimé en Python 3.13. Les résultats sont les mêmes que ceux d'`audioop`
+(échantillons signés, petit-boutistes, de 1 à 4 octets).
+"""
+
+# Importations nécessaires
+import numpy as np  # Pour le calcul vectorisé sur les échantillons
+
+# Type NumPy des échantillons selon leur taille (les échantillons de 3 octets sont convertis)
+_DTYPES = {1: np.int8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+def samples(buffer: bytes, sample_width: int) -> np.ndarray:
+    """
+    Décode un bloc PCM en tableau d'entiers signés.
+
+    Args:
+        buffer (bytes): Le bloc PCM.
+        sample_width (int): Taille d'un échantillon en octets (1 à 4).
+
+    Returns:
+        np.ndarray: Les échantillons.
+    """
+    if sample_width == 3:
+        raw = np.frombuffer(buffer, dtype=np.uint8)[:len(buffer) // 3 * 3].reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        # Extension du signe depuis 24 bits
+        return np.where(values >= 1 << 23, values - (1 << 24), values)
+    if sample_width not in _DTYPES:
+        raise ValueError(f"Taille d'échantillon non prise en charge : {sample_width}")
+    return np.frombuffer(buffer, dtype=_DTYPES[sample_width], count=len(buffer) // sample_width)
+
+
+def rms(buffer: bytes, sample_width: int) -> int:
+    """Énergie (RMS) d'un bloc, comme `audioop.rms`."""
+    values = samples(buffer, sample_width)
+    if not len(values):
+        return 0
+    return int(np.sqrt(np.mean(np.square(values, dtype=np.float64))))
+
+
+def peak(buffer: bytes, sample_width: int) -> int:
+    """Amplitude absolue maximale d'un bloc, comme `audioop.max`."""
+    values = samples(buffer, sample_width)
+    if not len(values):
+        return 0
+    return int(np.max(np.abs(values.astype(np.int64))))
+
+
+def to_mono(buffer: bytes, sample_width: int, channels: int) -> bytes:
+    """Moyenne des canaux d'un bloc entrelacé, au même format d'échantillon."""
+    values = samples(buffer, sample_width)
+    values = values[:len(values) // channels * channels].reshape(-1, channels)
+    mono = np.mean(values, axis=1, dtype=np.float64).astype(np.int32)
+    if sample_width == 3:
+        return mono.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    return mono.astype(_DTYPES[sample_width]).tobytes()
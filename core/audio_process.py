@@ -0,0 +1,234 @@
+# core/audio_process.py
+"""
+Ce module est le point d'entrée du processus audio lancé par `AudioEngine`
+(voir core/audio_engine.py) : capture du microphone ou d'un fichier WAV,
+mesure de l'énergie, détection des phrases et écriture dans le tampon partagé.
+
+Le processus audio est lancé par `spawn` : il n'importe que ce module et ses
+dépendances (et le module principal du parent, qui ne doit donc importer Qt
+qu'à l'intérieur de sa fonction `main`). Ce module ne doit importer ni Qt, ni
+pynput, ni l'interface : le processus resterait sinon lourd à lancer à chaque
+début d'écoute, et se connecterait à l'écran.
+"""
+
+# Importations nécessaires
+import math  # Pour convertir des durées en nombres de blocs
+import threading  # Pour profiler le processus audio sans interrompre la capture
+import time  # Pour cadencer la lecture d'un fichier WAV et horodater les phrases
+import wave  # Pour la source audio factice (fichier WAV)
+from typing import Optional, Tuple  # Pour l'annotation de type
+import speech_recognition as sr  # Pour l'accès au microphone
+from core.audio_ring import SharedAudioRing
+from core import audio_levels  # Pour calculer l'énergie (RMS) des blocs audio, comme speech_recognition
+from constants import PHRASE_TIME_LIMIT_SECONDS
+
+# Paramètres de détection repris des valeurs par défaut de `sr.Recognizer`
+DYNAMIC_ENERGY_DAMPING = 0.15
+DYNAMIC_ENERGY_RATIO = 1.5
+PHRASE_MIN_SECONDS = 0.3
+NON_SPEAKING_SECONDS = 0.5
+# Durée d'ajustement au bruit ambiant au démarrage du processus audio
+AMBIENT_CALIBRATION_SECONDS = 1.5
+
+
+class EnergyVad:
+    """
+    Détecteur de phrases par seuil d'énergie, équivalent à `sr.Recognizer.listen`.
+
+    Il reçoit le RMS de chaque bloc et la position de fin de ce bloc dans le
+    flux, et renvoie les bornes (début, fin) d'une phrase lorsqu'elle se termine.
+    """
+
+    def __init__(self, sample_rate: int, sample_width: int, chunk: int,
+                 energy_threshold: float, pause_threshold: float,
+                 phrase_time_limit: float = PHRASE_TIME_LIMIT_SECONDS,
+                 dynamic_energy_threshold: bool = True):
+        """
+        Initialise le détecteur.
+
+        Args:
+            sample_rate (int): Fréquence d'échantillonnage du flux.
+            sample_width (int): Taille d'un échantillon en octets.
+            chunk (int): Nombre d'échantillons par bloc.
+            energy_threshold (float): Seuil d'énergie initial.
+            pause_threshold (float): Silence (s) qui termine une phrase.
+            phrase_time_limit (float): Durée maximale (s) d'une phrase.
+            dynamic_energy_threshold (bool): Ajuste le seuil au bruit ambiant.
+        """
+        self.energy_threshold = energy_threshold
+        self.dynamic_energy_threshold = dynamic_energy_threshold
+        self.seconds_per_buffer = chunk / sample_rate
+        self.bytes_per_buffer = chunk * sample_width
+        self._damping = DYNAMIC_ENERGY_DAMPING ** self.seconds_per_buffer
+        self._pause_buffers = math.ceil(pause_threshold / self.seconds_per_buffer)
+        self._phrase_min_buffers = math.ceil(PHRASE_MIN_SECONDS / self.seconds_per_buffer)
+        # Silence conservé avant et après la phrase (jamais plus que le délai de pause)
+        self._padding_buffers = math.ceil(min(NON_SPEAKING_SECONDS, pause_threshold) / self.seconds_per_buffer)
+        self._limit_buffers = math.ceil(phrase_time_limit / self.seconds_per_buffer)
+        self.in_phrase = False
+        self._start = 0
+        self._phrase_buffers = 0
+        self._pause_buffers_seen = 0
+
+    def adjust(self, rms: int) -> None:
+        """Fait converger le seuil vers le bruit ambiant (moyenne pondérée asymétrique)."""
+        target = rms * DYNAMIC_ENERGY_RATIO
+        self.energy_threshold = self.energy_threshold * self._damping + target * (1 - self._damping)
+
+    def process(self, rms: int, end: int) -> Tuple[bool, Optional[Tuple[int, int]]]:
+        """
+        Traite un bloc.
+
+        Args:
+            rms (int): L'énergie du bloc.
+            end (int): La position absolue de la fin du bloc dans le flux.
+
+        Returns:
+            Tuple[bool, Optional[Tuple[int, int]]]: Vrai si le bloc est de la parole,
+            et les bornes de la phrase si ce bloc la termine.
+        """
+        is_speech = rms > self.energy_threshold
+        if not self.in_phrase:
+            if is_speech:
+                # Début de phrase : on garde quelques blocs de silence avant
+                self.in_phrase = True
+                self._start = max(0, end - (self._padding_buffers + 1) * self.bytes_per_buffer)
+                self._phrase_buffers = 0
+                self._pause_buffers_seen = 0
+            elif self.dynamic_energy_threshold:
+                self.adjust(rms)
+            return is_speech, None
+
+        self._phrase_buffers += 1
+        self._pause_buffers_seen = 0 if is_speech else self._pause_buffers_seen + 1
+        if self._pause_buffers_seen <= self._pause_buffers and self._phrase_buffers < self._limit_buffers:
+            return is_speech, None
+
+        # Fin de phrase : on retire le silence final au-delà du rembourrage
+        self.in_phrase = False
+        if self._phrase_buffers - self._pause_buffers_seen < self._phrase_min_buffers:
+            # Trop court (clic, claquement...) : ignoré
+            return is_speech, None
+        trimmed = max(0, self._pause_buffers_seen - self._padding_buffers)
+        return is_speech, (self._start, end - trimmed * self.bytes_per_buffer)
+
+
+class _WavStream:
+    """Flux lisant un fichier WAV mono 16 bits en boucle, au rythme d'un vrai micro."""
+
+    def __init__(self, path: str, chunk: int):
+        self._reader = wave.open(path, 'rb')
+        self._seconds_per_buffer = chunk / self._reader.getframerate()
+        self._next_read = time.monotonic()
+
+    def read(self, size: int) -> bytes:
+        # Attend l'instant où un vrai micro aurait fourni ce bloc
+        self._next_read += self._seconds_per_buffer
+        time.sleep(max(0.0, self._next_read - time.monotonic()))
+        buffer = self._reader.readframes(size)
+        if len(buffer) < size * 2:
+            self._reader.rewind()
+            buffer += self._reader.readframes(size - len(buffer) // 2)
+        return buffer
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+class WavSource(sr.AudioSource):
+    """
+    Source audio factice remplaçant `sr.Microphone` : lit un fichier WAV
+    mono 16 bits en boucle. Sert aux tests d'endurance sans matériel audio.
+    """
+    CHUNK = 1024
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, path: str):
+        self.path = path
+        with wave.open(path, 'rb') as reader:
+            if reader.getnchannels() != 1 or reader.getsampwidth() != self.SAMPLE_WIDTH:
+                raise ValueError(f"{path} : seul le format mono 16 bits est pris en charge.")
+            self.SAMPLE_RATE = reader.getframerate()
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = _WavStream(self.path, self.CHUNK)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream.close()
+        self.stream = None
+
+
+def _start_profiling(duration: float, directory: str, stop_event) -> None:
+    """Profile le processus audio en arrière-plan (fichiers préfixés « audio »)."""
+    # Importé à la demande : le profileur n'est pas nécessaire à la capture
+    from core import profiler
+    # Non démon : un profil interrompu par l'arrêt est tout de même écrit avant la sortie
+    threading.Thread(target=profiler.capture, args=(duration, directory, "audio"),
+                     kwargs={"stop_event": stop_event}, name="profiler").start()
+
+
+def audio_process_main(conn, stop_event, ring_name: str, params: dict) -> None:
+    """
+    Point d'entrée du processus audio (cible du `multiprocessing.Process`).
+
+    Capture le microphone bloc par bloc, écrit chaque bloc dans le tampon
+    partagé, et signale au processus parent les bornes des phrases détectées.
+    S'arrête dès que `stop_event` est levé ou si le parent disparaît.
+
+    Args:
+        conn (Connection): Extrémité enfant du tube de contrôle.
+        stop_event (multiprocessing.Event): Demande d'arrêt, vérifiée à chaque bloc.
+        ring_name (str): Nom du `SharedAudioRing` créé par le parent.
+        params (dict): Paramètres du microphone et de la détection.
+    """
+    ring = SharedAudioRing.attach(ring_name)
+    try:
+        if params["wav_path"]:
+            source = WavSource(params["wav_path"])
+        else:
+            source = sr.Microphone(device_index=params["device_index"])
+        with source:
+            vad = EnergyVad(source.SAMPLE_RATE, source.SAMPLE_WIDTH, source.CHUNK,
+                            params["energy_threshold"], params["pause_threshold"],
+                            params["phrase_time_limit"])
+
+            # Ajustement initial au bruit ambiant (équivalent de `adjust_for_ambient_noise`)
+            for _ in range(int(AMBIENT_CALIBRATION_SECONDS / vad.seconds_per_buffer)):
+                if stop_event.is_set():
+                    return
+                buffer = source.stream.read(source.CHUNK)
+                rms = audio_levels.rms(buffer, source.SAMPLE_WIDTH)
+                ring.write(buffer, rms, False)
+                vad.adjust(rms)
+            conn.send(("ready", source.SAMPLE_RATE, source.SAMPLE_WIDTH))
+
+            while not stop_event.is_set():
+                # Seul message du parent : une demande de profilage. Si le tube est
+                # fermé, `recv` lève EOFError (parent disparu).
+                if conn.poll():
+                    message = conn.recv()
+                    if message[0] == "profile":
+                        _start_profiling(message[1], message[2], stop_event)
+                buffer = source.stream.read(source.CHUNK)
+                rms = audio_levels.rms(buffer, source.SAMPLE_WIDTH)
+                end = ring.write_position + len(buffer)
+                is_speech, phrase = vad.process(rms, end)
+                ring.write(buffer, rms, is_speech)
+                if phrase:
+                    # Instant de la fin de la phrase (le silence final retiré n'en fait pas partie)
+                    captured_at = time.time() - (end - phrase[1]) / (source.SAMPLE_RATE * source.SAMPLE_WIDTH)
+                    conn.send(("utterance",) + phrase + (captured_at,))
+    except (EOFError, BrokenPipeError):
+        # Le parent a disparu : rien à signaler
+        pass
+    except Exception as e:
+        # Erreur fatale (microphone absent...) : signalée, pas de relance
+        try:
+            conn.send(("error", str(e)))
+        except (EOFError, BrokenPipeError):
+            pass
+    finally:
+        ring.close()
+        conn.close()
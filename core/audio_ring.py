@@ -0,0 +1,175 @@
+# core/audio_ring.py
+"""
+Ce module définit un tampon circulaire en mémoire partagée
+(`multiprocessing.shared_memory`) dans lequel le processus audio écrit le
+flux PCM et les caractéristiques de chaque bloc (niveau RMS, parole ou non).
+
+Le processus de l'interface y lit les phrases et le niveau directement,
+sans que l'audio transite par un tube ou soit sérialisé.
+
+Disposition de la mémoire :
+    [en-tête (64 octets)][caractéristiques (FEATURE_SLOTS x 16 octets)][PCM (capacité)]
+
+L'en-tête contient trois entiers 64 bits : la position d'écriture absolue dans
+le flux PCM, le nombre de blocs écrits et la capacité PCM. Les positions sont
+absolues et croissantes : l'octet `n` du flux se trouve à `n % capacité`.
+Il n'y a qu'un seul écrivain (le processus audio).
+"""
+
+# Importations nécessaires
+import struct  # Pour lire et écrire les caractéristiques des blocs
+from multiprocessing import shared_memory  # Pour partager la mémoire entre processus
+from typing import Optional, Tuple  # Pour l'annotation de type
+
+# Taille réservée à l'en-tête
+_HEADER_SIZE = 64
+# Indices des champs de l'en-tête (vu comme un tableau d'entiers 64 bits)
+_WRITE_POS, _FEATURE_COUNT, _CAPACITY = 0, 1, 2
+# Une caractéristique par bloc : fin du bloc dans le flux PCM, RMS, parole (0/1)
+_FEATURE = struct.Struct("<QIi")
+# Nombre de caractéristiques conservées
+FEATURE_SLOTS = 4096
+
+
+class SharedAudioRing:
+    """
+    Tampon circulaire PCM + caractéristiques en mémoire partagée.
+
+    Utiliser `create` dans le processus propriétaire (qui appellera `unlink`)
+    et `attach` dans le processus audio.
+
+    Attributes:
+        name (str): Nom du segment de mémoire partagée, à transmettre au processus audio.
+        capacity (int): Nombre d'octets PCM conservés.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        """
+        Enveloppe un segment de mémoire partagée existant.
+
+        Args:
+            shm (SharedMemory): Le segment, déjà créé ou attaché.
+        """
+        self._shm = shm
+        self.name = shm.name
+        self._header = shm.buf[:24].cast("Q")
+        self.capacity = self._header[_CAPACITY]
+        self._features_offset = _HEADER_SIZE
+        self._pcm_offset = _HEADER_SIZE + FEATURE_SLOTS * _FEATURE.size
+        self._pcm = shm.buf[self._pcm_offset:self._pcm_offset + self.capacity]
+
+    @classmethod
+    def create(cls, capacity: int) -> "SharedAudioRing":
+        """
+        Crée un nouveau segment pouvant contenir `capacity` octets PCM.
+
+        Args:
+            capacity (int): Capacité PCM en octets.
+        """
+        size = _HEADER_SIZE + FEATURE_SLOTS * _FEATURE.size + capacity
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = shm.buf[:24].cast("Q")
+        header[_WRITE_POS] = 0
+        header[_FEATURE_COUNT] = 0
+        header[_CAPACITY] = capacity
+        header.release()
+        return cls(shm)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedAudioRing":
+        """
+        S'attache à un segment créé par un autre processus.
+
+        Args:
+            name (str): Le nom du segment (`SharedAudioRing.name`).
+        """
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def write_position(self) -> int:
+        """Position absolue de la fin du flux PCM écrit."""
+        return self._header[_WRITE_POS]
+
+    @property
+    def feature_count(self) -> int:
+        """Nombre total de blocs écrits depuis la création."""
+        return self._header[_FEATURE_COUNT]
+
+    def write(self, buffer: bytes, rms: int, is_speech: bool) -> int:
+        """
+        Ajoute un bloc PCM et ses caractéristiques. Réservé au processus audio.
+
+        Args:
+            buffer (bytes): Le bloc PCM (doit être plus petit que la capacité).
+            rms (int): L'énergie du bloc.
+            is_speech (bool): Vrai si le bloc a été classé comme de la parole.
+
+        Returns:
+            int: La nouvelle position d'écriture (fin du bloc).
+        """
+        position = self._header[_WRITE_POS]
+        size = len(buffer)
+        offset = position % self.capacity
+        first = min(size, self.capacity - offset)
+        self._pcm[offset:offset + first] = buffer[:first]
+        if first < size:
+            self._pcm[:size - first] = buffer[first:]
+        end = position + size
+        # Les données sont écrites avant de publier la nouvelle position
+        self._header[_WRITE_POS] = end
+
+        count = self._header[_FEATURE_COUNT]
+        slot = self._features_offset + (count % FEATURE_SLOTS) * _FEATURE.size
+        _FEATURE.pack_into(self._shm.buf, slot, end, rms, int(is_speech))
+        self._header[_FEATURE_COUNT] = count + 1
+        return end
+
+    def read(self, start: int, end: int) -> Optional[bytes]:
+        """
+        Copie le flux PCM entre deux positions absolues.
+
+        Returns:
+            Optional[bytes]: Les données, ou None si elles ont déjà été écrasées
+                             par l'écrivain (ou ne sont pas encore écrites).
+        """
+        if end > self.write_position or start < self.write_position - self.capacity:
+            return None
+        offset = start % self.capacity
+        size = end - start
+        first = min(size, self.capacity - offset)
+        data = bytes(self._pcm[offset:offset + first])
+        if first < size:
+            data += bytes(self._pcm[:size - first])
+        # L'écrivain a pu dépasser le début pendant la copie
+        if start < self.write_position - self.capacity:
+            return None
+        return data
+
+    def peak_level(self, since: int) -> Tuple[int, int]:
+        """
+        Calcule le niveau RMS maximal des blocs écrits depuis un compteur donné.
+
+        Args:
+            since (int): Valeur de `feature_count` lors de l'appel précédent.
+
+        Returns:
+            Tuple[int, int]: Le niveau maximal (0 si aucun bloc) et le compteur
+                             actuel, à repasser lors de l'appel suivant.
+        """
+        count = self.feature_count
+        peak = 0
+        for index in range(max(since, count - FEATURE_SLOTS), count):
+            slot = self._features_offset + (index % FEATURE_SLOTS) * _FEATURE.size
+            _end, rms, _speech = _FEATURE.unpack_from(self._shm.buf, slot)
+            peak = max(peak, rms)
+        return peak, count
+
+    def close(self) -> None:
+        """Détache le segment de ce processus."""
+        self._header.release()
+        self._pcm.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Détruit le segment. Réservé au processus propriétaire, après `close`."""
+        self._shm.unlink()
@@ -8,12 +8,17 @@ geler l'interface utilisateur pendant l'analyse du bruit ambiant.
 # Importations nécessaires
 import threading  # Pour créer et gérer le thread
 import speech_recognition as sr  # Bibliothèque principale pour la reconnaissance vocale
+from core.audio_process import WavSource  # Source factice pour les tests sans micro
 from utils.signals import WorkerSignals  # Signaux personnalisés pour la communication inter-threads
 
 # Définit un seuil de sensibilité minimal pour garantir que le calibrage
 # ne produit pas de valeurs trop basses ou négatives, ce qui pourrait rendre
 # la détection de la parole inefficace.
 MIN_ENERGY_THRESHOLD = 500
+# Durée totale d'écoute du bruit ambiant, et durée de chaque tranche entre
+# deux vérifications d'une demande d'arrêt.
+CALIBRATION_SECONDS = 2.0
+CALIBRATION_STEP_SECONDS = 0.25
 
 
 class CalibrationThread(threading.Thread):
@@ -27,24 +32,34 @@ class CalibrationThread(threading.Thread):
     Attributes:
         device_index (int, optional): L'index du périphérique microphone à utiliser.
                                       Si None, le microphone par défaut est utilisé.
+        wav_path (str, optional): Fichier WAV lu à la place du microphone (tests).
         signals (WorkerSignals): Un objet contenant les signaux PyQt pour
                                  communiquer avec le thread principal.
+        _stop_event (threading.Event): Demande d'arrêt, vérifiée entre chaque tranche d'écoute.
     """
 
-    def __init__(self, device_index: int = None):
+    def __init__(self, device_index: int = None, wav_path: str = None):
         """
         Initialise le thread de calibrage.
 
         Args:
             device_index (int, optional): L'index du microphone à utiliser.
                                           Laissé à None pour le système par défaut.
+            wav_path (str, optional): Fichier WAV lu à la place du microphone (tests).
         """
         # Appel du constructeur de la classe parente (threading.Thread)
-        super().__init__()
+        super().__init__(name="calibration")
         # Stocke l'index du microphone pour une utilisation ultérieure
         self.device_index = device_index
+        self.wav_path = wav_path
         # Crée une instance de WorkerSignals pour pouvoir émettre des signaux
         self.signals = WorkerSignals()
+        # Demande d'arrêt : le calibrage s'interrompt sans émettre de résultat
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """Interrompt le calibrage (au plus `CALIBRATION_STEP_SECONDS` plus tard)."""
+        self._stop_event.set()
 
     def run(self) -> None:
         """
@@ -59,10 +74,18 @@ class CalibrationThread(threading.Thread):
             # Crée une instance de l'objet Recognizer
             recognizer = sr.Recognizer()
             # Ouvre le microphone en tant que ressource contextuelle pour garantir sa fermeture
-            with sr.Microphone(device_index=self.device_index) as source:
-                # C'est la fonction clé : elle écoute le bruit ambiant pendant 2 secondes
-                # et ajuste dynamiquement le `energy_threshold` du recognizer.
-                recognizer.adjust_for_ambient_noise(source, duration=2)
+            source = WavSource(self.wav_path) if self.wav_path else sr.Microphone(device_index=self.device_index)
+            with source:
+                # C'est la fonction clé : elle écoute le bruit ambiant et ajuste
+                # dynamiquement le `energy_threshold` du recognizer. L'écoute est
+                # découpée en tranches (le seuil est conservé d'une tranche à l'autre)
+                # pour pouvoir être interrompue.
+                elapsed = 0.0
+                while elapsed < CALIBRATION_SECONDS:
+                    if self._stop_event.is_set():
+                        return
+                    recognizer.adjust_for_ambient_noise(source, duration=CALIBRATION_STEP_SECONDS)
+                    elapsed += CALIBRATION_STEP_SECONDS
 
                 # Applique une sécurité : la valeur calculée ne doit pas être inférieure
                 # à notre seuil minimal défini. `max` choisit la plus grande des deux valeurs.
@@ -0,0 +1,384 @@
+# core/microphones.py
+"""
+Ce module gère la découverte des microphones et le choix automatique du
+meilleur d'entre eux.
+
+Chaque périphérique d'entrée est sondé pendant une courte fenêtre, tous en
+parallèle : on mesure le bruit de fond, l'écrêtage et le rapport signal/bruit
+de la parole. Le profil obtenu pour chaque micro est mis en cache dans la
+configuration, et le micro ayant le meilleur score est utilisé lorsque
+l'utilisateur n'en a pas imposé un. Un micro est identifié par une clé stable
+(nom, API hôte et rang parmi les micros de même nom) : deux micros de même
+modèle restent distincts, et la clé survit aux branchements et aux
+redémarrages, contrairement à l'index PortAudio.
+
+Les périphériques sont manipulés à travers une interface minimale (`name`,
+`key`, `index`, `sample_rate`, `sample_width`, `open()`), ce qui permet de sonder de
+faux périphériques lisant des fichiers WAV (`WavFileDevice`).
+"""
+
+# Importations nécessaires
+import math  # Pour le calcul du rapport signal/bruit en dB
+import os  # Pour l'empreinte des cartes son présentes
+import threading  # Pour les threads de sondage et de surveillance
+import wave  # Pour les faux périphériques basés sur des fichiers WAV
+from concurrent.futures import ThreadPoolExecutor  # Pour sonder les micros en parallèle
+from typing import Dict, List, NamedTuple, Optional  # Pour l'annotation de type
+import speech_recognition as sr  # Pour l'accès à PyAudio
+from core import audio_levels  # Pour l'énergie (RMS) et l'amplitude maximale des blocs
+from utils.signals import WorkerSignals  # Signaux pour communiquer avec l'UI
+from constants import MIC_PROBE_SECONDS, MIC_HOTPLUG_POLL_SECONDS
+
+# Nombre d'échantillons lus par bloc pendant un sondage
+PROBE_CHUNK = 1024
+# Amplitude (16 bits) à partir de laquelle un bloc est considéré comme écrêté
+CLIP_LEVEL = 32000
+# Pénalité de score pour l'écrêtage : 1 dB par pourcent de blocs écrêtés
+CLIPPING_PENALTY_DB = 100
+# Dossier des périphériques son du noyau (Linux) : il change quand une carte est branchée
+SOUND_DEVICES_DIR = "/dev/snd"
+
+# PortAudio n'est pas sûr pour les threads lors de l'initialisation et de
+# l'ouverture/fermeture des flux : ces opérations sont sérialisées.
+_PORTAUDIO_LOCK = threading.Lock()
+
+
+class DeviceProfile(NamedTuple):
+    """Résultat du sondage d'un micro."""
+    name: str
+    key: str  # Identifiant du micro (voir `device_key`)
+    noise_floor: float  # RMS des blocs les plus calmes
+    speech_level: float  # RMS des blocs les plus forts
+    clipping: float  # Proportion de blocs écrêtés (0 à 1)
+    snr_db: float  # Rapport parole/bruit en dB
+    score: float  # Score de classement (plus haut = meilleur)
+
+
+def device_key(name: str, host_api: str, occurrence: int = 0) -> str:
+    """
+    Identifiant stable d'un micro : son nom, son API hôte et son rang parmi
+    les micros de même nom sur cette API.
+
+    Le nom seul ne suffit pas : deux micros de même modèle, ou un même micro
+    vu par plusieurs API hôtes (ALSA, JACK...), portent le même nom. L'index
+    PortAudio ne convient pas non plus : il change dès qu'un périphérique est
+    branché ou débranché.
+    """
+    if occurrence:
+        return f"{name} [{host_api} #{occurrence + 1}]"
+    return f"{name} [{host_api}]"
+
+
+class _PyAudioStream:
+    """Flux d'entrée PyAudio ouvert par `PyAudioDevice.open`."""
+
+    def __init__(self, device: "PyAudioDevice"):
+        pyaudio = sr.Microphone.get_pyaudio()
+        with _PORTAUDIO_LOCK:
+            self._audio = pyaudio.PyAudio()
+            try:
+                self._stream = self._audio.open(
+                    input_device_index=device.index, channels=1, format=pyaudio.paInt16,
+                    rate=device.sample_rate, frames_per_buffer=PROBE_CHUNK, input=True,
+                )
+            except Exception:
+                self._audio.terminate()
+                raise
+
+    def read(self, frames: int) -> bytes:
+        return self._stream.read(frames, exception_on_overflow=False)
+
+    def close(self) -> None:
+        with _PORTAUDIO_LOCK:
+            try:
+                self._stream.close()
+            finally:
+                self._audio.terminate()
+
+
+class PyAudioDevice:
+    """Un périphérique d'entrée réel, ouvert par son index PortAudio et identifié par sa clé."""
+    sample_width = 2
+
+    def __init__(self, index: int, name: str, sample_rate: int, host_api: str = "", occurrence: int = 0):
+        self.index = index
+        self.name = name
+        self.sample_rate = sample_rate
+        self.host_api = host_api
+        self.key = device_key(name, host_api, occurrence)
+
+    def open(self) -> _PyAudioStream:
+        """Ouvre un flux mono 16 bits sur ce périphérique."""
+        return _PyAudioStream(self)
+
+
+class _WavStream:
+    """Flux lisant un fichier WAV en boucle, converti en mono."""
+
+    def __init__(self, device: "WavFileDevice"):
+        self._reader = wave.open(device.path, 'rb')
+        self._channels = self._reader.getnchannels()
+        self._sample_width = self._reader.getsampwidth()
+
+    def read(self, frames: int) -> bytes:
+        buffer = self._reader.readframes(frames)
+        if len(buffer) < frames * self._channels * self._sample_width:
+            # Fin du fichier : reprend au début
+            self._reader.rewind()
+            buffer += self._reader.readframes(frames - len(buffer) // (self._channels * self._sample_width))
+        if self._channels > 1:
+            buffer = audio_levels.to_mono(buffer, self._sample_width, self._channels)
+        return buffer
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+class WavFileDevice:
+    """
+    Un faux périphérique qui « capte » le contenu d'un fichier WAV.
+
+    Permet de tester le sondage et la sélection sans matériel audio.
+    """
+    index = None
+
+    def __init__(self, path: str, name: str = None):
+        self.path = path
+        self.name = name or path
+        self.key = device_key(self.name, "wav")
+        with wave.open(path, 'rb') as reader:
+            self.sample_rate = reader.getframerate()
+            self.sample_width = reader.getsampwidth()
+
+    def open(self) -> _WavStream:
+        """Ouvre le fichier WAV."""
+        return _WavStream(self)
+
+
+def list_input_devices() -> List[PyAudioDevice]:
+    """
+    Énumère les périphériques d'entrée actuellement présents.
+
+    Une nouvelle instance de PyAudio est créée à chaque appel : c'est ce qui
+    permet de voir les micros branchés ou débranchés depuis le lancement. Cette
+    initialisation de PortAudio est coûteuse (elle ouvre chaque carte son) et
+    ne doit pas être faite sur le thread de l'interface.
+    """
+    pyaudio = sr.Microphone.get_pyaudio()
+    devices = []
+    # Nombre de micros déjà vus par (nom, API hôte), pour numéroter les homonymes
+    seen = {}
+    with _PORTAUDIO_LOCK:
+        audio = pyaudio.PyAudio()
+        try:
+            for index in range(audio.get_device_count()):
+                info = audio.get_device_info_by_index(index)
+                if info.get("maxInputChannels", 0) > 0:
+                    name = info.get("name")
+                    host_api = audio.get_host_api_info_by_index(info["hostApi"]).get("name", "")
+                    occurrence = seen.get((name, host_api), 0)
+                    seen[(name, host_api)] = occurrence + 1
+                    devices.append(PyAudioDevice(index, name, int(info["defaultSampleRate"]), host_api, occurrence))
+        finally:
+            audio.terminate()
+    return devices
+
+
+def probe_device(device, duration: float = MIC_PROBE_SECONDS,
+                 stop_event: threading.Event = None) -> Optional[DeviceProfile]:
+    """
+    Écoute un périphérique pendant `duration` secondes et mesure sa qualité.
+
+    Le bruit de fond est le RMS du décile le plus calme des blocs, le niveau de
+    parole celui du décile le plus fort : l'utilisateur doit parler pendant
+    une partie de la fenêtre.
+
+    Args:
+        device: Le périphérique à sonder.
+        duration (float): Durée du sondage en secondes.
+        stop_event (threading.Event, optional): Interrompt le sondage lorsqu'il est levé.
+
+    Returns:
+        Optional[DeviceProfile]: Le profil, ou None si le périphérique n'a pas pu être lu
+                                 ou si le sondage a été interrompu.
+    """
+    levels = []
+    clipped = 0
+    try:
+        stream = device.open()
+        try:
+            for _ in range(max(1, int(duration * device.sample_rate / PROBE_CHUNK))):
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                buffer = stream.read(PROBE_CHUNK)
+                levels.append(audio_levels.rms(buffer, device.sample_width))
+                # Amplitude ramenée sur 16 bits pour comparer à CLIP_LEVEL
+                peak = audio_levels.peak(buffer, device.sample_width) * 32768 // (1 << (8 * device.sample_width - 1))
+                if peak >= CLIP_LEVEL:
+                    clipped += 1
+        finally:
+            stream.close()
+    except Exception:
+        # Périphérique occupé, débranché pendant le sondage, format refusé...
+        return None
+
+    levels.sort()
+    decile = max(1, len(levels) // 10)
+    noise_floor = sum(levels[:decile]) / decile
+    speech_level = sum(levels[-decile:]) / decile
+    clipping = clipped / len(levels)
+    snr_db = 20 * math.log10(max(speech_level, 1) / max(noise_floor, 1))
+    score = snr_db - clipping * CLIPPING_PENALTY_DB
+    return DeviceProfile(device.name, device.key, noise_floor, speech_level, clipping, snr_db, score)
+
+
+def probe_devices(devices: list, duration: float = MIC_PROBE_SECONDS,
+                  stop_event: threading.Event = None) -> List[DeviceProfile]:
+    """
+    Sonde tous les périphériques en parallèle : la durée totale est celle
+    d'un seul sondage, quel que soit le nombre de micros.
+
+    Returns:
+        List[DeviceProfile]: Les profils des périphériques lisibles.
+    """
+    if not devices:
+        return []
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        profiles = executor.map(lambda device: probe_device(device, duration, stop_event), devices)
+    return [profile for profile in profiles if profile is not None]
+
+
+def select_best(profiles: List[DeviceProfile]) -> Optional[DeviceProfile]:
+    """Renvoie le profil ayant le meilleur score, ou None s'il n'y en a aucun."""
+    return max(profiles, key=lambda profile: profile.score, default=None)
+
+
+def resolve_device_index(choice: Optional[str], profiles: Dict[str, dict], devices: list) -> Optional[int]:
+    """
+    Détermine l'index PortAudio du micro à utiliser, sans énumérer les
+    périphériques : la liste est celle tenue à jour par `MicrophoneWatcherThread`.
+
+    Args:
+        choice (str, optional): La clé du micro imposé par l'utilisateur, ou None
+                                pour le choix automatique.
+        profiles (Dict[str, dict]): Les profils en cache, indexés par clé de micro.
+        devices (list): Les périphériques d'entrée présents.
+
+    Returns:
+        Optional[int]: L'index du micro, ou None pour le micro par défaut du système
+                       (micro imposé absent, ou aucun profil connu).
+    """
+    devices = {device.key: device for device in devices}
+    if choice is not None:
+        device = devices.get(choice)
+        return device.index if device else None
+    known = [DeviceProfile(**profiles[key]) for key in devices if key in profiles]
+    best = select_best(known)
+    return devices[best.key].index if best else None
+
+
+class MicrophoneProbeThread(threading.Thread):
+    """
+    Thread qui énumère les micros puis les sonde tous en parallèle.
+    Émet `microphones_probed` avec la liste des profils obtenus.
+    """
+
+    def __init__(self, devices: list = None, duration: float = MIC_PROBE_SECONDS):
+        """
+        Args:
+            devices (list, optional): Les périphériques à sonder. Par défaut,
+                                      tous les périphériques d'entrée présents.
+            duration (float): Durée du sondage en secondes.
+        """
+        super().__init__(name="microphone-probe")
+        self.devices = devices
+        self.duration = duration
+        self.signals = WorkerSignals()
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """Interrompt le sondage (au bloc suivant) sans émettre de résultat."""
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Sonde les micros et émet le résultat."""
+        try:
+            devices = self.devices if self.devices is not None else list_input_devices()
+            profiles = probe_devices(devices, self.duration, self._stop_event)
+            if not self._stop_event.is_set():
+                self.signals.microphones_probed.emit(profiles)
+        except Exception as e:
+            self.signals.error_occurred.emit(f"Erreur de détection des micros : {e}")
+
+
+def _hotplug_signature() -> Optional[tuple]:
+    """
+    Empreinte peu coûteuse des cartes son présentes, sans initialiser PortAudio.
+
+    Returns:
+        Optional[tuple]: Le contenu de `SOUND_DEVICES_DIR`, ou None si le système
+                         ne fournit pas ce dossier (Windows, macOS).
+    """
+    try:
+        return tuple(sorted(os.listdir(SOUND_DEVICES_DIR)))
+    except OSError:
+        return None
+
+
+class MicrophoneWatcherThread(threading.Thread):
+    """
+    Thread qui surveille le branchement et le débranchement des micros.
+    Émet `microphones_changed` avec la liste des périphériques lorsqu'elle change.
+
+    PortAudio n'est réinitialisé pour énumérer les micros qu'au démarrage, sur
+    demande (`request_scan`) et lorsque l'empreinte des cartes son change. Sur
+    les systèmes sans empreinte, la liste n'est relue que sur demande.
+
+    Attributes:
+        devices (list): Les périphériques d'entrée lors de la dernière énumération.
+    """
+
+    def __init__(self, interval: float = MIC_HOTPLUG_POLL_SECONDS):
+        super().__init__(name="microphone-watcher")
+        self.interval = interval
+        self.signals = WorkerSignals()
+        self.devices = []
+        self._keys = None
+        self._stopping = False
+        self._scan_requested = True
+        # Réveille le thread avant la fin de l'intervalle (arrêt ou énumération demandée)
+        self._wake = threading.Event()
+
+    def stop(self) -> None:
+        """Arrête la surveillance."""
+        self._stopping = True
+        self._wake.set()
+
+    def request_scan(self) -> None:
+        """Demande une nouvelle énumération des micros, faite sur ce thread."""
+        self._scan_requested = True
+        self._wake.set()
+
+    def _scan(self) -> None:
+        """Énumère les micros et émet la liste si elle a changé."""
+        try:
+            devices = list_input_devices()
+        except Exception:
+            devices = []
+        keys = [device.key for device in devices]
+        if keys != self._keys:
+            self._keys = keys
+            self.devices = devices
+            self.signals.microphones_changed.emit(devices)
+
+    def run(self) -> None:
+        """Surveille l'empreinte des cartes son et énumère les micros quand elle change."""
+        signature = None
+        while not self._stopping:
+            current = _hotplug_signature()
+            if self._scan_requested or (current is not None and current != signature):
+                self._scan_requested = False
+                signature = current
+                self._scan()
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,315 @@
+# core/profiler.py
+"""
+Ce module fournit un profileur par échantillonnage activable à chaud, depuis
+le menu de l'icône ou un socket Unix local, pour trouver ce qui ralentit la
+dictée sur la machine d'un utilisateur sans relancer l'application sous un
+profileur.
+
+Pendant N secondes, un thread dédié relève à intervalle régulier la pile de
+tous les autres threads (`sys._current_frames`) : thread Qt principal (où le
+texte reconnu est tapé), reconnaissance, raccourcis, etc. Les threads ne sont
+jamais interrompus : le coût se limite à un parcours de piles par échantillon.
+
+Trois fichiers sont écrits par processus profilé :
+    <préfixe>.collapsed        piles repliées (flamegraph.pl, inferno, speedscope...)
+    <préfixe>.speedscope.json  un profil par thread, à ouvrir sur https://www.speedscope.app
+    <préfixe>-threads.txt      temps CPU de chaque thread et fonctions les plus vues
+
+Les piles sont relevées en temps réel : un thread bloqué (attente du micro,
+de l'API...) apparaît dans sa fonction d'attente. Le résumé CPU permet de
+distinguer un thread occupé d'un thread qui attend.
+
+Le processus audio (voir core/audio_engine.py) est profilé par le même code,
+dans son propre processus, sur demande du processus principal. Ce module
+n'importe donc pas Qt : les threads qui dialoguent avec l'UI (profilage et
+socket de contrôle) sont dans core/profiler_threads.py.
+"""
+
+# Importations nécessaires
+import collections  # Pour compter les piles et les fonctions
+import getpass  # Pour un nom de socket propre à chaque utilisateur
+import json  # Pour le format speedscope
+import os  # Pour les fichiers de sortie et le temps CPU des threads
+import stat  # Pour vérifier le dossier du socket de contrôle
+import sys  # Pour relever les piles de tous les threads
+import tempfile  # Pour placer le socket de contrôle
+import threading  # Pour le thread d'échantillonnage
+import time  # Pour cadencer les échantillons
+from typing import Dict, List, Optional  # Pour l'annotation de type
+from constants import PROFILER_SAMPLE_INTERVAL_SECONDS, PROFILER_SOCKET_NAME
+
+# Nombre d'échantillons entre deux relevés du temps CPU des threads
+CPU_POLL_SAMPLES = 10
+# Nombre de fonctions affichées par thread dans le résumé
+SUMMARY_TOP_FUNCTIONS = 5
+
+
+def _short_path(filename: str) -> str:
+    """Raccourcit un chemin de fichier source à « dossier/fichier.py »."""
+    return os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+
+
+def _thread_cpu_times(native_ids: Dict[int, int]) -> Dict[int, float]:
+    """
+    Relève le temps CPU (utilisateur + système, en secondes) de chaque thread.
+
+    Args:
+        native_ids (Dict[int, int]): Identifiant Python -> identifiant système des threads.
+
+    Returns:
+        Dict[int, float]: Identifiant Python -> temps CPU. Vide si le système
+                          n'expose pas ces valeurs (seul Linux est pris en charge).
+    """
+    times = {}
+    ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    for ident, native_id in native_ids.items():
+        try:
+            with open(f"/proc/self/task/{native_id}/stat") as f:
+                # Le nom du thread peut contenir des espaces : on découpe après la parenthèse
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        times[ident] = (int(fields[11]) + int(fields[12])) / ticks
+    return times
+
+
+class SamplingProfiler:
+    """
+    Relève les piles de tous les threads du processus et les agrège.
+
+    Attributes:
+        interval (float): Intervalle (secondes) visé entre deux échantillons.
+        duration (float): Durée réelle de la dernière session de profilage.
+        process_cpu (float): Temps CPU du processus pendant cette session.
+    """
+
+    def __init__(self, interval: float = PROFILER_SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.duration = 0.0
+        self.process_cpu = 0.0
+        # Trames connues (nom, fichier, ligne) et index de chaque objet code
+        self._frames = []
+        self._frame_index = {}
+        # (nom du thread, identifiant) -> liste de (pile, poids en secondes)
+        self._samples = collections.defaultdict(list)
+        # Identifiant -> temps CPU au premier et au dernier relevé
+        self._cpu_first = {}
+        self._cpu_last = {}
+        self._native_ids = {}
+        self._own_ident = None
+        self._last_sample = None
+
+    def _frame_id(self, code) -> int:
+        """Renvoie l'index de la trame correspondant à un objet code."""
+        index = self._frame_index.get(code)
+        if index is None:
+            index = len(self._frames)
+            name = getattr(code, "co_qualname", code.co_name)
+            self._frames.append((name, code.co_filename, code.co_firstlineno))
+            self._frame_index[code] = index
+        return index
+
+    def sample(self) -> None:
+        """Relève la pile de chaque thread, sauf celui du profileur."""
+        now = time.perf_counter()
+        # Chaque échantillon pèse le temps réellement écoulé depuis le précédent
+        weight = now - self._last_sample if self._last_sample else self.interval
+        self._last_sample = now
+        threads = threading.enumerate()
+        names = {thread.ident: thread.name for thread in threads}
+        self._native_ids.update((thread.ident, thread.native_id) for thread in threads
+                                if getattr(thread, "native_id", None))
+        for ident, frame in sys._current_frames().items():
+            if ident == self._own_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self._samples[(names.get(ident, f"thread-{ident}"), ident)].append((tuple(stack), weight))
+
+    def _poll_cpu(self) -> None:
+        """Met à jour le temps CPU connu de chaque thread."""
+        for ident, seconds in _thread_cpu_times(self._native_ids).items():
+            self._cpu_first.setdefault(ident, seconds)
+            self._cpu_last[ident] = seconds
+
+    def run(self, duration: float, stop_event=None) -> None:
+        """
+        Échantillonne le processus pendant `duration` secondes, depuis le thread appelant.
+
+        Args:
+            duration (float): Durée du profilage en secondes.
+            stop_event (optional): Événement interrompant le profilage s'il est levé.
+        """
+        self._own_ident = threading.get_ident()
+        self._native_ids[self._own_ident] = threading.get_native_id()
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        deadline = started + duration
+        next_tick = started
+        count = 0
+        while True:
+            self.sample()
+            if count % CPU_POLL_SAMPLES == 0:
+                self._poll_cpu()
+            count += 1
+            # Cadence fixe : un échantillon en retard ne décale pas les suivants
+            next_tick += self.interval
+            now = time.perf_counter()
+            if next_tick >= deadline:
+                break
+            delay = max(0.0, next_tick - now)
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    break
+            else:
+                time.sleep(delay)
+        self._poll_cpu()
+        self.duration = time.perf_counter() - started
+        self.process_cpu = time.process_time() - cpu_started
+
+    def write(self, directory: str, prefix: str) -> List[str]:
+        """
+        Écrit les piles repliées, le profil speedscope et le résumé par thread.
+
+        Args:
+            directory (str): Dossier de sortie (créé si besoin).
+            prefix (str): Préfixe des noms de fichiers (par exemple « app » ou « audio »).
+
+        Returns:
+            List[str]: Les chemins des fichiers écrits.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, prefix)
+        paths = [f"{base}.collapsed", f"{base}.speedscope.json", f"{base}-threads.txt"]
+        with open(paths[0], "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(paths[1], "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(f"PyVoiceToChat ({prefix})"), f)
+        with open(paths[2], "w", encoding="utf-8") as f:
+            f.write(self.summary())
+        return paths
+
+    def _label(self, index: int) -> str:
+        """Nom lisible d'une trame, sans « ; » (séparateur du format replié)."""
+        name, filename, line = self._frames[index]
+        return f"{name} ({_short_path(filename)}:{line})".replace(";", ",")
+
+    def collapsed(self) -> str:
+        """Piles repliées : « thread;appelant;...;appelé nombre » par ligne."""
+        lines = []
+        for (thread_name, _ident), samples in sorted(self._samples.items()):
+            counts = collections.Counter(stack for stack, _weight in samples)
+            for stack, count in counts.most_common():
+                frames = ";".join([thread_name.replace(";", ",")] + [self._label(i) for i in stack])
+                lines.append(f"{frames} {count}\n")
+        return "".join(lines)
+
+    def speedscope(self, name: str) -> dict:
+        """Profil au format speedscope : un profil échantillonné par thread."""
+        frames = [{"name": frame_name, "file": filename, "line": line}
+                  for frame_name, filename, line in self._frames]
+        profiles = []
+        for (thread_name, _ident), samples in sorted(self._samples.items()):
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weight for _stack, weight in samples),
+                "samples": [list(stack) for stack, _weight in samples],
+                "weights": [weight for _stack, weight in samples],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "pyvoicetochat",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def summary(self) -> str:
+        """Résumé texte : temps CPU de chaque thread et fonctions où il a été vu."""
+        lines = [
+            f"Profil de {self.duration:.1f} s, un échantillon toutes les {self.interval * 1000:.0f} ms",
+            f"CPU du processus : {self.process_cpu:.2f} s ({self.process_cpu / max(self.duration, 1e-9):.0%})",
+            "",
+        ]
+        overhead = self._cpu_delta(self._own_ident)
+        if overhead is not None:
+            lines.append(f"Surcoût du profileur : {overhead:.2f} s CPU")
+            lines.append("")
+        entries = []
+        for (thread_name, ident), samples in self._samples.items():
+            entries.append((self._cpu_delta(ident), thread_name, samples))
+        # Les threads les plus gourmands d'abord (CPU inconnu en dernier)
+        entries.sort(key=lambda entry: -1.0 if entry[0] is None else entry[0], reverse=True)
+        for cpu, thread_name, samples in entries:
+            cpu_text = "CPU inconnu" if cpu is None else f"CPU {cpu:.2f} s ({cpu / max(self.duration, 1e-9):.0%})"
+            lines.append(f"{thread_name} : {cpu_text}, {len(samples)} échantillons")
+            # Fonction en haut de pile (là où le thread se trouvait) et fonctions présentes dans la pile
+            leaves = collections.Counter(stack[-1] for stack, _weight in samples if stack)
+            inclusive = collections.Counter(index for stack, _weight in samples for index in set(stack))
+            lines.append("  en haut de pile :")
+            for index, count in leaves.most_common(SUMMARY_TOP_FUNCTIONS):
+                lines.append(f"    {count / len(samples):6.1%}  {self._label(index)}")
+            lines.append("  dans la pile :")
+            for index, count in inclusive.most_common(SUMMARY_TOP_FUNCTIONS):
+                lines.append(f"    {count / len(samples):6.1%}  {self._label(index)}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _cpu_delta(self, ident: int) -> Optional[float]:
+        """Temps CPU consommé par un thread pendant la session, ou None s'il est inconnu."""
+        if ident not in self._cpu_last:
+            return None
+        return self._cpu_last[ident] - self._cpu_first[ident]
+
+
+def capture(duration: float, directory: str, prefix: str,
+            interval: float = PROFILER_SAMPLE_INTERVAL_SECONDS, stop_event=None) -> List[str]:
+    """
+    Profile le processus courant depuis le thread appelant, puis écrit les fichiers.
+
+    Args:
+        duration (float): Durée du profilage en secondes.
+        directory (str): Dossier de sortie.
+        prefix (str): Préfixe des noms de fichiers.
+        interval (float): Intervalle entre deux échantillons.
+        stop_event (optional): Interrompt le profilage (le profil partiel est écrit).
+
+    Returns:
+        List[str]: Les chemins des fichiers écrits.
+    """
+    profiler = SamplingProfiler(interval)
+    profiler.run(duration, stop_event)
+    return profiler.write(directory, prefix)
+
+
+def default_socket_path() -> str:
+    """Chemin du socket de contrôle, dans un dossier réservé à l'utilisateur (voir `ensure_private_dir`)."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, PROFILER_SOCKET_NAME)
+    return os.path.join(tempfile.gettempdir(), f"pyvoicetochat-{getpass.getuser()}", PROFILER_SOCKET_NAME)
+
+
+def ensure_private_dir(directory: str) -> None:
+    """
+    Crée `directory` accessible au seul utilisateur, ou vérifie qu'un dossier
+    existant l'est. Un socket créé dedans est injoignable par les autres
+    utilisateurs dès sa création, quels que soient ses propres droits.
+
+    Raises:
+        OSError: Si le chemin existe sans être un dossier (lien compris)
+                 appartenant à l'utilisateur et fermé aux autres.
+    """
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(f"{directory} n'est pas un dossier réservé à l'utilisateur")
@@ -0,0 +1,196 @@
+# core/profiler_threads.py
+"""
+Ce module contient les threads qui relient le profileur (voir core/profiler.py)
+à l'UI : le profilage de l'application lancé depuis le menu de l'icône, et le
+socket de contrôle utilisé par scripts/profile_app.py.
+
+Ils sont séparés du profileur car ils émettent des signaux Qt : le processus
+audio, qui importe core/profiler.py pour se profiler, n'a pas à charger Qt.
+"""
+
+# Importations nécessaires
+import math  # Pour refuser les durées non finies
+import os  # Pour le fichier du socket de contrôle
+import queue  # Pour recevoir la réponse de l'UI à une demande de profilage
+import socket  # Pour le socket de contrôle
+import stat  # Pour vérifier un fichier existant à l'emplacement du socket
+import threading  # Pour les threads de profilage et du socket
+from core.profiler import SamplingProfiler, default_socket_path, ensure_private_dir
+from utils.signals import WorkerSignals  # Signaux pour communiquer avec l'UI
+from constants import PROFILER_SAMPLE_INTERVAL_SECONDS, PROFILER_DEFAULT_SECONDS, PROFILER_MAX_SECONDS
+
+# Délai (secondes) de réponse de l'UI à une demande reçue sur le socket
+SOCKET_REPLY_TIMEOUT_SECONDS = 5.0
+
+
+class ProfilerThread(threading.Thread):
+    """
+    Thread qui profile l'application pendant une durée donnée puis écrit les fichiers.
+    Émet `profile_complete` avec le dossier de sortie, ou `error_occurred`.
+    """
+
+    def __init__(self, duration: float, directory: str, prefix: str = "app",
+                 interval: float = PROFILER_SAMPLE_INTERVAL_SECONDS):
+        """
+        Args:
+            duration (float): Durée du profilage en secondes.
+            directory (str): Dossier de sortie.
+            prefix (str): Préfixe des noms de fichiers.
+            interval (float): Intervalle entre deux échantillons.
+        """
+        super().__init__(name="profiler")
+        self.duration = duration
+        self.directory = directory
+        self.prefix = prefix
+        self.interval = interval
+        self.signals = WorkerSignals()
+        self._stop_event = threading.Event()
+        self.daemon = True
+
+    def stop(self) -> None:
+        """Interrompt le profilage sans écrire de fichiers."""
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Échantillonne l'application puis écrit le profil."""
+        profiler = SamplingProfiler(self.interval)
+        profiler.run(self.duration, self._stop_event)
+        if self._stop_event.is_set():
+            return
+        try:
+            profiler.write(self.directory, self.prefix)
+        except OSError as e:
+            self.signals.error_occurred.emit(f"Impossible d'écrire le profil : {e}")
+            return
+        self.signals.profile_complete.emit(self.directory)
+
+
+class ProfilerSocketThread(threading.Thread):
+    """
+    Thread qui accepte les demandes de profilage sur un socket Unix local.
+
+    Protocole : le client envoie une ligne « profile [secondes] ». Le serveur
+    répond « started <dossier> » puis, une fois les fichiers écrits,
+    « done <dossier> ». Il répond « busy ... » si un profilage est déjà en
+    cours et « error ... » en cas de problème.
+
+    La demande est transmise à l'UI par `profile_requested(secondes, réponses)` :
+    l'UI dépose ses réponses dans la file `réponses`.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str, optional): Chemin du socket. Par défaut, `default_socket_path()`.
+                                  Son dossier doit être réservé à l'utilisateur.
+        """
+        super().__init__(name="profiler-socket")
+        self.path = path or default_socket_path()
+        self.signals = WorkerSignals()
+        self._stop_event = threading.Event()
+        # Numéro d'inode du socket créé, pour ne jamais supprimer un autre fichier
+        self._inode = None
+        self.daemon = True
+
+    def stop(self) -> None:
+        """Arrête le serveur (au plus une demi-seconde plus tard)."""
+        self._stop_event.set()
+
+    def _bind(self) -> socket.socket:
+        """
+        Crée le socket d'écoute dans un dossier réservé à l'utilisateur, en
+        remplaçant un socket orphelin d'une exécution précédente. Aucun autre
+        fichier n'est jamais supprimé.
+        """
+        # Le dossier, fermé aux autres utilisateurs, protège le socket dès `bind` :
+        # pas de fenêtre entre sa création et un changement de ses droits
+        ensure_private_dir(os.path.dirname(self.path))
+        if os.path.lexists(self.path):
+            info = os.lstat(self.path)
+            if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+                raise OSError(f"{self.path} existe et n'est pas un socket de l'application")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.remove(self.path)
+            else:
+                raise OSError(f"{self.path} est déjà utilisé par une autre instance")
+            finally:
+                probe.close()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        # Identité du fichier créé : seul celui-ci sera supprimé à l'arrêt
+        self._inode = os.lstat(self.path).st_ino
+        server.listen(1)
+        # Réveil régulier pour prendre en compte `stop`
+        server.settimeout(0.5)
+        return server
+
+    def _remove_socket_file(self) -> None:
+        """Supprime le fichier du socket, s'il est toujours celui créé par `_bind`."""
+        try:
+            if os.lstat(self.path).st_ino == self._inode:
+                os.remove(self.path)
+        except OSError:
+            pass
+
+    def run(self) -> None:
+        """Accepte et traite les demandes, une à la fois."""
+        if not hasattr(socket, "AF_UNIX"):
+            # Système sans sockets Unix : seul le menu de l'icône est disponible
+            return
+        try:
+            server = self._bind()
+        except OSError as e:
+            print(f"Socket de profilage indisponible : {e}")
+            return
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    try:
+                        self._handle(conn)
+                    except OSError:
+                        # Client parti avant la réponse
+                        pass
+        finally:
+            server.close()
+            self._remove_socket_file()
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Traite une demande et relaie les réponses de l'UI au client."""
+        conn.settimeout(SOCKET_REPLY_TIMEOUT_SECONDS)
+        with conn.makefile("r", encoding="utf-8") as reader:
+            words = reader.readline().split()
+        if not words or words[0] != "profile":
+            conn.sendall("error commande inconnue (attendu : profile [secondes])\n".encode("utf-8"))
+            return
+        try:
+            seconds = float(words[1]) if len(words) > 1 else PROFILER_DEFAULT_SECONDS
+        except ValueError:
+            conn.sendall(f"error durée invalide : {words[1]}\n".encode("utf-8"))
+            return
+        if not math.isfinite(seconds):
+            # « nan » passerait le bornage ci-dessous (toute comparaison est fausse)
+            conn.sendall(f"error durée invalide : {words[1]}\n".encode("utf-8"))
+            return
+        seconds = min(max(seconds, 0.1), PROFILER_MAX_SECONDS)
+
+        replies = queue.Queue()
+        self.signals.profile_requested.emit(seconds, replies)
+        timeout = SOCKET_REPLY_TIMEOUT_SECONDS
+        while True:
+            try:
+                kind, detail = replies.get(timeout=timeout)
+            except queue.Empty:
+                conn.sendall("error l'application ne répond pas\n".encode("utf-8"))
+                return
+            conn.sendall(f"{kind} {detail}\n".encode("utf-8"))
+            if kind != "started":
+                return
+            # Le profil est écrit à la fin de la durée demandée
+            timeout = seconds + SOCKET_REPLY_TIMEOUT_SECONDS
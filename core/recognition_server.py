@@ -0,0 +1,727 @@
+# core/recognition_server.py
+"""
+Ce module fournit un serveur de reconnaissance local partagé, pour les
+machines où de nombreux utilisateurs lancent PyVoiceToChat (serveurs de
+terminaux) : au lieu que chaque instance charge son propre moteur et ouvre
+ses propres connexions, les `VoiceRecognizerThread` envoient leurs phrases à
+un seul serveur par un socket Unix.
+
+Le serveur détient un seul moteur :
+- `GoogleBackend` : un jeu de connexions à l'API partagé par tous les
+  clients (l'API ne traite qu'une phrase par requête : le débit vient des
+  requêtes simultanées) ;
+- `WhisperBackend` : un modèle Whisper hors ligne chargé une seule fois et
+  gardé en mémoire, qui décode les phrases par lots.
+
+Les phrases en attente sont regroupées en lots par une file équitable
+(`FairQueue`) : chaque lot prend une phrase par utilisateur, à tour de rôle,
+si bien qu'un utilisateur très bavard ne retarde pas les autres. La file de
+chaque utilisateur est bornée : au-delà, la phrase est refusée immédiatement.
+Le serveur tient des statistiques de latence par utilisateur, consultables à
+chaud.
+
+Le regroupement en lots n'accélère que les moteurs qui décodent plusieurs
+phrases à la fois (`WhisperBackend`). `GoogleBackend` traite une phrase par
+requête (`max_batch = 1`) : son débit vient uniquement des requêtes
+simultanées. Les gains de débit mesurés par scripts/recognition_load.py
+l'ont été avec son moteur simulé, pas avec un moteur réel.
+
+Sécurité : le socket est créé dans un dossier appartenant au service et
+modifiable par lui seul (par exemple `RuntimeDirectory=pyvoicetochat` de
+systemd, soit /run/pyvoicetochat) ; ses droits d'accès viennent du umask du
+service (voir scripts/recognition_server.py). L'utilisateur de chaque
+connexion est lu sur le socket (`SO_PEERCRED`, Linux) : c'est lui, et non un
+nom annoncé par le client, qui détermine la file d'attente et les
+statistiques. Un utilisateur ne voit que ses propres statistiques ; seul
+l'utilisateur du serveur voit celles de tous.
+
+Protocole (trames `[type][longueur][données]`) :
+    HELLO      client -> serveur   (vide) ; ouvre une session de reconnaissance
+    RECOGNIZE  client -> serveur   [_RECOGNIZE][langue][PCM]
+    RESULT     serveur -> client   [_RESULT][texte ou message d'erreur]
+    STATS      client -> serveur   (vide) ; le serveur répond STATS avec un JSON
+"""
+
+# Importations nécessaires
+import collections  # Pour les files par utilisateur et les fenêtres de latences
+import json  # Pour les statistiques
+import os  # Pour le fichier du socket et l'utilisateur du serveur
+import socket  # Pour la communication avec les clients
+import stat  # Pour vérifier le dossier et le fichier du socket
+import struct  # Pour le format binaire des trames et l'identité des clients
+import threading  # Pour les threads du serveur
+import time  # Pour mesurer les latences
+from typing import Dict, List, Optional, Tuple  # Pour l'annotation de type
+import speech_recognition as sr  # Pour le format AudioData et les erreurs de reconnaissance
+from constants import (RECOGNITION_TIMEOUT_SECONDS, RECOGNITION_SERVER_SOCKET, RECOGNITION_SERVER_WORKERS,
+                       RECOGNITION_SERVER_BATCH_SIZE, RECOGNITION_SERVER_BATCH_WINDOW_SECONDS,
+                       RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT, RECOGNITION_SERVER_STATS_WINDOW)
+
+# Types de trames
+HELLO, RECOGNIZE, RESULT, STATS = 1, 2, 3, 4
+# Type et longueur des données
+_FRAME = struct.Struct("<BI")
+# Identifiant de la demande, fréquence, taille d'échantillon, longueur de la langue
+_RECOGNIZE = struct.Struct("<IIHB")
+# Identifiant de la demande, statut
+_RESULT = struct.Struct("<IB")
+# Statuts d'une réponse
+STATUS_OK, STATUS_UNKNOWN, STATUS_ERROR, STATUS_BUSY, STATUS_EXPIRED = 0, 1, 2, 3, 4
+# Taille maximale d'une trame (une phrase de `PHRASE_TIME_LIMIT_SECONDS` en tient bien moins)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+# Probabilité d'absence de parole au-delà de laquelle Whisper est considéré comme n'ayant rien compris
+WHISPER_NO_SPEECH_THRESHOLD = 0.6
+# Identité du processus à l'autre bout d'un socket Unix (pid, uid, gid)
+_PEERCRED = struct.Struct("3i")
+
+
+class ServerBusyError(sr.RequestError):
+    """La file du client est pleine sur le serveur : la phrase a été refusée."""
+
+
+class ServerTimeoutError(sr.RequestError):
+    """
+    Le serveur n'a pas transcrit la phrase à temps (expirée dans sa file, ou
+    réponse trop tardive) : la phrase est perdue, mais le serveur est joignable.
+    """
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Lit exactement `size` octets, ou lève ConnectionError si la connexion est fermée."""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("connexion fermée")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _send_frame(sock: socket.socket, kind: int, payload: bytes = b"") -> None:
+    """Envoie une trame."""
+    sock.sendall(_FRAME.pack(kind, len(payload)) + payload)
+
+
+def _recv_frame(sock: socket.socket) -> Tuple[int, bytes]:
+    """Reçoit une trame. Renvoie (type, données)."""
+    kind, size = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"trame trop grande ({size} octets)")
+    return kind, _recv_exact(sock, size)
+
+
+def _peer_uid(sock: socket.socket) -> int:
+    """Utilisateur du processus connecté à l'autre bout du socket, lu par le noyau."""
+    _pid, uid, _gid = _PEERCRED.unpack(sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size))
+    return uid
+
+
+def _user_name(uid: int) -> str:
+    """Nom de l'utilisateur `uid`, ou son numéro s'il est inconnu."""
+    try:
+        import pwd
+        return pwd.getpwuid(uid).pw_name
+    except (ImportError, KeyError):
+        return str(uid)
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Centile d'une liste de valeurs (None si elle est vide)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class GoogleBackend:
+    """
+    Moteur Google partagé. L'API ne traite qu'une phrase par requête : le
+    serveur fait tourner `concurrency` requêtes simultanées, chacune dans
+    son thread avec son propre `sr.Recognizer`.
+    """
+    name = "google"
+    max_batch = 1
+
+    def __init__(self, concurrency: int = RECOGNITION_SERVER_WORKERS):
+        self.concurrency = concurrency
+        self._local = threading.local()
+
+    def transcribe_batch(self, batch: List[Tuple[sr.AudioData, str]]) -> List[Tuple[int, str]]:
+        """
+        Transcrit un lot de phrases.
+
+        Args:
+            batch: Liste de (audio, langue).
+
+        Returns:
+            List[Tuple[int, str]]: Pour chaque phrase, (statut, texte ou message d'erreur).
+        """
+        recognizer = getattr(self._local, "recognizer", None)
+        if recognizer is None:
+            recognizer = self._local.recognizer = sr.Recognizer()
+            recognizer.operation_timeout = RECOGNITION_TIMEOUT_SECONDS
+        results = []
+        for audio, language in batch:
+            try:
+                results.append((STATUS_OK, recognizer.recognize_google(audio, language=language)))
+            except sr.UnknownValueError:
+                results.append((STATUS_UNKNOWN, ""))
+            except sr.RequestError as e:
+                results.append((STATUS_ERROR, f"Erreur API : {e}"))
+        return results
+
+
+class WhisperBackend:
+    """
+    Moteur Whisper hors ligne (openai-whisper). Le modèle est chargé une seule
+    fois ; les phrases d'un lot sont décodées ensemble, en un seul passage du
+    modèle, ce qui améliore nettement le débit sur GPU comme sur CPU.
+    """
+    name = "whisper"
+    concurrency = 1
+
+    def __init__(self, model: str = "base", max_batch: int = RECOGNITION_SERVER_BATCH_SIZE):
+        """
+        Args:
+            model (str): Nom du modèle Whisper (tiny, base, small, medium...).
+            max_batch (int): Nombre maximal de phrases décodées ensemble.
+        """
+        try:
+            import numpy as np
+            import torch
+            import whisper
+        except ImportError as e:
+            raise ImportError("Le moteur whisper nécessite openai-whisper (pip install openai-whisper).") from e
+        self._np, self._torch, self._whisper = np, torch, whisper
+        self.model = whisper.load_model(model)
+        self.max_batch = max_batch
+
+    def transcribe_batch(self, batch: List[Tuple[sr.AudioData, str]]) -> List[Tuple[int, str]]:
+        """Transcrit un lot de phrases (voir `GoogleBackend.transcribe_batch`)."""
+        results = [None] * len(batch)
+        # Une passe du modèle par langue présente dans le lot
+        by_language = collections.defaultdict(list)
+        for index, (_audio, language) in enumerate(batch):
+            by_language[language.split("-")[0]].append(index)
+        for language, indices in by_language.items():
+            mels = [self._mel(batch[index][0]) for index in indices]
+            options = self._whisper.DecodingOptions(language=language, without_timestamps=True,
+                                                    fp16=self.model.device.type == "cuda")
+            decoded = self._whisper.decode(self.model, self._torch.stack(mels).to(self.model.device), options)
+            for index, result in zip(indices, decoded):
+                text = result.text.strip()
+                if not text or result.no_speech_prob > WHISPER_NO_SPEECH_THRESHOLD:
+                    results[index] = (STATUS_UNKNOWN, "")
+                else:
+                    results[index] = (STATUS_OK, text)
+        return results
+
+    def _mel(self, audio: sr.AudioData):
+        """Spectrogramme attendu par Whisper (16 kHz, 30 s) pour une phrase."""
+        pcm = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        samples = self._np.frombuffer(pcm, dtype="<i2").astype(self._np.float32) / 32768.0
+        return self._whisper.log_mel_spectrogram(self._whisper.pad_or_trim(samples), n_mels=self.model.dims.n_mels)
+
+
+class _Request:
+    """Une phrase reçue d'un client, en attente de reconnaissance."""
+    __slots__ = ("client", "request_id", "audio", "language", "arrived_at")
+
+    def __init__(self, client, request_id: int, audio: sr.AudioData, language: str):
+        self.client = client
+        self.request_id = request_id
+        self.audio = audio
+        self.language = language
+        self.arrived_at = time.monotonic()
+
+
+class FairQueue:
+    """
+    File d'attente équitable : une file bornée par client (l'utilisateur, pour
+    le serveur), servies à tour de rôle.
+
+    Attributes:
+        client_limit (int): Nombre maximal de phrases en attente par client.
+    """
+
+    def __init__(self, client_limit: int = RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT):
+        self.client_limit = client_limit
+        self._queues = {}  # Client -> file de ses phrases
+        self._turns = collections.deque()  # Clients ayant des phrases en attente, dans l'ordre de passage
+        self._pending = 0
+        self._condition = threading.Condition()
+
+    def put(self, client, item) -> bool:
+        """Ajoute une phrase. Renvoie False si la file du client est pleine."""
+        with self._condition:
+            queue = self._queues.setdefault(client, collections.deque())
+            if len(queue) >= self.client_limit:
+                return False
+            if not queue:
+                self._turns.append(client)
+            queue.append(item)
+            self._pending += 1
+            self._condition.notify()
+            return True
+
+    def take_batch(self, max_size: int, window: float, timeout: float) -> list:
+        """
+        Retire un lot d'au plus `max_size` phrases, une par client et par tour.
+
+        Args:
+            max_size (int): Taille maximale du lot.
+            window (float): Attente supplémentaire (secondes) pour compléter un lot
+                            incomplet, si le moteur sait traiter des lots.
+            timeout (float): Attente maximale d'une première phrase.
+
+        Returns:
+            list: Le lot, vide si rien n'est arrivé à temps.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._pending, timeout):
+                return []
+            if max_size > 1 and window > 0:
+                self._condition.wait_for(lambda: self._pending >= max_size, window)
+            batch = []
+            while self._turns and len(batch) < max_size:
+                client = self._turns.popleft()
+                queue = self._queues[client]
+                batch.append(queue.popleft())
+                if queue:
+                    # Le client repasse en fin de tour
+                    self._turns.append(client)
+                else:
+                    del self._queues[client]
+            self._pending -= len(batch)
+            if self._pending:
+                # Laisse un autre thread de traitement prendre la suite
+                self._condition.notify()
+            return batch
+
+    def remove_client(self, client, predicate=None) -> list:
+        """
+        Retire et renvoie les phrases en attente d'un client.
+
+        Args:
+            client: Le client.
+            predicate (optional): Si fourni, seules les phrases pour lesquelles il
+                                  renvoie vrai sont retirées (celles d'une connexion).
+        """
+        with self._condition:
+            queue = self._queues.get(client)
+            if not queue:
+                return []
+            removed = [item for item in queue if predicate is None or predicate(item)]
+            kept = collections.deque(item for item in queue if predicate is not None and not predicate(item))
+            if kept:
+                self._queues[client] = kept
+            else:
+                del self._queues[client]
+                self._turns.remove(client)
+            self._pending -= len(removed)
+            return removed
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._pending
+
+
+class ClientStats:
+    """Statistiques d'un utilisateur : compteurs et latences récentes."""
+
+    def __init__(self, window: int = RECOGNITION_SERVER_STATS_WINDOW):
+        self.connections = 0  # Connexions ouvertes ; les statistiques sont oubliées à la dernière fermeture
+        self.submitted = 0  # Phrases reçues
+        self.completed = 0  # Phrases transcrites
+        self.unknown = 0  # Phrases incomprises
+        self.errors = 0  # Erreurs du moteur ou phrases expirées
+        self.rejected = 0  # Phrases refusées (file pleine)
+        self.latencies = collections.deque(maxlen=window)  # Arrivée -> réponse (secondes)
+        self.waits = collections.deque(maxlen=window)  # Arrivée -> début du traitement (secondes)
+
+    def snapshot(self) -> dict:
+        """Copie sérialisable des statistiques."""
+        latencies, waits = list(self.latencies), list(self.waits)
+        return {
+            "connections": self.connections,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "unknown": self.unknown,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "latency_p50": _percentile(latencies, 0.5),
+            "latency_p95": _percentile(latencies, 0.95),
+            "latency_max": max(latencies) if latencies else None,
+            "queue_wait_p50": _percentile(waits, 0.5),
+            "queue_wait_p95": _percentile(waits, 0.95),
+        }
+
+
+class _ClientConnection:
+    """Connexion d'un client : les réponses peuvent venir de plusieurs threads."""
+
+    def __init__(self, sock: socket.socket, uid: int, stats: ClientStats):
+        self.sock = sock
+        self.uid = uid  # Utilisateur lu par SO_PEERCRED : clé de l'équité et des statistiques
+        self.stats = stats  # Statistiques de l'utilisateur (toujours valides après leur oubli)
+        self._send_lock = threading.Lock()
+
+    def reply(self, request_id: int, status: int, text: str = "") -> None:
+        """Envoie une réponse ; un client déjà parti est ignoré."""
+        try:
+            with self._send_lock:
+                _send_frame(self.sock, RESULT, _RESULT.pack(request_id, status) + text.encode("utf-8"))
+        except OSError:
+            pass
+
+
+class RecognitionServer:
+    """
+    Serveur de reconnaissance partagé.
+
+    Attributes:
+        backend: Le moteur de reconnaissance (`GoogleBackend`, `WhisperBackend`...).
+        path (str): Chemin du socket Unix, dans un dossier du service.
+        batch_window (float): Attente maximale pour compléter un lot.
+        queue (FairQueue): Les phrases en attente, par utilisateur.
+        owner_uid (int): Utilisateur du serveur, seul à voir les statistiques de tous.
+    """
+
+    def __init__(self, backend, path: str = RECOGNITION_SERVER_SOCKET,
+                 batch_window: float = RECOGNITION_SERVER_BATCH_WINDOW_SECONDS,
+                 client_queue_limit: int = RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT,
+                 stats_window: int = RECOGNITION_SERVER_STATS_WINDOW):
+        self.backend = backend
+        self.path = path
+        self.batch_window = batch_window
+        self.queue = FairQueue(client_queue_limit)
+        self.owner_uid = os.getuid()
+        self._stats_window = stats_window
+        self._stats = {}  # Utilisateur connecté -> ClientStats
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._batched_requests = 0
+        self._started_at = None
+        self._server = None
+        # Numéro d'inode du socket créé, pour ne jamais supprimer un autre fichier
+        self._inode = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self) -> None:
+        """Ouvre le socket et lance les threads d'acceptation et de traitement."""
+        if not hasattr(socket, "SO_PEERCRED"):
+            raise OSError("Le serveur de reconnaissance nécessite SO_PEERCRED (Linux).")
+        self._server = self._bind()
+        self._started_at = time.monotonic()
+        self._threads.append(threading.Thread(target=self._accept_loop, name="recognition-server", daemon=True))
+        for index in range(self.backend.concurrency):
+            self._threads.append(threading.Thread(target=self._worker_loop, name=f"recognition-worker-{index}",
+                                                  daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def serve_forever(self) -> None:
+        """Démarre le serveur et bloque jusqu'à `stop` (ou Ctrl+C)."""
+        self.start()
+        try:
+            while not self._stop_event.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Arrête le serveur et supprime le socket qu'il a créé."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        if self._server:
+            self._server.close()
+            self._server = None
+            try:
+                if os.lstat(self.path).st_ino == self._inode:
+                    os.remove(self.path)
+            except OSError:
+                pass
+
+    def _bind(self) -> socket.socket:
+        """
+        Crée le socket d'écoute dans le dossier du service, en remplaçant un
+        socket orphelin d'une exécution précédente. Aucun autre fichier n'est
+        jamais supprimé.
+
+        Raises:
+            OSError: Si le dossier n'appartient pas à l'utilisateur du serveur ou
+                     est modifiable par d'autres (un tiers pourrait y remplacer le
+                     socket), ou si le chemin est occupé par autre chose.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != self.owner_uid or info.st_mode & 0o022:
+            raise OSError(f"{directory} doit être un dossier du serveur, modifiable par lui seul "
+                          f"(RuntimeDirectory= de systemd, par exemple)")
+        if os.path.lexists(self.path):
+            info = os.lstat(self.path)
+            if not stat.S_ISSOCK(info.st_mode) or info.st_uid != self.owner_uid:
+                raise OSError(f"{self.path} existe et n'est pas un socket du serveur")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.remove(self.path)
+            else:
+                raise OSError(f"{self.path} est déjà utilisé par un autre serveur")
+            finally:
+                probe.close()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Les droits du socket viennent du umask du service : aucun changement après coup
+        server.bind(self.path)
+        self._inode = os.lstat(self.path).st_ino
+        server.listen(64)
+        # Réveil régulier pour prendre en compte `stop`
+        server.settimeout(0.5)
+        return server
+
+    def stats(self, uid: int = None) -> dict:
+        """
+        Statistiques du serveur et des utilisateurs connectés.
+
+        Args:
+            uid (int, optional): Utilisateur qui les demande. Sauf s'il s'agit de
+                                 l'utilisateur du serveur, seule son entrée est
+                                 renvoyée. Par défaut, toutes (appel local).
+        """
+        with self._stats_lock:
+            clients = {_user_name(client_uid): stats.snapshot() for client_uid, stats in self._stats.items()
+                       if uid is None or uid in (client_uid, self.owner_uid)}
+            batches, batched = self._batches, self._batched_requests
+        return {
+            "backend": self.backend.name,
+            "uptime": time.monotonic() - self._started_at if self._started_at else 0.0,
+            "queued": len(self.queue),
+            "batches": batches,
+            "mean_batch_size": batched / batches if batches else None,
+            "clients": clients,
+        }
+
+    def _accept_loop(self) -> None:
+        """Accepte les clients ; chacun est lu par son propre thread."""
+        while not self._stop_event.is_set():
+            try:
+                sock, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            sock.settimeout(None)
+            threading.Thread(target=self._client_loop, args=(sock,), name="recognition-client", daemon=True).start()
+
+    def _client_loop(self, sock: socket.socket) -> None:
+        """Lit les demandes d'un client jusqu'à sa déconnexion."""
+        client = None
+        try:
+            # L'identité vient du noyau : un client ne peut pas se faire passer pour un autre
+            uid = _peer_uid(sock)
+            kind, _payload = _recv_frame(sock)
+            if kind == STATS:
+                # Consultation des statistiques (`query_stats`), sans HELLO
+                _send_frame(sock, STATS, json.dumps(self.stats(uid)).encode("utf-8"))
+                return
+            if kind != HELLO:
+                return
+            with self._stats_lock:
+                stats = self._stats.get(uid)
+                if stats is None:
+                    stats = self._stats[uid] = ClientStats(self._stats_window)
+                stats.connections += 1
+            client = _ClientConnection(sock, uid, stats)
+            while not self._stop_event.is_set():
+                kind, payload = _recv_frame(sock)
+                if kind == STATS:
+                    _send_frame(sock, STATS, json.dumps(self.stats(uid)).encode("utf-8"))
+                elif kind == RECOGNIZE:
+                    self._submit(client, payload)
+        except (OSError, struct.error, UnicodeDecodeError):
+            # Client déconnecté ou trame invalide : la connexion est abandonnée
+            pass
+        finally:
+            if client:
+                # Seules les phrases de cette connexion : l'utilisateur peut en avoir d'autres
+                dropped = self.queue.remove_client(client.uid, lambda request: request.client is client)
+                with self._stats_lock:
+                    client.stats.errors += len(dropped)
+                    client.stats.connections -= 1
+                    if not client.stats.connections:
+                        # Table bornée par les utilisateurs connectés
+                        del self._stats[client.uid]
+            sock.close()
+
+    def _submit(self, client: _ClientConnection, payload: bytes) -> None:
+        """Met une phrase en file, ou la refuse si la file du client est pleine."""
+        request_id, sample_rate, sample_width, language_len = _RECOGNIZE.unpack_from(payload)
+        language = payload[_RECOGNIZE.size:_RECOGNIZE.size + language_len].decode("utf-8")
+        audio = sr.AudioData(payload[_RECOGNIZE.size + language_len:], sample_rate, sample_width)
+        request = _Request(client, request_id, audio, language)
+        with self._stats_lock:
+            client.stats.submitted += 1
+        if not self.queue.put(client.uid, request):
+            with self._stats_lock:
+                client.stats.rejected += 1
+            client.reply(request_id, STATUS_BUSY, "file d'attente pleine")
+
+    def _worker_loop(self) -> None:
+        """Prend les lots de la file équitable et les fait transcrire par le moteur."""
+        while not self._stop_event.is_set():
+            batch = self.queue.take_batch(self.backend.max_batch, self.batch_window, timeout=0.5)
+            if not batch:
+                continue
+            started = time.monotonic()
+            # Une phrase dont le client a déjà abandonné l'attente n'est pas transcrite
+            expired = [r for r in batch if started - r.arrived_at > RECOGNITION_TIMEOUT_SECONDS]
+            batch = [r for r in batch if started - r.arrived_at <= RECOGNITION_TIMEOUT_SECONDS]
+            for request in expired:
+                self._finish(request, started, STATUS_EXPIRED, "délai d'attente dépassé")
+            if not batch:
+                continue
+            try:
+                results = self.backend.transcribe_batch([(r.audio, r.language) for r in batch])
+            except Exception as e:
+                results = [(STATUS_ERROR, f"Erreur du moteur : {e}")] * len(batch)
+            with self._stats_lock:
+                self._batches += 1
+                self._batched_requests += len(batch)
+            for request, (status, text) in zip(batch, results):
+                self._finish(request, started, status, text)
+
+    def _finish(self, request: _Request, started: float, status: int, text: str) -> None:
+        """Répond au client et met à jour ses statistiques."""
+        request.client.reply(request.request_id, status, text)
+        now = time.monotonic()
+        with self._stats_lock:
+            stats = request.client.stats
+            stats.latencies.append(now - request.arrived_at)
+            stats.waits.append(started - request.arrived_at)
+            if status == STATUS_OK:
+                stats.completed += 1
+            elif status == STATUS_UNKNOWN:
+                stats.unknown += 1
+            else:
+                stats.errors += 1
+
+
+class RecognitionClient:
+    """
+    Client du serveur de reconnaissance, utilisé à la place de `recognize_google`.
+
+    La connexion est ouverte à la première phrase et rouverte après une erreur.
+    `close` peut être appelé depuis un autre thread pour interrompre une attente.
+    Le serveur identifie le client par son utilisateur (`SO_PEERCRED`).
+
+    Attributes:
+        path (str): Chemin du socket du serveur.
+        timeout (float): Attente maximale d'une réponse.
+    """
+
+    def __init__(self, path: str = RECOGNITION_SERVER_SOCKET, timeout: float = RECOGNITION_TIMEOUT_SECONDS):
+        self.path = path
+        self.timeout = timeout
+        self._sock = None
+        self._closed = False
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _connection(self) -> socket.socket:
+        """Renvoie la connexion au serveur, en l'ouvrant si besoin."""
+        with self._lock:
+            if self._closed:
+                raise sr.RequestError("client du serveur de reconnaissance fermé")
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                try:
+                    sock.connect(self.path)
+                    _send_frame(sock, HELLO)
+                except OSError as e:
+                    sock.close()
+                    raise sr.RequestError(f"serveur de reconnaissance injoignable ({self.path}) : {e}") from e
+                self._sock = sock
+            return self._sock
+
+    def _disconnect(self, sock: socket.socket) -> None:
+        """Abandonne une connexion (une réponse tardive ne sera jamais lue)."""
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+        sock.close()
+
+    def transcribe(self, audio: sr.AudioData, language: str = "fr-FR") -> str:
+        """
+        Fait transcrire une phrase par le serveur.
+
+        Raises:
+            sr.UnknownValueError: Si le moteur ne comprend pas l'audio.
+            ServerBusyError: Si la file de ce client est pleine sur le serveur.
+            ServerTimeoutError: Si la phrase a expiré dans la file du serveur ou
+                                si la réponse n'arrive pas à temps.
+            sr.RequestError: Si le serveur est injoignable ou signale une erreur du moteur.
+        """
+        sock = self._connection()
+        self._next_id = (self._next_id + 1) % 2**32
+        request_id = self._next_id
+        encoded_language = language.encode("utf-8")
+        header = _RECOGNIZE.pack(request_id, audio.sample_rate, audio.sample_width, len(encoded_language))
+        try:
+            _send_frame(sock, RECOGNIZE, header + encoded_language + audio.get_raw_data())
+            while True:
+                kind, payload = _recv_frame(sock)
+                if kind == RESULT and _RESULT.unpack_from(payload)[0] == request_id:
+                    break
+        except socket.timeout as e:
+            # Serveur joignable mais surchargé : la réponse, si elle arrive, sera ignorée
+            self._disconnect(sock)
+            raise ServerTimeoutError(f"serveur de reconnaissance : pas de réponse en {self.timeout:.0f} s") from e
+        except OSError as e:
+            self._disconnect(sock)
+            raise sr.RequestError(f"serveur de reconnaissance : {e}") from e
+        status = _RESULT.unpack_from(payload)[1]
+        text = payload[_RESULT.size:].decode("utf-8")
+        if status == STATUS_OK:
+            return text
+        if status == STATUS_UNKNOWN:
+            raise sr.UnknownValueError()
+        if status == STATUS_BUSY:
+            raise ServerBusyError(text)
+        if status == STATUS_EXPIRED:
+            raise ServerTimeoutError(text)
+        raise sr.RequestError(text)
+
+    def close(self) -> None:
+        """Ferme la connexion ; une attente en cours dans un autre thread échoue aussitôt."""
+        with self._lock:
+            self._closed = True
+            sock, self._sock = self._sock, None
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+def query_stats(path: str = RECOGNITION_SERVER_SOCKET, timeout: float = RECOGNITION_TIMEOUT_SECONDS) -> Dict:
+    """
+    Interroge un serveur en cours d'exécution sans s'y déclarer comme client.
+
+    Returns:
+        Dict: Les statistiques renvoyées par `RecognitionServer.stats` : celles
+              de l'utilisateur appelant, ou de tous pour l'utilisateur du serveur.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        _send_frame(sock, STATS)
+        kind, payload = _recv_frame(sock)
+    return json.loads(payload.decode("utf-8"))
@@ -0,0 +1,307 @@
+# core/session_recorder.py
+"""
+Ce module fournit un enregistreur de sessions optionnel : chaque phrase
+(audio PCM, horodatage, moteur de reconnaissance, latence, texte reconnu et
+texte finalement tapé) est ajoutée à un journal binaire, pour pouvoir
+reproduire plus tard une phrase mal reconnue ou lente.
+
+Le journal est découpé en segments de taille fixe, préalloués et écrits par
+projection mémoire (`mmap`), en ajout seul. Un segment plein est fermé (et
+tronqué à sa taille utile), un nouveau est ouvert, et les plus anciens sont
+supprimés au-delà des limites de rétention.
+
+Les écritures se font dans un thread dédié : `record` ne fait que déposer
+l'entrée dans une file, sans jamais bloquer la capture ni la frappe.
+
+Format d'un segment :
+    [FILE_MAGIC][enregistrement][enregistrement]...[zéros]
+Format d'un enregistrement :
+    [en-tête _RECORD][moteur][texte reconnu][texte tapé][PCM]
+La signature d'un enregistrement est écrite en dernier : un enregistrement
+interrompu (plantage) n'est jamais lu.
+"""
+
+# Importations nécessaires
+import mmap  # Pour les écritures par projection mémoire
+import os  # Pour gérer les fichiers de segments
+import queue  # Pour découpler l'enregistrement du chemin critique
+import struct  # Pour le format binaire des enregistrements
+import threading  # Pour le thread d'écriture
+import time  # Pour nommer les segments et rejouer au rythme d'origine
+from typing import Iterator, List, NamedTuple, Optional  # Pour l'annotation de type
+import speech_recognition as sr  # Pour le format AudioData
+from constants import RECORDER_DIR, RECORDER_SEGMENT_BYTES, RECORDER_MAX_SEGMENTS, RECORDER_MAX_BYTES
+
+# Signature en tête de chaque segment
+FILE_MAGIC = b"PVTCLOG1"
+# Extension des fichiers de segments
+SEGMENT_EXTENSION = ".pvlog"
+# Signature, horodatage, latence, fréquence, taille d'échantillon,
+# puis les longueurs du moteur, du texte reconnu, du texte tapé et du PCM
+_RECORD = struct.Struct("<4sddIHHIII")
+_RECORD_MAGIC = b"UTTR"
+
+
+class Utterance(NamedTuple):
+    """Une phrase traitée par le thread de reconnaissance."""
+    captured_at: float  # Horodatage (epoch, secondes) de la fin de la phrase, mesuré à la capture
+    latency: float  # Durée (secondes) du débruitage et de la reconnaissance
+    backend: str  # Moteur de reconnaissance utilisé
+    recognized_text: str  # Texte renvoyé par le moteur ("" si incompris)
+    audio: sr.AudioData  # Audio capturé, avant débruitage
+
+
+class RecordedUtterance(NamedTuple):
+    """Une phrase relue depuis le journal."""
+    captured_at: float
+    latency: float
+    backend: str
+    recognized_text: str
+    typed_text: str
+    audio: sr.AudioData
+
+
+class _Segment:
+    """Un fichier de segment préalloué et projeté en mémoire."""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self._file = open(path, 'w+b')
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._map[:len(FILE_MAGIC)] = FILE_MAGIC
+        self.offset = len(FILE_MAGIC)
+
+    def fits(self, size: int) -> bool:
+        return self.offset + size <= len(self._map)
+
+    def append(self, parts: List[bytes]) -> None:
+        """Écrit un enregistrement : le corps d'abord, la signature en dernier."""
+        header, body = parts[0], parts[1:]
+        position = self.offset + len(header)
+        for part in body:
+            self._map[position:position + len(part)] = part
+            position += len(part)
+        self._map[self.offset + len(_RECORD_MAGIC):self.offset + len(header)] = header[len(_RECORD_MAGIC):]
+        self._map[self.offset:self.offset + len(_RECORD_MAGIC)] = _RECORD_MAGIC
+        self.offset = position
+
+    def close(self) -> None:
+        """Ferme le segment en le tronquant à sa taille utile."""
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self.offset)
+        self._file.close()
+
+
+class SessionRecorder:
+    """
+    Enregistre les phrases d'une session dans un journal segmenté.
+
+    Attributes:
+        directory (str): Dossier des segments.
+        segment_bytes (int): Taille d'un segment (un enregistrement plus grand
+                             obtient un segment à sa taille).
+        max_segments (int): Nombre maximal de segments conservés.
+        max_bytes (int): Taille totale maximale des segments conservés.
+    """
+
+    def __init__(self, directory: str = RECORDER_DIR, segment_bytes: int = RECORDER_SEGMENT_BYTES,
+                 max_segments: int = RECORDER_MAX_SEGMENTS, max_bytes: int = RECORDER_MAX_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.max_bytes = max_bytes
+        self._queue = queue.Queue()
+        self._segment = None
+        self._sequence = 0
+        # Horodatage au millième : deux sessions ne partagent jamais un nom de segment
+        now = time.time()
+        self._session = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{now % 1:.3f}"[1:]
+        os.makedirs(directory, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name="session-recorder")
+        self._writer.start()
+
+    def record(self, utterance: Utterance, typed_text: str) -> None:
+        """
+        Ajoute une phrase au journal. Ne bloque pas : l'écriture est différée.
+
+        Args:
+            utterance (Utterance): La phrase et ses métadonnées.
+            typed_text (str): Le texte finalement tapé ("" si rien n'a été tapé).
+        """
+        self._queue.put((utterance, typed_text))
+
+    def close(self) -> None:
+        """Demande la fermeture du journal une fois les écritures en attente terminées."""
+        self._queue.put(None)
+
+    def join(self, timeout: float = None) -> None:
+        """Attend la fin des écritures après `close`."""
+        self._writer.join(timeout)
+
+    def _write_loop(self) -> None:
+        """Boucle du thread d'écriture."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+            except OSError as e:
+                # Disque plein, dossier supprimé... : l'enregistrement est optionnel
+                print(f"Erreur d'enregistrement de session : {e}")
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+
+    def _write(self, utterance: Utterance, typed_text: str) -> None:
+        """Sérialise une phrase et l'ajoute au segment courant (avec rotation si besoin)."""
+        backend = utterance.backend.encode("utf-8")
+        recognized = utterance.recognized_text.encode("utf-8")
+        typed = typed_text.encode("utf-8")
+        pcm = utterance.audio.get_raw_data()
+        header = _RECORD.pack(_RECORD_MAGIC, utterance.captured_at, utterance.latency,
+                              utterance.audio.sample_rate, utterance.audio.sample_width, len(backend),
+                              len(recognized), len(typed), len(pcm))
+        parts = [header, backend, recognized, typed, pcm]
+        size = sum(len(part) for part in parts)
+
+        if self._segment is None or not self._segment.fits(size):
+            self._rotate(size)
+        self._segment.append(parts)
+
+    def _rotate(self, size: int) -> None:
+        """Ferme le segment courant, en ouvre un nouveau et applique la rétention."""
+        if self._segment:
+            self._segment.close()
+        self._sequence += 1
+        path = os.path.join(self.directory, f"session-{self._session}-{self._sequence:04d}{SEGMENT_EXTENSION}")
+        self._segment = _Segment(path, max(self.segment_bytes, len(FILE_MAGIC) + size))
+        self._apply_retention()
+
+    def _apply_retention(self) -> None:
+        """Supprime les segments les plus anciens au-delà des limites (hors segment courant)."""
+        segments = list_segments(self.directory)
+        total = sum(os.path.getsize(path) for path in segments)
+        # Parcourt une copie : la liste raccourcit à chaque suppression
+        for path in list(segments):
+            if len(segments) <= self.max_segments and total <= self.max_bytes:
+                break
+            if path == self._segment.path:
+                continue
+            total -= os.path.getsize(path)
+            os.remove(path)
+            segments.remove(path)
+
+
+def list_segments(directory: str = RECORDER_DIR) -> List[str]:
+    """Renvoie les chemins des segments du dossier, du plus ancien au plus récent."""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_EXTENSION))
+    return [os.path.join(directory, name) for name in names]
+
+
+def read_segment(path: str) -> Iterator[RecordedUtterance]:
+    """
+    Relit les phrases d'un segment, y compris d'un segment en cours d'écriture.
+
+    Args:
+        path (str): Le chemin du segment.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(FILE_MAGIC):
+        raise ValueError(f"{path} n'est pas un journal de session.")
+    offset = len(FILE_MAGIC)
+    while offset + _RECORD.size <= len(data):
+        (magic, captured_at, latency, sample_rate, sample_width,
+         backend_len, recognized_len, typed_len, pcm_len) = _RECORD.unpack_from(data, offset)
+        if magic != _RECORD_MAGIC:
+            # Zone préallouée non encore écrite, ou enregistrement interrompu
+            break
+        position = offset + _RECORD.size
+        fields = []
+        for length in (backend_len, recognized_len, typed_len):
+            fields.append(data[position:position + length].decode("utf-8"))
+            position += length
+        audio = sr.AudioData(data[position:position + pcm_len], sample_rate, sample_width)
+        yield RecordedUtterance(captured_at, latency, *fields, audio)
+        offset = position + pcm_len
+
+
+def read_log(directory: str = RECORDER_DIR) -> Iterator[RecordedUtterance]:
+    """Relit toutes les phrases des segments d'un dossier, dans l'ordre."""
+    for path in list_segments(directory):
+        yield from read_segment(path)
+
+
+class ReplayEngine:
+    """
+    Rejoue un journal à la place du microphone.
+
+    Offre la même interface que `AudioEngine` : un `VoiceRecognizerThread`
+    construit avec `engine=ReplayEngine(...)` traite les phrases enregistrées
+    exactement comme des phrases capturées.
+
+    Attributes:
+        ready (bool): Toujours vrai (pas de calibration).
+        finished (bool): Vrai une fois toutes les phrases rejouées.
+        captured_at (float): Horodatage d'origine de la dernière phrase rejouée.
+    """
+
+    def __init__(self, utterances: Iterator[RecordedUtterance], realtime: bool = False):
+        """
+        Args:
+            utterances: Les phrases à rejouer (par exemple `read_log(...)`).
+            realtime (bool): Respecte les intervalles d'origine entre les phrases.
+        """
+        self._utterances = iter(utterances)
+        self.realtime = realtime
+        self.ready = True
+        self.finished = False
+        self.captured_at = None
+        self._pending = None
+        self._origin = None
+
+    def start(self) -> None:
+        """Démarre le rejeu (l'horloge du mode temps réel part de cet instant)."""
+        self._origin = None
+
+    def next_utterance(self, timeout: float) -> Optional[sr.AudioData]:
+        """Renvoie la phrase suivante, ou None si elle n'est pas encore due ou si le journal est épuisé."""
+        if self._pending is None:
+            self._pending = next(self._utterances, None)
+            if self._pending is None:
+                self.finished = True
+                time.sleep(timeout)
+                return None
+        if self.realtime:
+            if self._origin is None:
+                self._origin = (time.monotonic(), self._pending.captured_at)
+            due = self._origin[0] + self._pending.captured_at - self._origin[1]
+            delay = due - time.monotonic()
+            if delay > timeout:
+                time.sleep(timeout)
+                return None
+            time.sleep(max(0.0, delay))
+        audio, self.captured_at = self._pending.audio, self._pending.captured_at
+        self._pending = None
+        return audio
+
+    def current_level(self) -> int:
+        """Pas de vumètre pendant un rejeu."""
+        return 0
+
+    def request_profile(self, duration: float, directory: str) -> None:
+        """Pas de processus audio à profiler pendant un rejeu."""
+
+    def request_stop(self) -> None:
+        """Rien à interrompre : `next_utterance` ne bloque jamais plus que son délai."""
+
+    def release(self, timeout: float = None) -> None:
+        """Aucun micro à libérer."""
+
+    def stop(self) -> None:
+        """Rien à libérer."""
@@ -11,6 +11,12 @@ from pynput import keyboard  # Pour écouter les frappes de clavier
 from utils.signals import WorkerSignals
 from constants import RECOGNITION_SHORTCUT_STR, DEFINE_TARGET_SHORTCUT_STR
 
+# Ensemble des touches pour le raccourci qui démarre/arrête la reconnaissance.
+# Définies ici et non dans constants.py : pynput nécessite un écran dès son importation.
+RECOGNITION_SHORTCUT: set = {keyboard.Key.ctrl, keyboard.Key.alt, keyboard.KeyCode.from_char('v')}
+# Ensemble des touches pour le raccourci qui lance la définition de la cible.
+DEFINE_TARGET_SHORTCUT: set = {keyboard.Key.ctrl, keyboard.Key.alt, keyboard.KeyCode.from_char('b')}
+
 def _format_shortcut_for_pynput(shortcut_str: str) -> str:
     """
     Formate une chaîne comme "Ctrl+Alt+V" en "<ctrl>+<alt>+v" pour pynput.
@@ -35,9 +41,13 @@ class ShortcutListenerThread(threading.Thread):
 
     def __init__(self):
         """Initialise le thread et ses signaux."""
-        super().__init__()
+        super().__init__(name="shortcuts")
         self.signals = WorkerSignals()
         self.listener = None  # Pour garder une référence et pouvoir l'arrêter
+        # `stop` peut être appelé avant que `run` ait créé le listener :
+        # le drapeau et le verrou évitent alors un listener orphelin.
+        self._stopped = False
+        self._lock = threading.Lock()
 
     def run(self) -> None:
         """Méthode principale du thread : configure et démarre l'écouteur de HotKeys."""
@@ -53,17 +63,22 @@ class ShortcutListenerThread(threading.Thread):
             }
 
             # Crée et démarre le listener. Il s'exécutera jusqu'à l'appel de .stop()
-            self.listener = keyboard.GlobalHotKeys(hotkeys)
-            self.listener.start()
+            with self._lock:
+                if self._stopped:
+                    return
+                self.listener = keyboard.GlobalHotKeys(hotkeys)
+                self.listener.start()
             self.listener.join()  # Bloque le thread jusqu'à la fin du listener
         except Exception as e:
             # Gère les erreurs potentielles si les raccourcis sont mal configurés
             print(f"Erreur dans le thread de raccourcis : {e}")
 
     def stop(self) -> None:
-        """Arrête l'écoute des raccourcis clavier."""
-        if self.listener:
-            self.listener.stop()
+        """Arrête l'écoute des raccourcis clavier, même si elle n'a pas encore commencé."""
+        with self._lock:
+            self._stopped = True
+            if self.listener:
+                self.listener.stop()
 
     def _on_recognition_shortcut(self):
         """Callback pour le raccourci de reconnaissance : émet le signal approprié."""
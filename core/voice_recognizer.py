@@ -1,15 +1,28 @@
 # core/voice_recognizer.py
 """
 Ce module contient le thread de travail pour la reconnaissance vocale en continu.
-Il gère l'écoute du microphone, la communication avec l'API de reconnaissance
-vocale de Google et la transmission du texte reconnu.
+Il reçoit les phrases détectées par le processus audio (voir core/audio_engine.py),
+communique avec l'API de reconnaissance vocale de Google (directement ou via un
+serveur de reconnaissance partagé, voir core/recognition_server.py) et transmet
+le texte reconnu.
 """
 
 # Importations nécessaires
 import threading  # Pour créer et gérer le thread
+import time  # Pour mesurer la latence
 import speech_recognition as sr  # Bibliothèque principale pour la reconnaissance vocale
+from core.audio_engine import AudioEngine, AudioEngineError  # Capture audio dans un processus dédié
+from core import denoise  # Réduction de bruit activable
+from core.session_recorder import Utterance  # Métadonnées des phrases, pour l'enregistrement
+from core.recognition_server import RecognitionClient, ServerBusyError, ServerTimeoutError  # Serveur partagé optionnel
 from utils.signals import WorkerSignals  # Signaux pour communiquer avec l'UI
-from constants import PHRASE_TIME_LIMIT_SECONDS  # Constantes de configuration
+from utils.events import EventBus, StateChanged, LevelChanged, WorkerState  # Événements typés
+from constants import LEVEL_METER_INTERVAL_SECONDS, RECOGNITION_TIMEOUT_SECONDS  # Constantes de configuration
+
+# Nom du moteur de reconnaissance, conservé avec chaque phrase enregistrée
+RECOGNITION_BACKEND = "google"
+# Nom enregistré lorsque les phrases passent par le serveur partagé
+SERVER_BACKEND = "server"
 
 
 class VoiceRecognizerThread(threading.Thread):
@@ -18,16 +31,29 @@ class VoiceRecognizerThread(threading.Thread):
     pour transcrire la parole en texte.
 
     Il est conçu pour tourner en arrière-plan et communiquer avec l'interface
-    utilisateur de manière asynchrone via des signaux.
+    utilisateur de manière asynchrone : le texte reconnu passe par un signal,
+    les changements d'état et le niveau audio par un bus d'événements typés.
 
     Attributes:
-        recognizer (sr.Recognizer): L'objet principal de reconnaissance vocale.
+        recognizer (sr.Recognizer): L'objet utilisé pour appeler l'API de reconnaissance.
+        engine (AudioEngine): Le moteur qui capture l'audio dans un processus dédié.
+        denoiser (SpectralDenoiser, optional): Le réducteur de bruit, si activé.
+        client (RecognitionClient, optional): Le client du serveur de reconnaissance
+                                              partagé, s'il est utilisé.
+        backend (str): Nom du moteur, conservé avec chaque phrase enregistrée.
+        recorder (SessionRecorder, optional): L'enregistreur des phrases non reconnues
+                                              (les autres sont enregistrées par l'UI,
+                                              avec le texte finalement tapé). L'UI le
+                                              ferme à la réception de `recognition_finished`.
         device_index (int, optional): L'index du microphone à utiliser.
         signals (WorkerSignals): Instance pour émettre des signaux vers l'UI.
-        _is_running (bool): Un drapeau pour contrôler la boucle d'écoute principale.
+        events (EventBus): Bus des événements d'état et de niveau vers l'UI.
+        _stop_event (threading.Event): Demande d'arrêt, vérifiée entre chaque étape.
     """
 
-    def __init__(self, energy_threshold: int, pause_threshold: float, device_index: int = None):
+    def __init__(self, energy_threshold: int, pause_threshold: float, device_index: int = None,
+                 noise_suppression: bool = False, recorder=None, engine=None, server_path: str = None,
+                 wav_path: str = None):
         """
         Initialise le thread de reconnaissance vocale.
 
@@ -37,73 +63,158 @@ class VoiceRecognizerThread(threading.Thread):
             pause_threshold (float): Le temps de silence (en secondes) qui marque
                                      la fin d'une phrase.
             device_index (int, optional): L'index du microphone à utiliser.
+            noise_suppression (bool): Débruite chaque phrase avant la reconnaissance.
+            recorder (SessionRecorder, optional): Enregistreur de session.
+            engine (optional): Source des phrases. Par défaut, un `AudioEngine` sur
+                               le microphone ; un `ReplayEngine` rejoue un journal.
+            server_path (str, optional): Socket d'un serveur de reconnaissance partagé,
+                                         utilisé à la place d'un appel direct à l'API.
+            wav_path (str, optional): Fichier WAV lu à la place du microphone (tests).
         """
         # Appel du constructeur de la classe parente
-        super().__init__()
-        # Crée une instance de l'objet Recognizer
+        super().__init__(name="recognizer")
+        # Crée une instance de l'objet Recognizer, utilisée pour l'appel à l'API
         self.recognizer = sr.Recognizer()
-
-        # Le seuil d'énergie peut être ajusté dynamiquement par la bibliothèque
-        self.recognizer.dynamic_energy_threshold = True
-        # Définit le seuil de sensibilité initial
-        self.recognizer.energy_threshold = energy_threshold
-        # Définit la durée de silence considérée comme la fin d'une phrase
-        self.recognizer.pause_threshold = pause_threshold
+        # Borne la durée d'un appel à l'API : c'est la seule étape non interruptible
+        self.recognizer.operation_timeout = RECOGNITION_TIMEOUT_SECONDS
+        # Avec un serveur partagé, c'est lui qui détient le moteur et ses connexions
+        self.client = RecognitionClient(server_path) if server_path else None
+        self.backend = SERVER_BACKEND if server_path else RECOGNITION_BACKEND
+        # La capture et la détection des phrases se font dans le processus audio
+        self.engine = engine or AudioEngine(energy_threshold, pause_threshold, device_index, wav_path=wav_path)
+        self.recorder = recorder
+        # Le profil de bruit est suivi d'une phrase à l'autre pendant toute la session
+        self.denoiser = denoise.SpectralDenoiser() if noise_suppression else None
 
         # Stocke l'index du microphone
         self.device_index = device_index
         # Crée une instance de signaux pour la communication
         self.signals = WorkerSignals()
-        # Initialise le drapeau de contrôle de la boucle à True
-        self._is_running = True
+        # Crée le bus d'événements (sur le thread de l'UI, où il livrera les événements)
+        self.events = EventBus()
+        # Demande d'arrêt, levée par `stop`
+        self._stop_event = threading.Event()
+        # Le thread ne doit pas retarder la fermeture de l'application pendant un appel à l'API
+        self.daemon = True
+
+    @property
+    def stopped(self) -> bool:
+        """Vrai dès que l'arrêt a été demandé (le thread peut encore finir un appel à l'API)."""
+        return self._stop_event.is_set()
 
     def stop(self) -> None:
         """
-        Arrête la boucle d'écoute du thread de manière propre.
+        Arrête le thread. Appelable depuis n'importe quel thread.
+
+        Le processus audio libère le micro au bloc suivant ; la boucle se termine
+        au plus tard après l'appel à l'API en cours (borné par
+        `RECOGNITION_TIMEOUT_SECONDS`), dont le résultat est alors ignoré.
         """
-        # Passe simplement le drapeau à False. La boucle `run` se terminera.
-        self._is_running = False
+        self._stop_event.set()
+        self.engine.request_stop()
+        if self.client:
+            # Interrompt l'attente d'une réponse du serveur
+            self.client.close()
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        """
+        Débruite (si demandé) une phrase et la transcrit avec l'API de Google,
+        ou avec le serveur partagé s'il est configuré.
+
+        Raises:
+            sr.UnknownValueError: Si l'API ne comprend pas l'audio.
+            ServerBusyError: Si le serveur partagé refuse la phrase (file pleine).
+            ServerTimeoutError: Si le serveur partagé ne transcrit pas la phrase à temps.
+            sr.RequestError: Si l'API ou le serveur est injoignable, ou si l'API ne répond pas à temps.
+        """
+        cleaned = self.denoiser.process_audio(audio) if self.denoiser else audio
+        if self.client:
+            return self.client.transcribe(cleaned, language='fr-FR')
+        return self.recognizer.recognize_google(cleaned, language='fr-FR')
 
     def run(self) -> None:
         """
-        Méthode principale du thread. Démarre l'écoute et la reconnaissance.
+        Méthode principale du thread. Démarre le processus audio et transcrit
+        chaque phrase qu'il détecte.
         """
-        # Ouvre le microphone en tant que ressource contextuelle
-        with sr.Microphone(device_index=self.device_index) as source:
-            # Émet un message pour indiquer que la calibration initiale (non-auto) commence
-            self.signals.status_message.emit("Calibration audio...")
-            # S'ajuste brièvement au bruit ambiant au démarrage
-            self.recognizer.adjust_for_ambient_noise(source, duration=1.5)
-
-            # Boucle principale : continue tant que `_is_running` est True
-            while self._is_running:
-                # Émet un message pour indiquer que l'application est prête à écouter
-                self.signals.status_message.emit("En écoute...")
+        if self.stopped:
+            # Arrêté avant même d'avoir démarré : inutile d'ouvrir le micro
+            self.signals.recognition_finished.emit()
+            return
+        # Indique que la calibration initiale (non-auto) commence
+        self.events.publish(StateChanged(WorkerState.CALIBRATING))
+        try:
+            self.engine.start()
+            # Boucle principale : continue tant que l'arrêt n'est pas demandé
+            while not self.stopped:
+                # Attend une phrase au plus un intervalle de vumètre, pour que
+                # le niveau et l'arrêt soient pris en compte régulièrement.
+                audio = self.engine.next_utterance(timeout=LEVEL_METER_INTERVAL_SECONDS)
+                # Niveau lu directement dans la mémoire partagée avec le processus audio
+                self.events.publish(LevelChanged(self.engine.current_level()))
+                if audio is None:
+                    if self.engine.finished:
+                        # Journal rejoué jusqu'au bout : arrêt normal
+                        break
+                    # Le bus ignore cette publication si l'état n'a pas changé.
+                    # Après une relance du processus audio, l'état repasse en calibration.
+                    state = WorkerState.LISTENING if self.engine.ready else WorkerState.CALIBRATING
+                    self.events.publish(StateChanged(state))
+                    continue
 
+                # Une fois l'audio capturé, signale le passage en reconnaissance
+                self.events.publish(StateChanged(WorkerState.RECOGNIZING))
+                # Horodatage de la capture (fin de la phrase), pas du début de la reconnaissance
+                captured_at = self.engine.captured_at
+                started = time.monotonic()
                 try:
-                    # `listen` bloque jusqu'à ce qu'une phrase soit détectée,
-                    # en se basant sur `pause_threshold` et `phrase_time_limit`.
-                    audio = self.recognizer.listen(source, phrase_time_limit=PHRASE_TIME_LIMIT_SECONDS)
-
-                    # Une fois l'audio capturé, émet un message de statut
-                    self.signals.status_message.emit("Reconnaissance en cours...")
                     # Envoie l'audio à l'API de Google pour la transcription
-                    text = self.recognizer.recognize_google(audio, language='fr-FR')
+                    text = self.transcribe(audio)
+                    utterance = Utterance(captured_at, time.monotonic() - started, self.backend, text, audio)
+                    if self.stopped:
+                        # Arrêté pendant l'appel : le texte ne doit plus être tapé,
+                        # mais la phrase est enregistrée (rien n'a été tapé)
+                        if self.recorder:
+                            self.recorder.record(utterance, "")
+                        break
 
                     # Si du texte a été reconnu avec succès...
                     if text:
                         # ...émet un signal avec le texte transcrit.
-                        self.signals.recognized_text.emit(text)
+                        self.signals.recognized_text.emit(text, utterance)
 
                 # Gère les erreurs attendues
-                except sr.WaitTimeoutError:
-                    # Si `listen` expire sans détecter de parole, continue simplement la boucle
-                    continue
                 except sr.UnknownValueError:
-                    # Si l'API ne comprend pas l'audio, ignore et continue d'écouter
-                    pass
+                    # Si l'API ne comprend pas l'audio, continue d'écouter. La phrase est
+                    # tout de même enregistrée : c'est typiquement celle qu'on voudra rejouer.
+                    if self.recorder:
+                        utterance = Utterance(captured_at, time.monotonic() - started, self.backend, "", audio)
+                        self.recorder.record(utterance, "")
+                except (ServerBusyError, ServerTimeoutError):
+                    # Serveur partagé saturé (file pleine, phrase expirée ou réponse
+                    # trop lente) : cette phrase est perdue, l'écoute continue
+                    if self.recorder:
+                        utterance = Utterance(captured_at, time.monotonic() - started, self.backend, "", audio)
+                        self.recorder.record(utterance, "")
                 except sr.RequestError as e:
+                    if self.stopped:
+                        break
                     # Si une erreur d'API se produit (ex: pas de connexion internet),
-                    # émet une erreur et arrête le thread.
-                    self.signals.error_occurred.emit(f"Erreur API : {e}")
-                    self.stop()
\ No newline at end of file
+                    # publie l'état d'erreur (terminal) et arrête le thread.
+                    self.events.publish(StateChanged(WorkerState.ERROR, f"Erreur API : {e}"))
+                    self.stop()
+                    return
+        except AudioEngineError as e:
+            # Le microphone est inutilisable ou le processus audio plante en boucle
+            self.events.publish(StateChanged(WorkerState.ERROR, f"Erreur audio : {e}"))
+            self.stop()
+            return
+        finally:
+            self.engine.stop()
+            if self.client:
+                self.client.close()
+            # Émis après le dernier `recognized_text` : l'UI les reçoit dans cet ordre
+            self.signals.recognition_finished.emit()
+
+        # Arrêt normal demandé par l'UI
+        self.events.publish(StateChanged(WorkerState.STOPPED))
@@ -11,8 +11,6 @@ Ce script est responsable de :
 import sys
 import os
 import base64
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import VoiceToChatApp
 from constants import ICON_FILE
 
 
@@ -20,6 +18,11 @@ def main():
     """
     Fonction principale qui initialise et lance l'application.
     """
+    # Importés ici et non en tête du module : le processus audio, lancé par
+    # `spawn`, réimporte ce module et ne doit charger ni Qt ni l'interface
+    from PyQt6.QtWidgets import QApplication
+    from ui.main_window import VoiceToChatApp
+
     app = QApplication(sys.argv)
     window = VoiceToChatApp()
     window.show()
@@ -0,0 +1,136 @@
+# scripts/denoise_benchmark.py
+"""
+Banc d'essai de la réduction de bruit : rejoue un corpus de phrases
+enregistrées, avec ou sans bruit ajouté, et compare le taux d'erreur de mots
+(WER) de la reconnaissance ainsi que le coût CPU du débruitage.
+
+Le corpus est un dossier de fichiers WAV mono 16 bits, chacun accompagné de
+sa transcription de référence dans un fichier .txt de même nom.
+
+Exemples :
+    python scripts/denoise_benchmark.py corpus/ --noise bureau.wav --snr 10 5 0
+    python scripts/denoise_benchmark.py corpus/ --no-recognition  # CPU seulement
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import os  # Pour parcourir le corpus
+import re  # Pour découper les transcriptions en mots
+import sys  # Pour rendre les modules du projet importables
+import time  # Pour mesurer le temps CPU
+import wave  # Pour lire les fichiers du corpus
+
+import numpy as np
+import speech_recognition as sr
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.denoise import SpectralDenoiser  # noqa: E402
+
+
+def load_wav(path: str):
+    """Charge un fichier WAV mono 16 bits. Renvoie (échantillons int16, fréquence)."""
+    with wave.open(path, 'rb') as reader:
+        if reader.getnchannels() != 1 or reader.getsampwidth() != 2:
+            raise ValueError(f"{path} : seul le format mono 16 bits est pris en charge.")
+        return np.frombuffer(reader.readframes(reader.getnframes()), dtype='<i2'), reader.getframerate()
+
+
+def mix_noise(speech, noise, snr_db: float):
+    """Ajoute le bruit (répété ou tronqué) à la parole avec le rapport signal/bruit demandé."""
+    noise = np.resize(noise, len(speech)).astype(np.float64)
+    speech_power = np.mean(speech.astype(np.float64) ** 2)
+    noise_power = max(np.mean(noise ** 2), 1e-9)
+    noise *= np.sqrt(speech_power / (noise_power * 10 ** (snr_db / 10)))
+    return np.clip(speech + noise, -32768, 32767).astype(np.int16)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Distance d'édition entre les suites de mots, rapportée au nombre de mots de référence."""
+    ref = re.findall(r"\w+", reference.lower())
+    hyp = re.findall(r"\w+", hypothesis.lower())
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(len(ref), 1)
+
+
+def recognize(recognizer: sr.Recognizer, samples, sample_rate: int, language: str) -> str:
+    """Transcrit des échantillons ; une phrase incomprise donne une transcription vide."""
+    try:
+        return recognizer.recognize_google(sr.AudioData(samples.tobytes(), sample_rate, 2), language=language)
+    except sr.UnknownValueError:
+        return ""
+
+
+def load_corpus(directory: str):
+    """Renvoie la liste (nom, échantillons, fréquence, référence) des phrases du corpus."""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".wav"):
+            continue
+        path = os.path.join(directory, name)
+        transcript_path = os.path.splitext(path)[0] + ".txt"
+        reference = None
+        if os.path.exists(transcript_path):
+            with open(transcript_path, encoding="utf-8") as f:
+                reference = f.read().strip()
+        samples, sample_rate = load_wav(path)
+        corpus.append((name, samples, sample_rate, reference))
+    return corpus
+
+
+def run(corpus, noise, snr_db, recognizer, language):
+    """Évalue une condition de bruit. Renvoie (WER brut, WER débruité, temps CPU, RTF max)."""
+    denoiser = SpectralDenoiser()
+    raw_errors, clean_errors, scored = 0.0, 0.0, 0
+    cpu_total, rtf_max = 0.0, 0.0
+    for name, samples, sample_rate, reference in corpus:
+        noisy = mix_noise(samples, noise, snr_db) if noise is not None else samples
+        start = time.process_time()
+        cleaned = denoiser.process(noisy, sample_rate)
+        cpu = time.process_time() - start
+        cpu_total += cpu
+        rtf_max = max(rtf_max, cpu / (len(samples) / sample_rate))
+        if recognizer and reference is not None:
+            raw_errors += word_error_rate(reference, recognize(recognizer, noisy, sample_rate, language))
+            clean_errors += word_error_rate(reference, recognize(recognizer, cleaned, sample_rate, language))
+            scored += 1
+    if not scored:
+        return None, None, cpu_total, rtf_max
+    return raw_errors / scored, clean_errors / scored, cpu_total, rtf_max
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure l'effet de la réduction de bruit sur le WER et le CPU.")
+    parser.add_argument("corpus", help="Dossier de fichiers .wav (mono 16 bits) et de transcriptions .txt")
+    parser.add_argument("--noise", help="Fichier WAV de bruit à mélanger aux phrases")
+    parser.add_argument("--snr", type=float, nargs="+", default=[10.0], help="Rapports signal/bruit (dB) à tester")
+    parser.add_argument("--language", default="fr-FR", help="Langue de reconnaissance")
+    parser.add_argument("--no-recognition", action="store_true", help="Ne mesure que le coût CPU")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        parser.error("Aucun fichier .wav dans le corpus.")
+    duration = sum(len(samples) / rate for _, samples, rate, _ in corpus)
+    noise = load_wav(args.noise)[0] if args.noise else None
+    recognizer = None if args.no_recognition else sr.Recognizer()
+    conditions = args.snr if noise is not None else [None]
+
+    print(f"{len(corpus)} phrases, {duration:.1f} s d'audio")
+    print(f"{'RSB (dB)':>9} {'WER brut':>9} {'WER débruité':>13} {'CPU (s)':>8} {'RTF moyen':>10} {'RTF max':>8}")
+    for snr_db in conditions:
+        raw_wer, clean_wer, cpu, rtf_max = run(corpus, noise, snr_db, recognizer, args.language)
+        label = "-" if snr_db is None else f"{snr_db:g}"
+        raw = "-" if raw_wer is None else f"{raw_wer:.1%}"
+        clean = "-" if clean_wer is None else f"{clean_wer:.1%}"
+        print(f"{label:>9} {raw:>9} {clean:>13} {cpu:>8.3f} {cpu / duration:>10.4f} {rtf_max:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
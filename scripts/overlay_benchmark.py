@@ -0,0 +1,110 @@
+# scripts/overlay_benchmark.py
+"""
+Mesure le coût de l'overlay d'enregistrement pendant l'écoute : temps CPU du
+processus, nombre de dessins, pixels redessinés et surface de la fenêtre que
+le compositeur doit mélanger à chaque image.
+
+Des niveaux aléatoires sont envoyés à l'overlay au rythme réel du thread de
+reconnaissance (LEVEL_METER_INTERVAL_SECONDS). Avec `--baseline REV`, l'overlay
+est chargé depuis une révision git : l'ancien overlay plein écran n'ayant pas
+de vumètre, il est alors redessiné à chaque niveau, comme le ferait un vumètre
+ajouté sans limiter la zone redessinée.
+
+Exemples :
+    python scripts/overlay_benchmark.py
+    python scripts/overlay_benchmark.py --baseline 159fedc
+    QT_QPA_PLATFORM=offscreen python scripts/overlay_benchmark.py --seconds 20
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import os  # Pour rendre les modules du projet importables
+import random  # Pour les niveaux simulés
+import subprocess  # Pour lire l'ancien overlay dans git
+import sys  # Pour rendre les modules du projet importables
+import time  # Pour mesurer le temps CPU
+import types  # Pour charger l'ancien overlay comme un module
+
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from PyQt6.QtWidgets import QApplication
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from constants import LEVEL_METER_INTERVAL_SECONDS, LEVEL_METER_FULL_SCALE  # noqa: E402
+
+
+class PaintCounter(QObject):
+    """Filtre d'événements qui compte les dessins d'un widget et les pixels redessinés."""
+
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+        self.pixels = 0
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            self.paints += 1
+            self.pixels += event.rect().width() * event.rect().height()
+        return False
+
+
+def load_overlay_class(revision: str = None):
+    """Renvoie la classe RecordingOverlay actuelle, ou celle d'une révision git."""
+    if revision is None:
+        from ui.screen_overlay import RecordingOverlay
+        return RecordingOverlay
+    source = subprocess.run(["git", "show", f"{revision}:ui/screen_overlay.py"], cwd=ROOT,
+                            check=True, capture_output=True, text=True).stdout
+    module = types.ModuleType(f"screen_overlay_{revision}")
+    exec(compile(source, f"{revision}:ui/screen_overlay.py", "exec"), module.__dict__)
+    return module.RecordingOverlay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le coût CPU et de composition de l'overlay.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Durée de la mesure")
+    parser.add_argument("--baseline", metavar="REV", help="Mesure l'overlay d'une révision git")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    overlay = load_overlay_class(args.baseline)()
+    counter = PaintCounter()
+    overlay.installEventFilter(counter)
+    overlay.show()
+    # Laisse passer le premier dessin complet, puis remet les compteurs à zéro
+    deadline = time.monotonic() + 0.5
+    while time.monotonic() < deadline:
+        app.processEvents()
+    counter.paints = counter.pixels = 0
+
+    def feed_level() -> None:
+        level = random.randint(0, LEVEL_METER_FULL_SCALE)
+        if hasattr(overlay, "set_level"):
+            overlay.set_level(level)
+        else:
+            # Ancien overlay : un vumètre naïf redessine toute la fenêtre à chaque niveau
+            overlay.update()
+
+    feeder = QTimer()
+    feeder.setInterval(round(LEVEL_METER_INTERVAL_SECONDS * 1000))
+    feeder.timeout.connect(feed_level)
+    feeder.start()
+    QTimer.singleShot(round(args.seconds * 1000), app.quit)
+
+    cpu_started, wall_started = time.process_time(), time.monotonic()
+    app.exec()
+    cpu, wall = time.process_time() - cpu_started, time.monotonic() - wall_started
+
+    surface = overlay.width() * overlay.height()
+    print(f"Overlay {args.baseline or 'actuel'} sur {app.platformName()}, {wall:.1f} s")
+    print(f"  surface de la fenêtre : {overlay.width()}×{overlay.height()} = {surface} pixels")
+    print(f"  CPU du processus      : {cpu * 1000:.0f} ms ({100 * cpu / wall:.2f} %)")
+    print(f"  dessins               : {counter.paints} ({counter.paints / wall:.1f}/s)")
+    print(f"  pixels redessinés     : {counter.pixels / wall / 1e6:.3f} Mpx/s")
+    print(f"  pixels composés       : {surface * counter.paints / wall / 1e6:.3f} Mpx/s "
+          f"(fenêtre entière mélangée à chaque dessin)")
+
+
+if __name__ == "__main__":
+    main()
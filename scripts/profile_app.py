@@ -0,0 +1,50 @@
+# scripts/profile_app.py
+"""
+Demande un profilage à l'application en cours d'exécution, par son socket de
+contrôle (voir core/profiler_threads.py), et attend que les fichiers soient écrits.
+Équivaut à l'entrée « Profiler » du menu de l'icône, avec une durée au choix.
+
+Exemples :
+    python scripts/profile_app.py                 # durée par défaut
+    python scripts/profile_app.py --seconds 30    # pendant une dictée lente
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import os  # Pour rendre les modules du projet importables
+import socket  # Pour joindre l'application
+import sys  # Pour le code de retour
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.profiler import default_socket_path  # noqa: E402
+from constants import PROFILER_DEFAULT_SECONDS  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile l'application PyVoiceToChat en cours d'exécution.")
+    parser.add_argument("--seconds", type=float, default=PROFILER_DEFAULT_SECONDS, help="Durée du profilage")
+    parser.add_argument("--socket", default=default_socket_path(), help="Chemin du socket de contrôle")
+    args = parser.parse_args()
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(args.socket)
+    except OSError as e:
+        sys.exit(f"Impossible de joindre l'application ({args.socket}) : {e}")
+    with client, client.makefile("r", encoding="utf-8") as reader:
+        client.sendall(f"profile {args.seconds}\n".encode("utf-8"))
+        for line in reader:
+            kind, _, detail = line.strip().partition(" ")
+            if kind == "started":
+                print(f"Profilage en cours ({args.seconds:g} s), fichiers dans {detail}")
+            elif kind == "done":
+                print("Profil enregistré :")
+                for name in sorted(os.listdir(detail)):
+                    print(f"  {os.path.join(detail, name)}")
+            else:
+                sys.exit(f"{kind} : {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# scripts/recognition_load.py
+"""
+Générateur de charge pour le serveur de reconnaissance partagé : simule N
+clients qui envoient des phrases en continu et mesure le débit et la latence
+pour chaque nombre de clients, ainsi que l'équité entre clients.
+
+Par défaut, le script lance son propre serveur avec un moteur simulé dont le
+coût d'un lot est `--base-cost + n × --item-cost` secondes : cela mesure le
+serveur lui-même (file équitable, lots, protocole) sans réseau ni modèle.
+Avec `--socket`, il charge un vrai serveur déjà lancé.
+
+Les gains dus aux lots mesurés avec le moteur simulé ne valent que pour les
+moteurs qui décodent plusieurs phrases à la fois (whisper) : le moteur
+google traite une phrase par requête.
+
+Le serveur identifie ses clients par utilisateur : les clients simulés, tous
+lancés par le même utilisateur, partagent une file. Le serveur simulé borne
+donc cette file à `--queue-limit` phrases par client simulé, et l'équité
+mesurée est celle entre les connexions de cet utilisateur.
+
+Exemples :
+    python scripts/recognition_load.py --clients 1 2 4 8 16 32
+    python scripts/recognition_load.py --batch-size 1 --workers 1      # sans lots, pour comparer
+    python scripts/recognition_load.py --socket /run/pyvoicetochat/recognition.sock --wav phrase.wav
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import math  # Pour la phrase synthétique
+import os  # Pour rendre les modules du projet importables
+import struct  # Pour la phrase synthétique
+import sys  # Pour rendre les modules du projet importables
+import tempfile  # Pour le socket du serveur simulé
+import threading  # Pour les clients simulés
+import time  # Pour mesurer les latences
+
+import speech_recognition as sr
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.recognition_server import (RecognitionServer, RecognitionClient, ServerBusyError,  # noqa: E402
+                                     STATUS_OK, query_stats)
+from constants import RECOGNITION_SERVER_BATCH_WINDOW_SECONDS, RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT  # noqa: E402
+
+
+class SimulatedBackend:
+    """Moteur simulé : un lot coûte un temps fixe plus un temps par phrase."""
+    name = "simulé"
+
+    def __init__(self, base_cost: float, item_cost: float, max_batch: int, concurrency: int):
+        self.base_cost = base_cost
+        self.item_cost = item_cost
+        self.max_batch = max_batch
+        self.concurrency = concurrency
+
+    def transcribe_batch(self, batch):
+        time.sleep(self.base_cost + self.item_cost * len(batch))
+        return [(STATUS_OK, "bonjour")] * len(batch)
+
+
+def synthetic_utterance(seconds: float = 2.0, sample_rate: int = 16000) -> sr.AudioData:
+    """Une phrase factice (son modulé) de la durée demandée."""
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate)))
+        for i in range(int(seconds * sample_rate))
+    )
+    return sr.AudioData(frames, sample_rate, 2)
+
+
+def run_level(path: str, clients: int, duration: float, audio: sr.AudioData, think_time: float) -> dict:
+    """
+    Fait tourner `clients` clients pendant `duration` secondes.
+
+    Returns:
+        dict: Débit, latences et compteurs de ce palier.
+    """
+    deadline = time.monotonic() + duration
+    latencies, completed = [], [0] * clients
+    counters = {"unknown": 0, "busy": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def client_loop(index: int) -> None:
+        client = RecognitionClient(path)
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                client.transcribe(audio)
+                outcome = None
+            except sr.UnknownValueError:
+                outcome = "unknown"
+            except ServerBusyError:
+                outcome = "busy"
+            except sr.RequestError:
+                outcome = "errors"
+            elapsed = time.monotonic() - started
+            with lock:
+                if outcome:
+                    counters[outcome] += 1
+                else:
+                    latencies.append(elapsed)
+                    completed[index] += 1
+            if think_time:
+                time.sleep(think_time)
+        client.close()
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    # Indice d'équité de Jain : 1 si tous les clients ont obtenu autant de réponses
+    squares = sum(count * count for count in completed)
+    fairness = sum(completed) ** 2 / (clients * squares) if squares else None
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] if latencies else None,
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else None,
+        "fairness": fairness,
+        **counters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le débit du serveur de reconnaissance selon le nombre de clients.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="Nombres de clients à tester")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de chaque palier (s)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause de chaque client entre deux phrases (s)")
+    parser.add_argument("--wav", help="Phrase à envoyer (synthétique par défaut)")
+    parser.add_argument("--socket", help="Serveur déjà lancé à charger (sinon, serveur simulé)")
+    parser.add_argument("--base-cost", type=float, default=0.2, help="Coût fixe d'un lot simulé (s)")
+    parser.add_argument("--item-cost", type=float, default=0.02, help="Coût d'une phrase dans un lot simulé (s)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Taille maximale des lots simulés")
+    parser.add_argument("--workers", type=int, default=1, help="Threads de traitement du serveur simulé")
+    parser.add_argument("--queue-limit", type=int, default=RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT,
+                        help="Phrases en attente par client simulé avant refus")
+    args = parser.parse_args()
+
+    if args.wav:
+        with sr.AudioFile(args.wav) as source:
+            audio = sr.Recognizer().record(source)
+    else:
+        audio = synthetic_utterance()
+
+    server = None
+    path = args.socket
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "charge.sock")
+        backend = SimulatedBackend(args.base_cost, args.item_cost, args.batch_size, args.workers)
+        # Tous les clients simulés sont le même utilisateur : une seule file, à la mesure de leur nombre
+        server = RecognitionServer(backend, path, batch_window=RECOGNITION_SERVER_BATCH_WINDOW_SECONDS,
+                                   client_queue_limit=args.queue_limit * max(args.clients))
+        server.start()
+
+    print(f"{'clients':>7} {'phrases/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'équité':>7} "
+          f"{'incomp.':>7} {'refusées':>8} {'erreurs':>7}")
+    for clients in args.clients:
+        result = run_level(path, clients, args.duration, audio, args.think_time)
+        p50 = "-" if result["p50"] is None else f"{result['p50'] * 1000:.0f}"
+        p95 = "-" if result["p95"] is None else f"{result['p95'] * 1000:.0f}"
+        fairness = "-" if result["fairness"] is None else f"{result['fairness']:.2f}"
+        print(f"{clients:>7} {result['throughput']:>10.1f} {p50:>9} {p95:>9} {fairness:>7} "
+              f"{result['unknown']:>7} {result['busy']:>8} {result['errors']:>7}")
+
+    stats = query_stats(path)
+    mean_batch = stats["mean_batch_size"]
+    print(f"\nServeur : {stats['batches']} lot(s), {'-' if mean_batch is None else f'{mean_batch:.1f}'} "
+          f"phrase(s) par lot en moyenne")
+    if server:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
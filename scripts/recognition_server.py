@@ -0,0 +1,108 @@
+# scripts/recognition_server.py
+"""
+Lance le serveur de reconnaissance partagé (voir core/recognition_server.py),
+ou affiche les statistiques par client d'un serveur en cours d'exécution.
+
+Chaque instance de PyVoiceToChat l'utilise si le réglage "recognition_server"
+de son config.json contient le chemin du socket.
+
+Le socket est créé dans un dossier appartenant au serveur et modifiable par
+lui seul. Avec systemd, `RuntimeDirectory=` fournit ce dossier, et le groupe
+et le umask du service déterminent qui peut se connecter :
+
+    [Service]
+    User=pyvoicetochat
+    Group=pyvoicetochat          # les utilisateurs autorisés sont membres de ce groupe
+    RuntimeDirectory=pyvoicetochat
+    UMask=0002                   # socket accessible au groupe
+    ExecStart=/usr/bin/python3 /opt/pyvoicetochat/scripts/recognition_server.py
+
+`--stats` affiche les statistiques de l'utilisateur qui le lance, ou celles
+de tous pour l'utilisateur du serveur.
+
+Exemples :
+    python scripts/recognition_server.py                         # moteur google, 8 requêtes simultanées
+    python scripts/recognition_server.py --backend whisper --model small --batch-size 16
+    python scripts/recognition_server.py --stats                 # statistiques du serveur lancé
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import os  # Pour rendre les modules du projet importables
+import sys  # Pour rendre les modules du projet importables
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.recognition_server import GoogleBackend, WhisperBackend, RecognitionServer, query_stats  # noqa: E402
+from constants import (RECOGNITION_SERVER_SOCKET, RECOGNITION_SERVER_WORKERS, RECOGNITION_SERVER_BATCH_SIZE,  # noqa: E402
+                       RECOGNITION_SERVER_BATCH_WINDOW_SECONDS, RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT)
+
+
+def _ms(seconds) -> str:
+    """Durée en millisecondes, ou « - » si inconnue."""
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def default_socket() -> str:
+    """Socket dans le dossier fourni par systemd (RuntimeDirectory=), sinon le chemin par défaut."""
+    runtime_dirs = os.environ.get("RUNTIME_DIRECTORY")
+    if runtime_dirs:
+        return os.path.join(runtime_dirs.split(":")[0], os.path.basename(RECOGNITION_SERVER_SOCKET))
+    return RECOGNITION_SERVER_SOCKET
+
+
+def print_stats(stats: dict) -> None:
+    """Affiche les statistiques du serveur et un tableau par utilisateur connecté."""
+    mean_batch = stats["mean_batch_size"]
+    print(f"Moteur {stats['backend']}, actif depuis {stats['uptime']:.0f} s, {stats['queued']} phrase(s) en attente, "
+          f"{stats['batches']} lot(s) de {'-' if mean_batch is None else f'{mean_batch:.1f}'} phrase(s) en moyenne")
+    print(f"{'utilisateur':<20} {'conn.':>5} {'reçues':>7} {'ok':>6} {'incomp.':>7} {'erreurs':>7} {'refusées':>8} "
+          f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'attente p95':>11}")
+    for name, client in sorted(stats["clients"].items()):
+        print(f"{name:<20} {client['connections']:>5} {client['submitted']:>7} {client['completed']:>6} {client['unknown']:>7} "
+              f"{client['errors']:>7} {client['rejected']:>8} {_ms(client['latency_p50']):>9} "
+              f"{_ms(client['latency_p95']):>9} {_ms(client['queue_wait_p95']):>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de reconnaissance partagé par les instances de PyVoiceToChat.")
+    parser.add_argument("--socket", default=default_socket(), help="Chemin du socket Unix, dans un dossier du serveur")
+    parser.add_argument("--stats", action="store_true", help="Affiche les statistiques d'un serveur lancé")
+    parser.add_argument("--backend", choices=["google", "whisper"], default="google", help="Moteur de reconnaissance")
+    parser.add_argument("--workers", type=int, default=RECOGNITION_SERVER_WORKERS,
+                        help="Requêtes simultanées vers l'API (google)")
+    parser.add_argument("--model", default="base", help="Modèle Whisper (whisper)")
+    parser.add_argument("--batch-size", type=int, default=RECOGNITION_SERVER_BATCH_SIZE,
+                        help="Phrases décodées ensemble (whisper)")
+    parser.add_argument("--batch-window", type=float, default=RECOGNITION_SERVER_BATCH_WINDOW_SECONDS,
+                        help="Attente maximale (s) pour compléter un lot")
+    parser.add_argument("--queue-limit", type=int, default=RECOGNITION_SERVER_CLIENT_QUEUE_LIMIT,
+                        help="Phrases en attente par client avant refus")
+    args = parser.parse_args()
+
+    if args.stats:
+        try:
+            print_stats(query_stats(args.socket))
+        except OSError as e:
+            sys.exit(f"Serveur injoignable ({args.socket}) : {e}")
+        return
+
+    if args.backend == "whisper":
+        backend = WhisperBackend(args.model, max_batch=args.batch_size)
+    else:
+        backend = GoogleBackend(concurrency=args.workers)
+    server = RecognitionServer(backend, args.socket, batch_window=args.batch_window,
+                               client_queue_limit=args.queue_limit)
+    if backend.max_batch == 1:
+        print(f"Le moteur {backend.name} traite une phrase par requête : pas de lots, {backend.concurrency} "
+              f"requête(s) simultanée(s).")
+    print(f"Serveur de reconnaissance ({backend.name}) sur {args.socket}. Ctrl+C pour arrêter.")
+    try:
+        server.serve_forever()
+    except OSError as e:
+        sys.exit(f"Impossible de lancer le serveur ({args.socket}) : {e}")
+    print_stats(server.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scripts/replay_session.py
+"""
+Rejoue un journal de session (voir core/session_recorder.py) à travers la
+reconnaissance, sans interface : les phrases enregistrées passent par un
+`VoiceRecognizerThread` alimenté par un `ReplayEngine`, exactement comme des
+phrases capturées. Pour chaque phrase, affiche le texte reconnu à l'origine,
+le texte tapé, et le résultat et la latence obtenus maintenant.
+
+Exemples :
+    python scripts/replay_session.py                       # dossier recordings/
+    python scripts/replay_session.py recordings/session-20261019-101500-0001.pvlog --denoise
+    python scripts/replay_session.py --realtime            # respecte le rythme d'origine
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import os  # Pour distinguer un segment d'un dossier
+import sys  # Pour rendre les modules du projet importables
+import time  # Pour afficher l'horodatage des phrases
+
+from PyQt6.QtCore import QCoreApplication, Qt
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.session_recorder import ReplayEngine, read_log, read_segment  # noqa: E402
+from core.voice_recognizer import VoiceRecognizerThread  # noqa: E402
+from utils.events import StateChanged, WorkerState  # noqa: E402
+from constants import RECORDER_DIR, DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD  # noqa: E402
+
+
+class _ReplayReport:
+    """
+    Affiche chaque phrase rejouée à côté de son enregistrement d'origine.
+
+    Sert aussi d'enregistreur au thread de reconnaissance : les phrases non
+    reconnues lui sont remises par `record`, les autres par `recognized_text`.
+    """
+
+    def __init__(self, utterances: list):
+        # Le thread conserve l'horodatage de capture : il retrouve l'enregistrement d'origine
+        self._recorded = {utterance.captured_at: utterance for utterance in utterances}
+        self.failed = False
+
+    def record(self, utterance, typed_text: str) -> None:
+        """Phrase non reconnue (ou refusée par le serveur) pendant le rejeu."""
+        self.show(utterance.recognized_text, utterance)
+
+    def show(self, text: str, utterance) -> None:
+        recorded = self._recorded[utterance.captured_at]
+        audio = utterance.audio
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(recorded.captured_at))
+        print(f"[{when}] {recorded.backend}, {len(audio.frame_data) / (audio.sample_rate * audio.sample_width):.1f} s")
+        print(f"  origine  ({recorded.latency:.2f} s) : {recorded.recognized_text!r} -> tapé {recorded.typed_text!r}")
+        print(f"  rejeu    ({utterance.latency:.2f} s) : {text!r}")
+
+    def on_worker_event(self, event) -> None:
+        """Termine le rejeu sur l'état final du thread, en affichant l'erreur éventuelle."""
+        if not isinstance(event, StateChanged) or event.state not in (WorkerState.STOPPED, WorkerState.ERROR):
+            return
+        if event.state is WorkerState.ERROR:
+            # API injoignable, serveur absent...
+            print(event.detail, file=sys.stderr)
+            self.failed = True
+        QCoreApplication.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue un journal de session à travers la reconnaissance.")
+    parser.add_argument("path", nargs="?", default=RECORDER_DIR, help="Segment .pvlog ou dossier de segments")
+    parser.add_argument("--denoise", action="store_true", help="Active la réduction de bruit")
+    parser.add_argument("--realtime", action="store_true", help="Respecte les intervalles d'origine entre les phrases")
+    parser.add_argument("--server", help="Socket d'un serveur de reconnaissance partagé")
+    args = parser.parse_args()
+
+    utterances = list(read_segment(args.path) if os.path.isfile(args.path) else read_log(args.path))
+    if not utterances:
+        parser.error("Aucune phrase enregistrée.")
+
+    # Boucle d'événements sans affichage : elle ne sert qu'à attendre la fin du thread
+    app = QCoreApplication(sys.argv)
+    report = _ReplayReport(utterances)
+    worker = VoiceRecognizerThread(DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD,
+                                   noise_suppression=args.denoise, recorder=report,
+                                   engine=ReplayEngine(utterances, realtime=args.realtime),
+                                   server_path=args.server)
+    # Affiché depuis le thread de reconnaissance, dans l'ordre des phrases
+    worker.signals.recognized_text.connect(report.show, type=Qt.ConnectionType.DirectConnection)
+    # L'état final (arrêt en fin de journal, ou erreur) passe par le bus d'événements
+    worker.events.event.connect(report.on_worker_event)
+    worker.start()
+    app.exec()
+    worker.join()
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
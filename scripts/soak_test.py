@@ -0,0 +1,405 @@
+# scripts/soak_test.py
+"""
+Test d'endurance : démarre et arrête la reconnaissance des milliers de fois
+sur un audio factice (fichier WAV lu à la place du micro) et vérifie
+qu'aucune ressource ne fuit.
+
+À intervalles réguliers, le script relève le nombre de threads vivants, de
+processus audio, de descripteurs de fichiers et de segments de mémoire
+partagée, ainsi que la mémoire résidente (RSS). À la fin, il affiche les
+plus gros allocateurs Python (tracemalloc) depuis le début du test et échoue
+(code de retour 1) si un seuil est dépassé.
+
+L'appel à l'API de reconnaissance est remplacé par une attente aléatoire :
+le test ne nécessite ni micro ni réseau. Chaque cycle dure assez longtemps
+pour que le processus audio se calibre et détecte au moins une phrase de
+l'audio synthétique : le test échoue si aucune phrase n'est reconnue.
+
+Avec `--ui`, le test pilote la fenêtre principale comme un utilisateur : le
+raccourci démarre et arrête l'écoute (parfois avec un redémarrage immédiat),
+la calibration est lancée (et le raccourci doit alors être refusé), la cible
+est choisie par l'écouteur de souris. Les sessions sont enregistrées et
+transcrites par un serveur de reconnaissance local simulé. Le test échoue
+aussi si deux processus audio capturent en même temps. Ce mode nécessite un
+écran (ou Xvfb) : pyautogui l'exige dès son importation. Le clic sur la cible
+au démarrage de l'écoute est neutralisé.
+
+Exemples :
+    python scripts/soak_test.py                       # 1000 cycles (5 à 6 s) sur un audio synthétique
+    python scripts/soak_test.py --cycles 5000 --wav bruit_et_parole.wav
+    python scripts/soak_test.py --ui --cycles 300     # par l'interface
+"""
+
+# Importations nécessaires
+import argparse  # Pour les options de la ligne de commande
+import gc  # Pour mesurer la mémoire après collecte
+import math  # Pour l'audio synthétique
+import multiprocessing  # Pour compter les processus audio vivants
+import os  # Pour les descripteurs de fichiers et la mémoire partagée
+import random  # Pour varier la durée des cycles
+import shutil  # Pour l'icône du dossier de travail du mode --ui
+import struct  # Pour écrire l'audio synthétique
+import sys  # Pour rendre les modules du projet importables
+import tempfile  # Pour le fichier WAV synthétique
+import threading  # Pour compter les threads vivants
+import time  # Pour mesurer les délais d'arrêt
+import tracemalloc  # Pour les plus gros allocateurs
+import wave  # Pour écrire l'audio synthétique
+
+from PyQt6.QtCore import QCoreApplication
+
+# Le script est lancé depuis scripts/ : le projet est dans le dossier parent
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from core.audio_engine import AudioEngine  # noqa: E402
+from core.voice_recognizer import VoiceRecognizerThread  # noqa: E402
+from core.recognition_server import RecognitionServer, STATUS_UNKNOWN  # noqa: E402
+from core.audio_process import AMBIENT_CALIBRATION_SECONDS  # noqa: E402
+from constants import DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD, ICON_FILE  # noqa: E402
+
+# Nom des processus audio (voir AudioEngine._spawn)
+AUDIO_PROCESS_NAME = "pyvoicetochat-audio"
+# « Phrase » de l'audio synthétique, après la calibration (qui ne doit entendre que du bruit)
+PHRASE_START_SECONDS = AMBIENT_CALIBRATION_SECONDS + 0.5
+PHRASE_END_SECONDS = PHRASE_START_SECONDS + 1.5
+SYNTHETIC_WAV_SECONDS = PHRASE_END_SECONDS + 1.5
+# Durée minimale d'un cycle : démarrage du processus audio (marge), calibration,
+# phrase, puis le silence qui en marque la fin
+MIN_RUN_SECONDS = 1.0 + PHRASE_END_SECONDS + DEFAULT_PAUSE_THRESHOLD
+
+
+class _FakeRecognizerThread(VoiceRecognizerThread):
+    """Thread de reconnaissance dont l'appel à l'API est simulé."""
+
+    def transcribe(self, audio) -> str:
+        time.sleep(random.uniform(0.0, 0.05))
+        return "test"
+
+
+class _SilentBackend:
+    """
+    Moteur du serveur simulé (mode --ui) : répond « incompris » après une
+    attente aléatoire, en comptant les phrases reçues.
+    """
+    name = "simulé"
+    max_batch = 1
+    concurrency = 4
+
+    def __init__(self):
+        self.transcribed = 0
+        self._lock = threading.Lock()
+
+    def transcribe_batch(self, batch):
+        with self._lock:
+            self.transcribed += len(batch)
+        time.sleep(random.uniform(0.0, 0.3))
+        return [(STATUS_UNKNOWN, "")] * len(batch)
+
+
+def write_synthetic_wav(path: str, sample_rate: int = 16000) -> None:
+    """Écrit un audio de bruit faible contenant une « phrase » (son modulé) après la calibration."""
+    frames = bytearray()
+    for i in range(int(sample_rate * SYNTHETIC_WAV_SECONDS)):
+        t = i / sample_rate
+        value = random.gauss(0, 100)
+        if PHRASE_START_SECONDS <= t < PHRASE_END_SECONDS:
+            value += 8000 * math.sin(2 * math.pi * 220 * t) * (0.6 + 0.4 * math.sin(2 * math.pi * 3 * t))
+        frames += struct.pack("<h", max(-32768, min(32767, int(value))))
+    with wave.open(path, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(bytes(frames))
+
+
+def rss_bytes() -> int:
+    """Mémoire résidente du processus."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def open_fds() -> int:
+    """Nombre de descripteurs de fichiers ouverts (-1 si inconnu sur ce système)."""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    return -1
+
+
+def shared_memory_segments() -> int:
+    """Nombre de segments de mémoire partagée Python (-1 si inconnu sur ce système)."""
+    if not os.path.isdir("/dev/shm"):
+        return -1
+    return sum(1 for name in os.listdir("/dev/shm") if name.startswith("psm_"))
+
+
+def audio_processes() -> int:
+    """Nombre de processus audio vivants."""
+    return sum(1 for process in multiprocessing.active_children() if process.name == AUDIO_PROCESS_NAME)
+
+
+def sample() -> dict:
+    """Relève l'état des ressources."""
+    gc.collect()
+    return {
+        "threads": threading.active_count(),
+        "audio_processes": audio_processes(),
+        "fds": open_fds(),
+        "shm": shared_memory_segments(),
+        "rss": rss_bytes(),
+    }
+
+
+def wait_processing_events(app: QCoreApplication, seconds: float) -> None:
+    """Attend en traitant les événements Qt (livraison des signaux et du bus)."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+class EngineCycles:
+    """Cycles directs sur le thread de reconnaissance (mode par défaut)."""
+
+    def __init__(self, app: QCoreApplication, wav_path: str, min_run: float, max_run: float,
+                 max_stop_seconds: float):
+        self.app = app
+        self.wav_path = wav_path
+        self.min_run = min_run
+        self.max_run = max_run
+        self.max_stop_seconds = max_stop_seconds
+        self.recognized = 0
+        self.stuck = 0
+        self.failures = []
+
+    def _on_text(self, _text, _utterance) -> None:
+        self.recognized += 1
+
+    def cycle(self) -> float:
+        """Démarre puis arrête un thread. Renvoie le délai d'arrêt."""
+        thread = _FakeRecognizerThread(
+            DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD,
+            engine=AudioEngine(DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD, wav_path=self.wav_path),
+        )
+        thread.signals.recognized_text.connect(self._on_text)
+        thread.start()
+        wait_processing_events(self.app, random.uniform(self.min_run, self.max_run))
+
+        started = time.monotonic()
+        thread.stop()
+        thread.join(timeout=self.max_stop_seconds)
+        latency = time.monotonic() - started
+        if thread.is_alive():
+            self.stuck += 1
+        self.app.processEvents()
+        return latency
+
+    def close(self) -> None:
+        """Rien à fermer."""
+
+
+class UiCycles:
+    """
+    Cycles par la fenêtre principale (mode --ui) : raccourci, calibration,
+    sélection de la cible à la souris, arrêt de l'application.
+    """
+
+    def __init__(self, app, wav_path: str, min_run: float, max_run: float):
+        # Importé à la demande : pyautogui nécessite un écran
+        from ui import main_window
+        # Le démarrage de l'écoute clique sur la cible : le test ne doit pas cliquer sur le bureau
+        main_window.pyautogui.click = lambda *args, **kwargs: None
+        self.app = app
+        self.min_run = min_run
+        self.max_run = max_run
+        self.stuck = 0
+        self.failures = []
+        self.backend = _SilentBackend()
+        self.server = RecognitionServer(self.backend, os.path.join(tempfile.mkdtemp(), "soak.sock"))
+        self.server.start()
+        self.window = main_window.VoiceToChatApp()
+        self.window.audio_wav_path = wav_path
+        self.window.config["target"] = {"x": 0, "y": 0}
+        self.window.config["settings"]["recognition_server"] = self.server.path
+        self.window.session_recording_checkbox.setChecked(True)
+
+    @property
+    def recognized(self) -> int:
+        """Phrases détectées et transmises au serveur (qui n'en reconnaît aucune)."""
+        return self.backend.transcribed
+
+    def _fail(self, message: str) -> None:
+        """Note un échec (une seule fois par type)."""
+        if message not in self.failures:
+            self.failures.append(message)
+
+    def _press_recognition_shortcut(self) -> None:
+        """Déclenche le raccourci de reconnaissance par le callback qu'appelle pynput."""
+        self.window.shortcut_listener._on_recognition_shortcut()
+        self.app.processEvents()
+
+    def _check_single_capture(self) -> None:
+        """Vérifie qu'un seul processus audio capture à la fois."""
+        if audio_processes() > 1:
+            self._fail("deux processus audio capturent en même temps")
+
+    def _wait_for(self, condition, timeout: float) -> bool:
+        """Traite les événements Qt jusqu'à ce que `condition()` soit vraie."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            self.app.processEvents()
+            time.sleep(0.005)
+        return True
+
+    def select_target(self) -> None:
+        """Choisit la cible par l'écouteur de souris, comme un clic de l'utilisateur."""
+        self.window.define_target_position()
+        # La sélection démarre après la minimisation de la fenêtre
+        if not self._wait_for(lambda: self.window.mouse_listener is not None, 1.0):
+            self._fail("l'écouteur de souris n'a pas démarré")
+            return
+        x, y = random.randint(0, 500), random.randint(0, 500)
+        self.window._on_mouse_click(x, y, None, True)
+        if not self._wait_for(lambda: self.window.config["target"] == {"x": x, "y": y}, 1.0):
+            self._fail("la cible n'a pas été définie par le clic")
+
+    def calibrate(self) -> None:
+        """Lance une calibration ; le raccourci de reconnaissance doit être refusé pendant ce temps."""
+        self.window.run_auto_calibration()
+        self._press_recognition_shortcut()
+        if self.window.is_listening:
+            self._fail("écoute démarrée pendant la calibration")
+            self._press_recognition_shortcut()
+        if not self._wait_for(lambda: not self.window.calibration_thread.is_alive(), 5.0):
+            self.stuck += 1
+
+    def cycle(self) -> float:
+        """Un cycle d'écoute par le raccourci, parfois précédé d'une calibration ou d'un choix de cible."""
+        action = random.random()
+        if action < 0.05:
+            self.calibrate()
+        elif action < 0.15:
+            self.select_target()
+
+        self._press_recognition_shortcut()
+        self._check_single_capture()
+        wait_processing_events(self.app, random.uniform(self.min_run, self.max_run))
+        started = time.monotonic()
+        self._press_recognition_shortcut()
+        latency = time.monotonic() - started
+        if self.window.is_listening:
+            self._fail("le raccourci n'a pas arrêté l'écoute")
+        if random.random() < 0.3:
+            # Redémarrage immédiat : l'ancien processus audio doit déjà avoir libéré le micro
+            self._press_recognition_shortcut()
+            self._check_single_capture()
+            self._press_recognition_shortcut()
+        return latency
+
+    def close(self) -> None:
+        """Quitte l'application comme le menu de l'icône, puis arrête le serveur."""
+        self.window._cleanup_on_quit()
+        self.server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Démarre/arrête la reconnaissance en boucle et détecte les fuites.")
+    parser.add_argument("--cycles", type=int, default=1000, help="Nombre de démarrages/arrêts")
+    parser.add_argument("--wav", help="Audio mono 16 bits lu à la place du micro (synthétique par défaut)")
+    parser.add_argument("--ui", action="store_true", help="Pilote la fenêtre principale (nécessite un écran)")
+    parser.add_argument("--min-run", type=float, default=MIN_RUN_SECONDS,
+                        help="Durée d'écoute minimale par cycle (s) : calibration et une phrase par défaut")
+    parser.add_argument("--max-run", type=float, default=MIN_RUN_SECONDS + 1.0,
+                        help="Durée d'écoute maximale par cycle (s)")
+    parser.add_argument("--report-every", type=int, default=100, help="Intervalle des relevés (cycles)")
+    parser.add_argument("--warmup", type=int, default=10, help="Cycles ignorés avant la mesure de référence")
+    parser.add_argument("--max-stop-seconds", type=float, default=1.5, help="Délai d'arrêt maximal d'un thread")
+    parser.add_argument("--max-thread-growth", type=int, default=2)
+    parser.add_argument("--max-fd-growth", type=int, default=10)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50.0)
+    args = parser.parse_args()
+    if args.max_run < args.min_run:
+        parser.error("--max-run doit être supérieur ou égal à --min-run.")
+
+    wav_path = args.wav
+    if not wav_path:
+        wav_path = os.path.join(tempfile.mkdtemp(), "soak.wav")
+        write_synthetic_wav(wav_path)
+    wav_path = os.path.abspath(wav_path)
+
+    if args.ui:
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+        # config.json et les journaux de session du test restent dans un dossier temporaire
+        workdir = tempfile.mkdtemp()
+        shutil.copy(os.path.join(ROOT, ICON_FILE), workdir)
+        os.chdir(workdir)
+        runner = UiCycles(app, wav_path, args.min_run, args.max_run)
+    else:
+        app = QCoreApplication(sys.argv)
+        runner = EngineCycles(app, wav_path, args.min_run, args.max_run, args.max_stop_seconds)
+
+    stop_latencies = []
+    baseline = None
+    snapshot = None
+    tracemalloc.start(25)
+    print(f"{'cycle':>7} {'threads':>8} {'audio':>6} {'fds':>5} {'shm':>4} {'RSS (Mo)':>9} {'arrêt max (s)':>14}")
+    for cycle in range(1, args.cycles + 1):
+        stop_latencies.append(runner.cycle())
+
+        if cycle == args.warmup:
+            baseline = sample()
+            snapshot = tracemalloc.take_snapshot()
+        if cycle % args.report_every == 0 or cycle == args.cycles:
+            state = sample()
+            print(f"{cycle:>7} {state['threads']:>8} {state['audio_processes']:>6} {state['fds']:>5} "
+                  f"{state['shm']:>4} {state['rss'] / 2**20:>9.1f} {max(stop_latencies):>14.3f}")
+    runner.close()
+
+    # Laisse aux derniers threads le temps de se terminer avant le relevé final
+    wait_processing_events(app, args.max_stop_seconds)
+    final = sample()
+    baseline = baseline or final
+    print(f"\n{args.cycles} cycles, {runner.recognized} phrases reconnues, {runner.stuck} thread(s) bloqué(s) à l'arrêt")
+    stop_latencies.sort()
+    print(f"Délai d'arrêt : médian {stop_latencies[len(stop_latencies) // 2]:.3f} s, max {stop_latencies[-1]:.3f} s")
+
+    if snapshot:
+        print("\nPlus gros allocateurs depuis la référence :")
+        for stat in tracemalloc.take_snapshot().compare_to(snapshot, "lineno")[:10]:
+            print(f"  {stat}")
+
+    failures = list(runner.failures)
+    if runner.recognized == 0:
+        failures.append("aucune phrase détectée : la capture ne fonctionne pas")
+    if runner.stuck:
+        failures.append(f"{runner.stuck} thread(s) non arrêté(s) à temps")
+    if stop_latencies[-1] > args.max_stop_seconds:
+        failures.append(f"arrêt en {stop_latencies[-1]:.2f} s (maximum {args.max_stop_seconds} s)")
+    if final["threads"] - baseline["threads"] > args.max_thread_growth:
+        failures.append(f"threads : {baseline['threads']} -> {final['threads']}")
+    if final["audio_processes"] > 0:
+        failures.append(f"{final['audio_processes']} processus audio encore vivant(s)")
+    if final["fds"] - baseline["fds"] > args.max_fd_growth:
+        failures.append(f"descripteurs : {baseline['fds']} -> {final['fds']}")
+    if final["shm"] > baseline["shm"]:
+        failures.append(f"mémoire partagée : {baseline['shm']} -> {final['shm']} segments")
+    if (final["rss"] - baseline["rss"]) / 2**20 > args.max_rss_growth_mb:
+        failures.append(f"RSS : {baseline['rss'] / 2**20:.1f} -> {final['rss'] / 2**20:.1f} Mo")
+
+    if failures:
+        print("\nÉCHEC :")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nSUCCÈS : aucune fuite détectée.")
+
+
+if __name__ == "__main__":
+    main()
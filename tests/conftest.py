@@ -0,0 +1,24 @@
+# tests/conftest.py
+"""
+Configuration commune des tests : rend les modules du projet importables et
+permet de lancer les tests sans écran (Qt hors écran, pynput factice).
+"""
+
+# Importations nécessaires
+import os  # Pour les variables d'environnement
+import sys  # Pour rendre les modules du projet importables
+
+import pytest
+
+# Les tests sont lancés depuis tests/ : le projet est dans le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Sans serveur graphique, Qt dessine hors écran et pynput n'écoute rien
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """Application Qt partagée par les tests qui utilisent signaux et minuteries."""
+    from PyQt6.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
@@ -0,0 +1,131 @@
+# tests/test_audio_engine.py
+"""Tests du détecteur de phrases par seuil d'énergie, de la relance et de l'arrêt du processus audio."""
+
+# Importations nécessaires
+import multiprocessing.connection  # Pour vérifier la fin du processus audio
+import struct  # Pour écrire un fichier WAV silencieux
+import time  # Pour attendre le démarrage du processus audio
+import wave  # Pour écrire un fichier WAV silencieux
+
+import pytest
+
+from core import audio_engine
+from core.audio_engine import AudioEngine, AudioEngineError
+from core.audio_process import EnergyVad
+
+SAMPLE_RATE = 16000
+CHUNK = 1024
+
+
+def _run(vad: EnergyVad, levels) -> list:
+    """Passe une suite de RMS au détecteur et renvoie les phrases détectées."""
+    phrases, end = [], 0
+    for rms in levels:
+        end += vad.bytes_per_buffer
+        _, phrase = vad.process(rms, end)
+        if phrase:
+            phrases.append(phrase)
+    return phrases
+
+
+def _buffers(seconds: float) -> int:
+    """Nombre de blocs couvrant `seconds` secondes."""
+    return round(seconds * SAMPLE_RATE / CHUNK)
+
+
+def test_steady_speech_is_a_single_phrase():
+    vad = EnergyVad(SAMPLE_RATE, 2, CHUNK, energy_threshold=300, pause_threshold=0.8)
+    # 1 s de bruit de fond, 3 s de parole à niveau constant, 2 s de silence
+    levels = [50] * _buffers(1) + [2000] * _buffers(3) + [50] * _buffers(2)
+
+    phrases = _run(vad, levels)
+
+    assert len(phrases) == 1
+    start, end = phrases[0]
+    # La phrase couvre au moins les 3 s de parole
+    assert (end - start) / vad.bytes_per_buffer >= _buffers(3)
+
+
+def test_threshold_adapts_to_ambient_noise_only_between_phrases():
+    vad = EnergyVad(SAMPLE_RATE, 2, CHUNK, energy_threshold=300, pause_threshold=0.8)
+    _run(vad, [100] * _buffers(2))
+    # Le seuil converge vers le bruit ambiant × DYNAMIC_ENERGY_RATIO
+    assert 140 < vad.energy_threshold < 160
+
+    threshold = vad.energy_threshold
+    _run(vad, [2000] * _buffers(1))
+    # Pendant la phrase, le seuil ne bouge pas
+    assert vad.in_phrase
+    assert vad.energy_threshold == threshold
+
+
+@pytest.fixture
+def silence_wav(tmp_path) -> str:
+    """Fichier WAV d'une seconde de silence, lu en boucle à la place du micro."""
+    path = str(tmp_path / "silence.wav")
+    with wave.open(path, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(SAMPLE_RATE)
+        writer.writeframes(struct.pack("<h", 0) * SAMPLE_RATE)
+    return path
+
+
+def _pump_until(engine: AudioEngine, condition, timeout: float = 10.0) -> bool:
+    """Traite les messages du processus audio jusqu'à ce que `condition()` soit vraie."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        engine.next_utterance(0.05)
+    return True
+
+
+def test_killed_audio_process_is_restarted(silence_wav):
+    engine = AudioEngine(300, 0.8, wav_path=silence_wav)
+    engine.start()
+    try:
+        assert _pump_until(engine, lambda: engine.ready)
+        crashed = engine._process
+        crashed.kill()
+
+        # La mort est détectée, un nouveau processus est lancé et refait son ajustement
+        assert _pump_until(engine, lambda: engine._process is not crashed)
+        assert engine.restarts == 1
+        assert not engine.ready
+        assert _pump_until(engine, lambda: engine.ready)
+        assert engine._process.is_alive()
+    finally:
+        engine.stop()
+
+
+def test_engine_gives_up_after_max_restarts(silence_wav, monkeypatch):
+    monkeypatch.setattr(audio_engine, "AUDIO_ENGINE_MAX_RESTARTS", 1)
+    engine = AudioEngine(300, 0.8, wav_path=silence_wav)
+    engine.start()
+    try:
+        engine._process.kill()
+        assert _pump_until(engine, lambda: engine.restarts == 1)
+        engine._process.kill()
+        with pytest.raises(AudioEngineError):
+            _pump_until(engine, lambda: False, timeout=10.0)
+    finally:
+        engine.stop()
+
+
+def test_release_waits_for_the_audio_process(silence_wav):
+    engine = AudioEngine(300, 0.8, wav_path=silence_wav)
+    engine.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not engine._process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert engine._process.is_alive()
+
+        engine.release(timeout=5)
+
+        # Au retour, l'ancien processus a fermé ses descripteurs (dont le micro) :
+        # une nouvelle session peut ouvrir le micro
+        assert multiprocessing.connection.wait([engine._process.sentinel], 0)
+    finally:
+        engine.stop()
@@ -0,0 +1,47 @@
+# tests/test_audio_ring.py
+"""Tests du tampon circulaire partagé entre le processus audio et l'interface."""
+
+# Importations nécessaires
+import pytest
+
+from core.audio_ring import SharedAudioRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedAudioRing.create(100)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def test_read_across_the_wrap_boundary(ring):
+    ring.write(bytes(range(60)), 10, False)
+    ring.write(bytes(range(100, 160)), 20, True)
+
+    # Le second bloc occupe les 40 derniers octets puis les 20 premiers du tampon
+    assert ring.write_position == 120
+    assert ring.read(60, 120) == bytes(range(100, 160))
+    assert ring.read(30, 90) == bytes(range(30, 60)) + bytes(range(100, 130))
+
+
+def test_overwritten_or_unwritten_data_reads_as_none(ring):
+    ring.write(bytes(60), 0, False)
+    ring.write(bytes(60), 0, False)
+
+    # Les 20 premiers octets du flux ont été écrasés par le second bloc
+    assert ring.read(0, 60) is None
+    assert ring.read(19, 40) is None
+    assert ring.read(20, 40) == bytes(20)
+    # Pas encore écrit
+    assert ring.read(100, 121) is None
+
+
+def test_peak_level_since_the_previous_call(ring):
+    ring.write(bytes(10), 50, False)
+    ring.write(bytes(10), 300, True)
+    level, cursor = ring.peak_level(0)
+    assert (level, cursor) == (300, 2)
+
+    ring.write(bytes(10), 80, False)
+    assert ring.peak_level(cursor) == (80, 3)
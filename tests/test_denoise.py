@@ -0,0 +1,56 @@
+# tests/test_denoise.py
+"""Tests du réducteur de bruit spectral."""
+
+# Importations nécessaires
+import time  # Pour simuler un traitement trop lent
+
+import numpy as np
+import speech_recognition as sr
+
+from constants import DENOISE_FRAME_SECONDS
+from core.denoise import SpectralDenoiser
+
+SAMPLE_RATE = 16000
+
+
+def test_noise_estimate_ignores_zero_padded_first_frame():
+    denoiser = SpectralDenoiser()
+    size = 1 << round(SAMPLE_RATE * DENOISE_FRAME_SECONDS - 1).bit_length()
+    # Sinusoïde dont la période divise le pas des trames : toutes les trames complètes sont identiques
+    bin_index = 16
+    t = np.arange(SAMPLE_RATE)
+    samples = (3000 * np.sin(2 * np.pi * bin_index * t / size)).astype(np.int16)
+
+    denoiser.process(samples, SAMPLE_RATE)
+
+    window = np.sqrt(np.hanning(size + 1)[:-1]).astype(np.float32)
+    full_frame = np.abs(np.fft.rfft(samples[:size].astype(np.float32) * window)) ** 2
+    assert np.isclose(denoiser.noise_profile[bin_index], full_frame[bin_index], rtol=1e-3)
+
+
+def test_denoiser_is_bypassed_when_slower_than_real_time(monkeypatch):
+    denoiser = SpectralDenoiser()
+    audio = sr.AudioData(np.zeros(SAMPLE_RATE // 20, '<i2').tobytes(), SAMPLE_RATE, 2)
+    process = denoiser.process
+
+    def slow_process(samples, sample_rate):
+        # Deux fois la durée de la phrase
+        time.sleep(2 * len(samples) / sample_rate)
+        return process(samples, sample_rate)
+
+    monkeypatch.setattr(denoiser, "process", slow_process)
+    cleaned = denoiser.process_audio(audio)
+    assert cleaned is not audio
+    assert denoiser.real_time_factor > 1
+    assert denoiser.bypassed
+    # Les phrases suivantes passent telles quelles
+    assert denoiser.process_audio(audio) is audio
+
+
+def test_fast_denoiser_is_not_bypassed():
+    denoiser = SpectralDenoiser()
+    samples = np.random.default_rng(0).normal(0, 500, 2 * SAMPLE_RATE).astype('<i2')
+    audio = sr.AudioData(samples.tobytes(), SAMPLE_RATE, 2)
+    denoiser.process_audio(audio)
+    assert denoiser.real_time_factor < 1
+    assert not denoiser.bypassed
@@ -0,0 +1,75 @@
+# tests/test_events.py
+"""Tests du bus d'événements : fusion des rafales et cadence de livraison."""
+
+# Importations nécessaires
+import threading  # Pour publier depuis un thread de travail, comme le reconnaisseur
+import time  # Pour mesurer l'écart entre deux livraisons
+
+from constants import UI_FRAME_BUDGET_MS
+from utils.events import EventBus, LevelChanged, StateChanged, WorkerState
+
+
+def _pump(app, seconds: float) -> None:
+    """Traite les événements Qt pendant `seconds` secondes."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def _pump_until(app, condition, timeout: float = 1.0) -> None:
+    """Traite les événements Qt jusqu'à ce que `condition()` soit vraie."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+
+
+def _publish_burst(bus: EventBus, offset: int) -> None:
+    """Publie une rafale de niveaux et d'états depuis un autre thread."""
+    def burst():
+        for i in range(200):
+            bus.publish(LevelChanged(offset + i))
+            bus.publish(StateChanged(WorkerState.RECOGNIZING if i % 2 else WorkerState.LISTENING, str(offset + i)))
+    worker = threading.Thread(target=burst)
+    worker.start()
+    worker.join()
+
+
+def test_bursts_deliver_latest_of_each_type_once_per_frame(qt_app):
+    bus = EventBus()
+    delivered = []
+    bus.event.connect(lambda event: delivered.append((time.monotonic(), event)))
+
+    _publish_burst(bus, 0)
+    _pump_until(qt_app, lambda: len(delivered) == 2)
+    _pump(qt_app, UI_FRAME_BUDGET_MS / 1000 / 2)
+    # Seul le dernier événement de chaque type de la rafale est livré
+    assert sorted((type(e).__name__, e) for _, e in delivered) == [
+        ("LevelChanged", LevelChanged(199)),
+        ("StateChanged", StateChanged(WorkerState.RECOGNIZING, "199")),
+    ]
+    first_frame = delivered[0][0]
+    assert all(abs(t - first_frame) < UI_FRAME_BUDGET_MS / 1000 / 2 for t, _ in delivered)
+
+    # Une seconde rafale publiée dès la livraison attend le budget de l'image suivante
+    delivered.clear()
+    _publish_burst(bus, 1000)
+    qt_app.processEvents()
+    assert delivered == []
+    _pump(qt_app, 3 * UI_FRAME_BUDGET_MS / 1000)
+    assert [e for _, e in delivered if isinstance(e, LevelChanged)] == [LevelChanged(1199)]
+    assert [e for _, e in delivered if isinstance(e, StateChanged)] == [StateChanged(WorkerState.RECOGNIZING, "1199")]
+    # Marge de 2 ms pour la granularité de la minuterie Qt
+    assert min(t for t, _ in delivered) - first_frame >= (UI_FRAME_BUDGET_MS - 2) / 1000
+
+
+def test_repeated_event_is_not_delivered_again(qt_app):
+    bus = EventBus(frame_budget_ms=1)
+    delivered = []
+    bus.event.connect(delivered.append)
+
+    bus.publish(LevelChanged(10))
+    _pump(qt_app, 0.05)
+    bus.publish(LevelChanged(10))
+    _pump(qt_app, 0.05)
+    assert delivered == [LevelChanged(10)]
@@ -0,0 +1,125 @@
+# tests/test_microphones.py
+"""Tests du choix du micro et de la surveillance des branchements."""
+
+# Importations nécessaires
+import math  # Pour le signal de parole synthétique
+import time  # Pour attendre le thread de surveillance
+import wave  # Pour écrire les micros simulés
+
+import numpy as np
+import pytest
+from PyQt6.QtCore import Qt
+
+from core import microphones
+from core.microphones import (DeviceProfile, MicrophoneWatcherThread, PyAudioDevice, WavFileDevice,
+                              probe_devices, resolve_device_index, select_best)
+
+RATE = 16000
+
+
+def _profile(device: PyAudioDevice, score: float) -> dict:
+    """Profil en cache (format de la configuration) pour `device`."""
+    return DeviceProfile(device.name, device.key, 10, 1000, 0.0, score, score)._asdict()
+
+
+def _write_microphone(path, noise: float, speech: float) -> str:
+    """
+    Écrit une seconde de bruit de fond puis une seconde de « parole » (une
+    sinusoïde d'amplitude `speech` sur ce bruit), écrêtée à 16 bits.
+    """
+    rng = np.random.default_rng(0)
+    background = rng.normal(0, noise, 2 * RATE)
+    voice = np.zeros(2 * RATE)
+    voice[RATE:] = speech * np.sin(2 * math.pi * 440 * np.arange(RATE) / RATE)
+    samples = np.clip(background + voice, -32768, 32767).astype("<i2")
+    with wave.open(str(path), 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(RATE)
+        writer.writeframes(samples.tobytes())
+    return str(path)
+
+
+@pytest.fixture
+def wav_microphones(tmp_path):
+    return [WavFileDevice(_write_microphone(tmp_path / "propre.wav", 100, 8000), "propre"),
+            WavFileDevice(_write_microphone(tmp_path / "bruyant.wav", 2000, 8000), "bruyant"),
+            WavFileDevice(_write_microphone(tmp_path / "sature.wav", 100, 60000), "sature")]
+
+
+def test_probe_measures_noise_floor_snr_and_clipping(wav_microphones):
+    profiles = {profile.name: profile for profile in probe_devices(wav_microphones, duration=2.0)}
+
+    clean, noisy, clipping = profiles["propre"], profiles["bruyant"], profiles["sature"]
+    # Bruit de fond : le RMS du bruit seul
+    assert clean.noise_floor == pytest.approx(100, rel=0.2)
+    assert noisy.noise_floor == pytest.approx(2000, rel=0.2)
+    # Rapport signal/bruit : sinusoïde de RMS 8000/√2 sur ce bruit
+    assert clean.snr_db == pytest.approx(20 * math.log10(8000 / math.sqrt(2) / 100), abs=2)
+    assert noisy.snr_db == pytest.approx(20 * math.log10(math.hypot(8000 / math.sqrt(2), 2000) / 2000), abs=2)
+    # Écrêtage : la seconde de parole saturée, soit la moitié des blocs
+    assert clean.clipping == 0 and noisy.clipping == 0
+    assert clipping.clipping == pytest.approx(0.5, abs=0.1)
+
+
+def test_best_microphone_is_the_clean_one(wav_microphones):
+    profiles = probe_devices(wav_microphones, duration=2.0)
+    # Le micro saturé a le meilleur rapport signal/bruit, mais l'écrêtage le disqualifie
+    assert max(profiles, key=lambda profile: profile.snr_db).name == "sature"
+    assert select_best(profiles).name == "propre"
+    # Sans le micro propre, un micro bruyant vaut mieux qu'un micro saturé
+    assert select_best([profile for profile in profiles if profile.name != "propre"]).name == "bruyant"
+
+
+def test_device_keys_survive_index_changes():
+    # Même micro, index PortAudio différent après un branchement : même clé
+    assert PyAudioDevice(1, "USB Audio", 48000, "ALSA").key == PyAudioDevice(3, "USB Audio", 48000, "ALSA").key
+    # Deux micros de même nom se distinguent par leur rang, pas par leur index
+    assert PyAudioDevice(1, "USB Audio", 48000, "ALSA").key != PyAudioDevice(4, "USB Audio", 48000, "ALSA", 1).key
+    # Un même micro vu par deux API hôtes
+    assert PyAudioDevice(1, "USB Audio", 48000, "ALSA").key != PyAudioDevice(9, "USB Audio", 48000, "JACK").key
+
+
+def test_same_name_devices_are_told_apart():
+    first = PyAudioDevice(1, "USB Audio", 48000, "ALSA")
+    second = PyAudioDevice(4, "USB Audio", 48000, "ALSA", 1)
+    profiles = {first.key: _profile(first, 12.0), second.key: _profile(second, 30.0)}
+
+    # Choix automatique : le meilleur score, même si le nom est le même
+    assert resolve_device_index(None, profiles, [first, second]) == 4
+    # Choix imposé : exactement ce micro
+    assert resolve_device_index(first.key, profiles, [first, second]) == 1
+    # Micro imposé absent : micro du système
+    assert resolve_device_index(second.key, profiles, [first]) is None
+
+
+def test_watcher_enumerates_only_when_sound_cards_change(monkeypatch):
+    signature = ["controlC0"]
+    scans = []
+
+    def list_input_devices():
+        scans.append(time.monotonic())
+        return [PyAudioDevice(i, f"Micro {i}", 16000, "ALSA") for i in range(len(signature))]
+
+    monkeypatch.setattr(microphones, "list_input_devices", list_input_devices)
+    monkeypatch.setattr(microphones, "_hotplug_signature", lambda: tuple(signature))
+    watcher = MicrophoneWatcherThread(interval=0.01)
+    changes = []
+    watcher.signals.microphones_changed.connect(changes.append, type=Qt.ConnectionType.DirectConnection)
+    watcher.start()
+    try:
+        time.sleep(0.2)
+        # Une seule énumération au démarrage, malgré une vingtaine de vérifications
+        assert len(scans) == 1
+        signature.append("controlC1")
+        time.sleep(0.2)
+        assert len(scans) == 2
+        watcher.request_scan()
+        time.sleep(0.2)
+        assert len(scans) == 3
+    finally:
+        watcher.stop()
+        watcher.join(timeout=1)
+    assert not watcher.is_alive()
+    # La liste n'a changé qu'au branchement : deux émissions
+    assert [len(devices) for devices in changes] == [1, 2]
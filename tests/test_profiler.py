@@ -0,0 +1,137 @@
+# tests/test_profiler.py
+"""Tests du socket de contrôle du profileur et des importations du processus audio."""
+
+# Importations nécessaires
+import os  # Pour les droits des dossiers
+import socket  # Pour joindre le socket de contrôle
+import stat  # Pour vérifier les droits du dossier créé
+import struct  # Pour écrire un fichier WAV silencieux
+import subprocess  # Pour lancer l'application dans un interpréteur neuf
+import sys  # Pour l'interpréteur courant
+import time  # Pour attendre le démarrage du thread
+import wave  # Pour écrire un fichier WAV silencieux
+
+import pytest
+
+from core.profiler import ensure_private_dir
+from core.profiler_threads import ProfilerSocketThread
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Script principal lancé dans un interpréteur neuf : il importe le vrai main.py
+# en tête (ses importations sont rejouées par le processus audio, qui réimporte
+# le module principal), charge Qt comme l'application, puis démarre le moteur
+# audio avec une cible qui vérifie `sys.modules` dans l'enfant.
+SPAWNING_MAIN = """
+import sys
+sys.path.insert(0, {root!r})
+import main  # noqa: F401
+from core import audio_engine
+from core.audio_process import audio_process_main
+
+
+def checked_audio_process(conn, stop_event, ring_name, params):
+    qt = sorted(name for name in sys.modules if name.split(".")[0] == "PyQt6")
+    if qt:
+        conn.send(("error", "Qt chargé dans le processus audio : " + ", ".join(qt)))
+        conn.close()
+        return
+    audio_process_main(conn, stop_event, ring_name, params)
+
+
+if __name__ == "__main__":
+    import time
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication([])
+    audio_engine.audio_process_main = checked_audio_process
+    engine = audio_engine.AudioEngine(300, 0.8, wav_path=sys.argv[1])
+    engine.start()
+    try:
+        deadline = time.monotonic() + 20
+        while not engine.ready and time.monotonic() < deadline:
+            engine.next_utterance(timeout=0.1)
+    except audio_engine.AudioEngineError as e:
+        sys.exit(str(e))
+    finally:
+        engine.stop()
+    sys.exit(0 if engine.ready else "Processus audio jamais prêt")
+"""
+
+
+def _wait_for_socket(path: str) -> None:
+    """Attend que le thread ait créé son socket."""
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_audio_process_spawned_by_the_application_does_not_load_qt(tmp_path):
+    wav_path = str(tmp_path / "silence.wav")
+    with wave.open(wav_path, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(16000)
+        writer.writeframes(struct.pack("<h", 0) * 16000 * 2)
+    script = tmp_path / "application.py"
+    script.write_text(SPAWNING_MAIN.format(root=ROOT))
+
+    result = subprocess.run([sys.executable, str(script), wav_path], cwd=str(tmp_path),
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+
+def test_socket_is_created_in_a_private_directory(tmp_path):
+    path = str(tmp_path / "private" / "profiler.sock")
+    thread = ProfilerSocketThread(path)
+    thread.start()
+    try:
+        _wait_for_socket(path)
+        assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+    finally:
+        thread.stop()
+        thread.join()
+    # Le socket créé par le thread est supprimé à l'arrêt
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("duration", ["nan", "inf", "-inf", "dix"])
+def test_invalid_durations_are_refused(tmp_path, duration):
+    path = str(tmp_path / "private" / "profiler.sock")
+    thread = ProfilerSocketThread(path)
+    requested = []
+    thread.signals.profile_requested.connect(lambda seconds, replies: requested.append(seconds))
+    thread.start()
+    try:
+        _wait_for_socket(path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(f"profile {duration}\n".encode("utf-8"))
+            reply = client.makefile("r", encoding="utf-8").readline()
+    finally:
+        thread.stop()
+        thread.join()
+    assert reply.startswith("error durée invalide")
+    assert requested == []
+
+
+def test_shared_directory_is_refused(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(OSError):
+        ensure_private_dir(str(shared))
+
+
+def test_other_files_are_never_removed(tmp_path):
+    private = tmp_path / "private"
+    ensure_private_dir(str(private))
+    path = private / "profiler.sock"
+    path.write_text("pas un socket")
+    thread = ProfilerSocketThread(str(path))
+    thread.start()
+    thread.join(timeout=5)
+    # Le thread renonce au socket plutôt que de supprimer le fichier
+    assert not thread.is_alive()
+    assert path.read_text() == "pas un socket"
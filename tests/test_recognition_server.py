@@ -0,0 +1,150 @@
+# tests/test_recognition_server.py
+"""Tests du socket, de l'identité des clients et des statistiques du serveur de reconnaissance."""
+
+# Importations nécessaires
+import os  # Pour l'utilisateur courant
+import subprocess  # Pour importer le serveur dans un interpréteur neuf
+import sys  # Pour l'interpréteur courant
+import threading  # Pour deux clients simultanés
+import time  # Pour attendre la déconnexion d'un client
+
+import pytest
+import speech_recognition as sr
+
+from core import recognition_server
+from core.recognition_server import (RecognitionServer, RecognitionClient, FairQueue, ClientStats, STATUS_OK,
+                                     ServerTimeoutError, query_stats, _user_name)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _EchoBackend:
+    """Moteur factice : répond « bonjour » à chaque phrase."""
+    name = "factice"
+    max_batch = 1
+    concurrency = 1
+
+    def transcribe_batch(self, batch):
+        return [(STATUS_OK, "bonjour")] * len(batch)
+
+
+class _SlowBackend(_EchoBackend):
+    """Moteur factice surchargé : chaque phrase prend 0,5 s."""
+
+    def transcribe_batch(self, batch):
+        time.sleep(0.5)
+        return super().transcribe_batch(batch)
+
+
+def _start_server(tmp_path, backend) -> RecognitionServer:
+    directory = tmp_path / "run"
+    directory.mkdir(mode=0o755)
+    server = RecognitionServer(backend, str(directory / "recognition.sock"))
+    server.start()
+    return server
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = _start_server(tmp_path, _EchoBackend())
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def slow_server(tmp_path):
+    server = _start_server(tmp_path, _SlowBackend())
+    yield server
+    server.stop()
+
+
+def _audio() -> sr.AudioData:
+    return sr.AudioData(b"\0\0" * 1600, 16000, 2)
+
+
+def test_server_imports_without_a_display():
+    # Serveur lancé par systemd : ni écran, ni backend factice de pynput
+    env = {name: value for name, value in os.environ.items() if name not in ("DISPLAY", "PYNPUT_BACKEND")}
+    code = ("import sys, core.recognition_server; "
+            "sys.exit(any(name.split('.')[0] in ('pynput', 'PyQt6') for name in sys.modules))")
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env).returncode == 0
+
+
+def test_socket_needs_a_directory_only_the_server_can_modify(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(OSError):
+        RecognitionServer(_EchoBackend(), str(shared / "recognition.sock")).start()
+
+
+def test_other_files_are_never_removed(tmp_path):
+    path = tmp_path / "recognition.sock"
+    path.write_text("pas un socket")
+    with pytest.raises(OSError):
+        RecognitionServer(_EchoBackend(), str(path)).start()
+    assert path.read_text() == "pas un socket"
+
+
+def test_stats_are_keyed_by_peer_uid_and_restricted_to_the_caller(server):
+    client = RecognitionClient(server.path)
+    assert client.transcribe(_audio()) == "bonjour"
+    me = _user_name(os.getuid())
+    # Un autre utilisateur connecté
+    with server._stats_lock:
+        server._stats[os.getuid() + 1] = ClientStats()
+
+    # L'utilisateur du serveur voit tout le monde
+    assert len(query_stats(server.path)["clients"]) == 2
+    # Les autres ne voient que leur propre entrée
+    server.owner_uid = -1
+    assert list(query_stats(server.path)["clients"]) == [me]
+    assert query_stats(server.path)["clients"][me]["completed"] == 1
+
+    # Les statistiques d'un utilisateur sont oubliées à sa dernière déconnexion
+    client.close()
+    deadline = time.monotonic() + 5
+    while os.getuid() in server._stats and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert os.getuid() not in server._stats
+
+
+def test_request_expired_in_the_queue_is_a_timeout(slow_server, monkeypatch):
+    # Une phrase qui attend plus de 0,2 s dans la file n'est plus transcrite
+    monkeypatch.setattr(recognition_server, "RECOGNITION_TIMEOUT_SECONDS", 0.2)
+    first = threading.Thread(target=RecognitionClient(slow_server.path).transcribe, args=(_audio(),))
+    first.start()
+    time.sleep(0.1)
+    try:
+        # Le moteur est occupé par la première phrase pendant 0,5 s
+        with pytest.raises(ServerTimeoutError):
+            RecognitionClient(slow_server.path, timeout=5).transcribe(_audio())
+    finally:
+        first.join()
+
+
+def test_late_reply_is_a_timeout(slow_server):
+    client = RecognitionClient(slow_server.path, timeout=0.2)
+    with pytest.raises(ServerTimeoutError):
+        client.transcribe(_audio())
+    client.close()
+
+
+def test_unreachable_server_is_a_request_error(tmp_path):
+    with pytest.raises(sr.RequestError) as error:
+        RecognitionClient(str(tmp_path / "absent.sock")).transcribe(_audio())
+    assert not isinstance(error.value, ServerTimeoutError)
+
+
+def test_disconnecting_drops_only_that_connections_requests():
+    queue = FairQueue(client_limit=4)
+    queue.put(1000, ("connexion-a", 1))
+    queue.put(1000, ("connexion-b", 1))
+    queue.put(1000, ("connexion-a", 2))
+
+    dropped = queue.remove_client(1000, lambda item: item[0] == "connexion-a")
+
+    assert dropped == [("connexion-a", 1), ("connexion-a", 2)]
+    assert len(queue) == 1
+    assert queue.take_batch(4, 0, timeout=0) == [("connexion-b", 1)]
@@ -0,0 +1,77 @@
+# tests/test_session_recorder.py
+"""Tests du journal de session : relecture, rotation, enregistrement interrompu et rétention."""
+
+# Importations nécessaires
+import os  # Pour la taille des segments
+
+import speech_recognition as sr
+
+from core.session_recorder import SessionRecorder, Utterance, _RECORD_MAGIC, list_segments, read_log, read_segment
+
+
+def _utterance(captured_at: float, text: str = "bonjour", frames: int = 300) -> Utterance:
+    """Phrase factice de `frames` échantillons 16 bits (un motif reconnaissable)."""
+    audio = sr.AudioData(bytes(i % 256 for i in range(2 * frames)), 16000, 2)
+    return Utterance(captured_at, 0.25, "google", text, audio)
+
+
+def _write(directory, utterances, **limits) -> None:
+    """Enregistre `utterances` et attend la fin des écritures."""
+    recorder = SessionRecorder(str(directory), **limits)
+    for utterance in utterances:
+        recorder.record(utterance, utterance.recognized_text + " ")
+    recorder.close()
+    recorder.join(timeout=5)
+
+
+def test_recorded_utterances_read_back_identically(tmp_path):
+    utterances = [_utterance(1000.0, "bonjour"), _utterance(1001.5, "ça va ?", frames=1000)]
+    _write(tmp_path, utterances)
+
+    recorded = list(read_log(str(tmp_path)))
+    assert [(r.captured_at, r.latency, r.backend, r.recognized_text, r.typed_text) for r in recorded] == \
+           [(1000.0, 0.25, "google", "bonjour", "bonjour "), (1001.5, 0.25, "google", "ça va ?", "ça va ? ")]
+    assert [r.audio.get_raw_data() for r in recorded] == [u.audio.get_raw_data() for u in utterances]
+    assert (recorded[0].audio.sample_rate, recorded[0].audio.sample_width) == (16000, 2)
+
+
+def test_full_segments_are_rotated_and_truncated(tmp_path):
+    # Chaque phrase (~650 octets) remplit à elle seule un segment de 1000 octets
+    _write(tmp_path, [_utterance(1000.0 + i) for i in range(3)], segment_bytes=1000)
+
+    segments = list_segments(str(tmp_path))
+    assert len(segments) == 3
+    assert [[r.captured_at for r in read_segment(path)] for path in segments] == [[1000.0], [1001.0], [1002.0]]
+    # Un segment fermé est ramené à sa taille utile
+    assert all(os.path.getsize(path) < 1000 for path in segments)
+
+
+def test_record_interrupted_before_its_magic_is_not_read(tmp_path):
+    _write(tmp_path, [_utterance(1000.0), _utterance(1001.0)])
+    [path] = list_segments(str(tmp_path))
+    with open(path, 'r+b') as f:
+        data = f.read()
+        # Plantage pendant la seconde écriture : tout est là, sauf sa signature
+        f.seek(data.rindex(_RECORD_MAGIC))
+        f.write(bytes(len(_RECORD_MAGIC)))
+
+    assert [r.captured_at for r in read_segment(path)] == [1000.0]
+
+
+def test_retention_keeps_the_newest_segments(tmp_path):
+    _write(tmp_path, [_utterance(1000.0 + i) for i in range(8)], segment_bytes=1000, max_segments=2)
+    assert [r.captured_at for r in read_log(str(tmp_path))] == [1006.0, 1007.0]
+
+
+def test_retention_applies_to_segments_of_earlier_sessions(tmp_path):
+    _write(tmp_path, [_utterance(1000.0 + i) for i in range(8)], segment_bytes=1000)
+    assert len(list_segments(str(tmp_path))) == 8
+    # Limite abaissée : les huit anciens segments dépassent d'un coup
+    _write(tmp_path, [_utterance(2000.0)], segment_bytes=1000, max_segments=2)
+    assert [r.captured_at for r in read_log(str(tmp_path))] == [1007.0, 2000.0]
+
+
+def test_retention_bounds_the_total_size(tmp_path):
+    _write(tmp_path, [_utterance(1000.0 + i) for i in range(8)], segment_bytes=1000, max_bytes=2500)
+    # Le segment courant est préalloué à 1000 octets : deux segments fermés (~670 octets) tiennent à côté
+    assert [r.captured_at for r in read_log(str(tmp_path))] == [1005.0, 1006.0, 1007.0]
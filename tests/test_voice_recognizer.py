@@ -0,0 +1,111 @@
+# tests/test_voice_recognizer.py
+"""Tests du thread de reconnaissance, alimenté par un journal rejoué."""
+
+# Importations nécessaires
+import time  # Pour borner l'attente des signaux
+
+import speech_recognition as sr
+
+from core.recognition_server import ServerTimeoutError
+from core.session_recorder import RecordedUtterance, ReplayEngine
+from core.voice_recognizer import VoiceRecognizerThread
+
+
+def _utterance(captured_at: float) -> RecordedUtterance:
+    """Phrase enregistrée factice (0,1 s de silence)."""
+    audio = sr.AudioData(bytes(3200), 16000, 2)
+    return RecordedUtterance(captured_at, 0.5, "google", "bonjour", "bonjour ", audio)
+
+
+def test_finished_is_delivered_after_the_last_text(qt_app):
+    worker = VoiceRecognizerThread(300, 0.8, engine=ReplayEngine([_utterance(1000.0), _utterance(1001.5)]))
+    # Pas d'appel réseau : la transcription est remplacée sur cette instance
+    worker.transcribe = lambda audio: "bonjour"
+    received = []
+    worker.signals.recognized_text.connect(lambda text, utterance: received.append(utterance.captured_at))
+    worker.signals.recognition_finished.connect(lambda: received.append("fin"))
+
+    worker.start()
+    deadline = time.monotonic() + 2
+    while len(received) < 2 and time.monotonic() < deadline:
+        qt_app.processEvents()
+    worker.stop()
+    worker.join(timeout=2)
+    qt_app.processEvents()
+
+    # L'horodatage est celui de la capture, et la fin arrive après la dernière phrase
+    assert received == [1000.0, 1001.5, "fin"]
+
+
+def test_finished_is_emitted_when_stopped_before_start(qt_app):
+    worker = VoiceRecognizerThread(300, 0.8, engine=ReplayEngine([]))
+    finished = []
+    worker.signals.recognition_finished.connect(lambda: finished.append(True))
+    worker.stop()
+    worker.start()
+    worker.join(timeout=2)
+    qt_app.processEvents()
+    assert finished == [True]
+
+
+class _Recorder:
+    """Enregistreur factice : garde les phrases et le texte tapé."""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, utterance, typed_text: str) -> None:
+        self.records.append((utterance.recognized_text, typed_text))
+
+
+def test_thread_ends_once_the_replay_is_finished(qt_app):
+    worker = VoiceRecognizerThread(300, 0.8, engine=ReplayEngine([_utterance(1000.0)]))
+    worker.transcribe = lambda audio: "bonjour"
+    worker.start()
+    # Aucun appel à stop : le thread s'arrête seul à la fin du journal
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+
+
+def test_text_arriving_after_stop_is_recorded_but_not_typed(qt_app):
+    recorder = _Recorder()
+    worker = VoiceRecognizerThread(300, 0.8, recorder=recorder, engine=ReplayEngine([_utterance(1000.0)]))
+    received = []
+    worker.signals.recognized_text.connect(lambda text, utterance: received.append(text))
+
+    def transcribe(audio):
+        # L'utilisateur arrête l'écoute pendant l'appel à l'API
+        worker.stop()
+        return "bonjour"
+
+    worker.transcribe = transcribe
+    worker.start()
+    worker.join(timeout=5)
+    qt_app.processEvents()
+
+    assert received == []
+    assert recorder.records == [("bonjour", "")]
+
+
+def test_server_timeout_drops_the_utterance_and_keeps_listening(qt_app):
+    recorder = _Recorder()
+    worker = VoiceRecognizerThread(300, 0.8, recorder=recorder,
+                                   engine=ReplayEngine([_utterance(1000.0), _utterance(1001.5)]))
+    results = iter([ServerTimeoutError("délai d'attente dépassé"), "bonjour"])
+
+    def transcribe(audio):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    worker.transcribe = transcribe
+    received = []
+    worker.signals.recognized_text.connect(lambda text, utterance: received.append(text))
+    worker.start()
+    worker.join(timeout=5)
+    qt_app.processEvents()
+
+    # La première phrase est perdue (et enregistrée), la seconde est tapée
+    assert recorder.records == [("", "")]
+    assert received == ["bonjour"]
@@ -6,7 +6,8 @@ de l'application et le cœur de l'orchestration de toutes les fonctionnalités.
 
 # Importations des bibliothèques externes et de l'interface graphique
 from PyQt6.QtWidgets import (QApplication, QWidget, QPushButton, QVBoxLayout, QHBoxLayout,
-                             QLabel, QMessageBox, QSystemTrayIcon, QMenu, QSpinBox, QDoubleSpinBox)
+                             QLabel, QMessageBox, QSystemTrayIcon, QMenu, QSpinBox, QDoubleSpinBox,
+                             QComboBox, QCheckBox)
 from PyQt6.QtCore import Qt, QTimer, QEvent
 from PyQt6.QtGui import QIcon, QAction
 from pynput import mouse
@@ -15,16 +16,24 @@ from pynput.keyboard import Controller as KeyboardController
 import pyautogui
 import unicodedata
 import re
+import os
+import time
 
 # Importations des modules internes du projet
 from ui.screen_overlay import RecordingOverlay
 from core.voice_recognizer import VoiceRecognizerThread
 from core.shortcut_listener import ShortcutListenerThread
 from core.calibration import CalibrationThread
+from core.microphones import MicrophoneProbeThread, MicrophoneWatcherThread, select_best, resolve_device_index
 from core import config_manager
+from core.session_recorder import SessionRecorder
+from core.profiler_threads import ProfilerThread, ProfilerSocketThread
 from utils.signals import WorkerSignals
+from utils.events import StateChanged, LevelChanged, WorkerState
 from constants import (RECOGNITION_SHORTCUT_STR, DEFINE_TARGET_SHORTCUT_STR,
-                       ICON_FILE, DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD, KEYWORD_ACTIONS)
+                       ICON_FILE, DEFAULT_ENERGY_THRESHOLD, DEFAULT_PAUSE_THRESHOLD, KEYWORD_ACTIONS,
+                       WORKER_STOP_TIMEOUT_SECONDS, AUDIO_ENGINE_STOP_TIMEOUT_SECONDS, PROFILER_DIR,
+                       PROFILER_DEFAULT_SECONDS)
 
 
 class VoiceToChatApp(QWidget):
@@ -47,16 +56,28 @@ class VoiceToChatApp(QWidget):
         self.is_listening = False  # Drapeau pour savoir si la reconnaissance est active
         self.last_typed_text = ""  # Mémoire de la dernière phrase tapée (pour suppression)
         self.recognizer_thread = None  # Placeholder pour le thread de reconnaissance
+        self.audio_wav_path = None  # Fichier WAV lu à la place du micro (tests d'endurance), ou None
+        self._unfinished_recognizers = []  # Threads de reconnaissance dont la fin n'a pas encore été reçue
         self.calibration_thread = None  # Placeholder pour le thread de calibrage
-        self.microphone_device_index = None  # Pour une future sélection de micro
+        self._busy_cursor = False  # Vrai si le curseur d'attente est actuellement appliqué
+        self.probe_thread = None  # Placeholder pour le thread de sondage des micros
+        self.mouse_listener = None  # Écouteur de souris actif pendant la sélection de la cible
+        self.profiler_thread = None  # Placeholder pour le thread de profilage
+        self._profile_replies = []  # Files des clients du socket attendant la fin du profilage
+        self.microphones = []  # Micros actuellement branchés, tels qu'énumérés par le thread de surveillance
 
         # Dictionnaire de configuration, initialisé avec des valeurs par défaut
         self.config = {
             "target": None,
             "settings": {
                 "energy_threshold": DEFAULT_ENERGY_THRESHOLD,
-                "pause_threshold": DEFAULT_PAUSE_THRESHOLD
-            }
+                "pause_threshold": DEFAULT_PAUSE_THRESHOLD,
+                "microphone": None,  # Clé du micro imposé, ou None pour le choix automatique
+                "noise_suppression": False,  # Réduction de bruit avant la reconnaissance
+                "session_recording": False,  # Enregistrement des phrases dans un journal
+                "recognition_server": None  # Socket d'un serveur de reconnaissance partagé, ou None
+            },
+            "microphone_profiles": {}  # Profils mesurés lors du dernier sondage, par clé de micro
         }
 
         # --- Initialisation des objets UI et de communication ---
@@ -69,6 +90,8 @@ class VoiceToChatApp(QWidget):
         self._init_tray_icon()         # Crée l'icône dans la barre des tâches
         self._connect_signals()        # Connecte tous les signaux (clics, etc.)
         self._start_shortcut_listener()# Lance l'écoute des raccourcis clavier
+        self._start_microphone_watcher()# Surveille le branchement des micros
+        self._start_profiler_socket()  # Accepte les demandes de profilage locales
 
     def _init_ui(self) -> None:
         """Crée et configure tous les widgets de l'interface utilisateur."""
@@ -108,12 +131,34 @@ class VoiceToChatApp(QWidget):
         pause_layout.addWidget(pause_label)
         pause_layout.addWidget(self.pause_spinbox)
 
+        self.noise_suppression_checkbox = QCheckBox("Réduction de bruit")
+        self.noise_suppression_checkbox.setToolTip("Atténue le bruit de fond de chaque phrase avant la reconnaissance.")
+        self.noise_suppression_checkbox.setChecked(self.config["settings"]["noise_suppression"])
+
+        self.session_recording_checkbox = QCheckBox("Enregistrer les sessions")
+        self.session_recording_checkbox.setToolTip("Conserve l'audio et le texte de chaque phrase pour pouvoir les rejouer.")
+        self.session_recording_checkbox.setChecked(self.config["settings"]["session_recording"])
+
+        microphone_layout = QHBoxLayout()
+        microphone_label = QLabel("Microphone :")
+        self.microphone_combo = QComboBox()
+        self.microphone_combo.setToolTip("« Automatique » utilise le micro ayant obtenu le meilleur score lors de la détection.")
+        self.microphone_combo.addItem("Automatique", None)
+        self.detect_microphones_button = QPushButton("Détecter")
+        self.detect_microphones_button.setToolTip("Sonde tous les micros en même temps. Parlez normalement pendant le test.")
+        microphone_layout.addWidget(microphone_label)
+        microphone_layout.addWidget(self.microphone_combo)
+        microphone_layout.addWidget(self.detect_microphones_button)
+
         layout.addWidget(self.status_label)
         layout.addWidget(self.toggle_button)
         layout.addWidget(self.define_target_button)
         layout.addWidget(self.target_coords_label)
         layout.addLayout(energy_layout)
         layout.addLayout(pause_layout)
+        layout.addLayout(microphone_layout)
+        layout.addWidget(self.noise_suppression_checkbox)
+        layout.addWidget(self.session_recording_checkbox)
         self.setLayout(layout)
 
     def _init_tray_icon(self) -> None:
@@ -123,6 +168,10 @@ class VoiceToChatApp(QWidget):
         show_action = QAction("Afficher", self)
         show_action.triggered.connect(self.showNormal)
         tray_menu.addAction(show_action)
+        self.profile_action = QAction(f"Profiler ({PROFILER_DEFAULT_SECONDS:.0f} s)", self)
+        self.profile_action.setToolTip("Enregistre ce que fait chaque thread pour diagnostiquer une lenteur.")
+        self.profile_action.triggered.connect(self.run_profiling)
+        tray_menu.addAction(self.profile_action)
         quit_action = QAction("Quitter", self)
         quit_action.triggered.connect(QApplication.instance().quit)
         tray_menu.addAction(quit_action)
@@ -136,7 +185,11 @@ class VoiceToChatApp(QWidget):
         self.mouse_signals.target_defined.connect(self.on_target_defined)
         self.energy_spinbox.valueChanged.connect(self.on_settings_changed)
         self.pause_spinbox.valueChanged.connect(self.on_settings_changed)
+        self.noise_suppression_checkbox.toggled.connect(self.on_settings_changed)
+        self.session_recording_checkbox.toggled.connect(self.on_settings_changed)
         self.calibrate_button.clicked.connect(self.run_auto_calibration)
+        self.microphone_combo.activated.connect(self.on_microphone_selected)
+        self.detect_microphones_button.clicked.connect(self.run_microphone_detection)
         QApplication.instance().aboutToQuit.connect(self._cleanup_on_quit)
 
     def _load_saved_config(self) -> None:
@@ -147,11 +200,21 @@ class VoiceToChatApp(QWidget):
         self.config.setdefault("target", None)
         self.config.setdefault("settings", {}).setdefault("energy_threshold", DEFAULT_ENERGY_THRESHOLD)
         self.config["settings"].setdefault("pause_threshold", DEFAULT_PAUSE_THRESHOLD)
+        self.config["settings"].setdefault("microphone", None)
+        self.config["settings"].setdefault("noise_suppression", False)
+        self.config["settings"].setdefault("session_recording", False)
+        self.config["settings"].setdefault("recognition_server", None)
+        self.config.setdefault("microphone_profiles", {})
+        # Les profils des versions précédentes, indexés par nom seul, sont abandonnés
+        self.config["microphone_profiles"] = {key: profile for key, profile in self.config["microphone_profiles"].items()
+                                              if "key" in profile}
 
     def on_settings_changed(self) -> None:
         """Slot appelé quand un réglage est modifié dans l'UI. Sauvegarde la config."""
         self.config["settings"]["energy_threshold"] = self.energy_spinbox.value()
         self.config["settings"]["pause_threshold"] = self.pause_spinbox.value()
+        self.config["settings"]["noise_suppression"] = self.noise_suppression_checkbox.isChecked()
+        self.config["settings"]["session_recording"] = self.session_recording_checkbox.isChecked()
         config_manager.save_config(self.config)
         self.status_label.setText("Réglages sauvegardés.")
 
@@ -161,7 +224,8 @@ class VoiceToChatApp(QWidget):
         self.define_target_button.setEnabled(False)
         self.calibrate_button.setEnabled(False)
         self.status_label.setText("Veuillez rester silencieux pendant 2 secondes...")
-        self.calibration_thread = CalibrationThread(device_index=self.microphone_device_index)
+        self.calibration_thread = CalibrationThread(device_index=self._resolve_microphone_index(),
+                                                    wav_path=self.audio_wav_path)
         self.calibration_thread.signals.calibration_complete.connect(self.on_calibration_finished)
         self.calibration_thread.signals.error_occurred.connect(self.on_error_occurred)
         self.calibration_thread.start()
@@ -174,12 +238,169 @@ class VoiceToChatApp(QWidget):
         self.define_target_button.setEnabled(True)
         self.calibrate_button.setEnabled(True)
 
+    def _start_microphone_watcher(self) -> None:
+        """Lance le thread qui détecte le branchement et le débranchement des micros."""
+        self.microphone_watcher = MicrophoneWatcherThread()
+        self.microphone_watcher.signals.microphones_changed.connect(self.on_microphones_changed)
+        self.microphone_watcher.daemon = True
+        self.microphone_watcher.start()
+
+    def on_microphones_changed(self, devices: list) -> None:
+        """Slot appelé quand la liste des micros change. Met à jour le sélecteur."""
+        self.microphones = devices
+        self._refresh_microphone_combo()
+
+    def _refresh_microphone_combo(self) -> None:
+        """Remplit le sélecteur avec les micros présents et leur score connu."""
+        profiles = self.config["microphone_profiles"]
+        choice = self.config["settings"]["microphone"]
+        self.microphone_combo.blockSignals(True)
+        self.microphone_combo.clear()
+        self.microphone_combo.addItem("Automatique", None)
+        present = [device.key for device in self.microphones]
+        keys = list(present)
+        if choice is not None and choice not in keys:
+            # Le micro imposé est débranché : il reste affiché et sera utilisé à son retour
+            keys.append(choice)
+        for key in keys:
+            label = key
+            if key in profiles:
+                label = f"{key} ({profiles[key]['snr_db']:.0f} dB)"
+            if key not in present:
+                label = f"{label} - absent"
+            self.microphone_combo.addItem(label, key)
+        if choice is not None:
+            self.microphone_combo.setCurrentIndex(self.microphone_combo.findData(choice))
+        self.microphone_combo.blockSignals(False)
+
+    def on_microphone_selected(self, _index: int) -> None:
+        """Slot appelé quand l'utilisateur choisit un micro. Sauvegarde le choix."""
+        self.config["settings"]["microphone"] = self.microphone_combo.currentData()
+        config_manager.save_config(self.config)
+        self.status_label.setText("Réglages sauvegardés.")
+
+    def _resolve_microphone_index(self):
+        """
+        Renvoie l'index du micro choisi (ou du meilleur micro connu), None pour celui du système.
+        Utilise la liste du thread de surveillance : aucune énumération sur le thread de l'interface.
+        """
+        choice = self.config["settings"]["microphone"]
+        if choice is not None and choice not in [device.key for device in self.microphones]:
+            # Micro imposé introuvable : la liste est relue en arrière-plan pour la prochaine session
+            self.microphone_watcher.request_scan()
+        return resolve_device_index(choice, self.config["microphone_profiles"], self.microphones)
+
+    def run_microphone_detection(self) -> None:
+        """Lance le sondage simultané de tous les micros dans un thread séparé."""
+        if self.is_listening:
+            # Le sondage ouvrirait les micros pendant la reconnaissance
+            self.status_label.setText("Veuillez d'abord arrêter l'écoute.")
+            return
+        self.toggle_button.setEnabled(False)
+        self.calibrate_button.setEnabled(False)
+        self.detect_microphones_button.setEnabled(False)
+        self.status_label.setText("Parlez normalement pendant quelques secondes...")
+        self.probe_thread = MicrophoneProbeThread(devices=self.microphones or None)
+        self.probe_thread.signals.microphones_probed.connect(self.on_microphones_probed)
+        self.probe_thread.signals.error_occurred.connect(self.on_microphone_detection_failed)
+        self.probe_thread.start()
+
+    def on_microphones_probed(self, profiles: list) -> None:
+        """Slot appelé à la fin du sondage. Met en cache les profils et affiche le meilleur."""
+        # Le sondage couvre tous les micros présents : les profils des clés absentes
+        # (micros retirés, clés d'une version précédente) sont oubliés
+        self.config["microphone_profiles"] = {profile.key: profile._asdict() for profile in profiles}
+        config_manager.save_config(self.config)
+        self._refresh_microphone_combo()
+        best = select_best(profiles)
+        if best:
+            self.status_label.setText(f"Meilleur micro : {best.name} ({best.snr_db:.0f} dB).")
+        else:
+            self.status_label.setText("Aucun micro n'a pu être testé.")
+        self._enable_microphone_controls()
+
+    def on_microphone_detection_failed(self, message: str) -> None:
+        """Slot appelé si le sondage des micros échoue."""
+        self.on_error_occurred(message)
+        self._enable_microphone_controls()
+
+    def _enable_microphone_controls(self) -> None:
+        """Réactive les boutons désactivés pendant le sondage."""
+        self.toggle_button.setEnabled(True)
+        self.calibrate_button.setEnabled(True)
+        self.detect_microphones_button.setEnabled(True)
+
+    def _start_profiler_socket(self) -> None:
+        """Lance le thread qui reçoit les demandes de profilage (scripts/profile_app.py)."""
+        self.profiler_socket = ProfilerSocketThread()
+        self.profiler_socket.signals.profile_requested.connect(self.on_profile_requested)
+        self.profiler_socket.start()
+
+    def run_profiling(self) -> None:
+        """Slot du menu de l'icône : profile l'application pendant la durée par défaut."""
+        self.start_profiling(PROFILER_DEFAULT_SECONDS)
+
+    def start_profiling(self, seconds: float):
+        """
+        Profile l'application pendant `seconds` secondes, sans l'interrompre.
+
+        Le processus audio, s'il tourne, est profilé en même temps dans le même dossier.
+
+        Returns:
+            str: Le dossier où seront écrits les fichiers, ou None si un
+                 profilage est déjà en cours.
+        """
+        if self.profiler_thread and self.profiler_thread.is_alive():
+            return None
+        directory = os.path.abspath(os.path.join(PROFILER_DIR, time.strftime("%Y%m%d-%H%M%S")))
+        self.profiler_thread = ProfilerThread(seconds, directory)
+        self.profiler_thread.signals.profile_complete.connect(self.on_profile_complete)
+        self.profiler_thread.signals.error_occurred.connect(self.on_profile_failed)
+        self.profiler_thread.start()
+        if self.recognizer_thread and self.recognizer_thread.is_alive():
+            self.recognizer_thread.engine.request_profile(seconds, directory)
+        self.profile_action.setEnabled(False)
+        self.status_label.setText(f"Profilage en cours ({seconds:.0f} s)...")
+        return directory
+
+    def on_profile_requested(self, seconds: float, replies) -> None:
+        """Slot appelé quand un client du socket demande un profilage."""
+        directory = self.start_profiling(seconds)
+        if directory is None:
+            replies.put(("busy", "un profilage est déjà en cours"))
+            return
+        replies.put(("started", directory))
+        self._profile_replies.append(replies)
+
+    def on_profile_complete(self, directory: str) -> None:
+        """Slot appelé une fois le profil écrit."""
+        self.profile_action.setEnabled(True)
+        self.status_label.setText(f"Profil enregistré dans {directory}")
+        self.tray_icon.showMessage("Profil enregistré", directory, QSystemTrayIcon.MessageIcon.Information, 3000)
+        self._answer_profile_clients("done", directory)
+
+    def on_profile_failed(self, message: str) -> None:
+        """Slot appelé si le profil n'a pas pu être écrit."""
+        self.profile_action.setEnabled(True)
+        self.on_error_occurred(message)
+        self._answer_profile_clients("error", message)
+
+    def _answer_profile_clients(self, kind: str, detail: str) -> None:
+        """Transmet le résultat du profilage aux clients du socket qui l'attendent."""
+        for replies in self._profile_replies:
+            replies.put((kind, detail))
+        self._profile_replies = []
+
     def start_recognition(self) -> None:
         """Démarre une session de reconnaissance vocale."""
         if not self.config["target"]:
             QMessageBox.warning(self, "Cible requise", "Veuillez d'abord définir une cible.")
             return
-        if self.recognizer_thread and self.recognizer_thread.is_alive():
+        if self.recognizer_thread and self.recognizer_thread.is_alive() and not self.recognizer_thread.stopped:
+            return
+        if any(worker and worker.is_alive() for worker in (self.probe_thread, self.calibration_thread)):
+            # Le raccourci contourne les boutons désactivés : pas d'écoute pendant un sondage ou une calibration
+            self.status_label.setText("Veuillez attendre la fin de la détection ou de la calibration.")
             return
         try:
             pyautogui.click(self.config["target"]['x'], self.config["target"]['y'])
@@ -190,21 +411,60 @@ class VoiceToChatApp(QWidget):
         self.update_ui_for_listening_state()
         energy = self.config["settings"]["energy_threshold"]
         pause = self.config["settings"]["pause_threshold"]
-        self.recognizer_thread = VoiceRecognizerThread(
+        if self.recognizer_thread:
+            # Le processus audio de la session précédente doit avoir libéré le micro
+            self.recognizer_thread.engine.release(AUDIO_ENGINE_STOP_TIMEOUT_SECONDS)
+        # Chaque session a son propre enregistreur, fermé quand son thread a tout livré
+        recorder = SessionRecorder() if self.config["settings"]["session_recording"] else None
+        worker = VoiceRecognizerThread(
             energy_threshold=energy,
             pause_threshold=pause,
-            device_index=self.microphone_device_index
+            device_index=self._resolve_microphone_index(),
+            noise_suppression=self.config["settings"]["noise_suppression"],
+            recorder=recorder,
+            server_path=self.config["settings"]["recognition_server"],
+            wav_path=self.audio_wav_path
         )
-        self.recognizer_thread.signals.recognized_text.connect(self.on_recognized_text)
-        self.recognizer_thread.signals.error_occurred.connect(self.on_error_occurred)
-        self.recognizer_thread.signals.status_message.connect(self.on_status_message)
-        self.recognizer_thread.start()
-
-    def on_recognized_text(self, text: str) -> None:
-        """Slot appelé quand du texte a été reconnu. Le traite et le tape."""
-        if not self.config["target"]:
-            return
-
+        # Le thread est passé aux slots : une session arrêtée garde son enregistreur
+        worker.signals.recognized_text.connect(lambda text, utterance: self.on_recognized_text(text, utterance, worker))
+        worker.signals.recognition_finished.connect(lambda: self.on_recognizer_finished(worker))
+        worker.events.event.connect(self.on_worker_event)
+        self.recognizer_thread = worker
+        self._unfinished_recognizers.append(worker)
+        worker.start()
+
+    def on_recognized_text(self, text: str, utterance, worker: VoiceRecognizerThread) -> None:
+        """
+        Slot appelé quand du texte a été reconnu. Le tape s'il provient de la
+        session en cours et qu'une cible est définie, et l'enregistre dans tous les cas.
+        """
+        typed_text = ""  # Texte réellement tapé, conservé par l'enregistreur de session
+        try:
+            # Un texte d'une session arrêtée entre-temps n'est pas tapé
+            if self.config["target"] and self.is_listening and worker is self.recognizer_thread:
+                typed_text = self._type_recognized_text(text)
+        finally:
+            # L'écriture est différée dans le thread de l'enregistreur : la frappe n'attend pas
+            if worker.recorder and utterance:
+                worker.recorder.record(utterance, typed_text)
+
+    def on_recognizer_finished(self, worker: VoiceRecognizerThread) -> None:
+        """
+        Slot appelé quand un thread de reconnaissance a terminé. Ses signaux
+        sont livrés dans l'ordre : toutes ses phrases ont déjà été enregistrées.
+        """
+        self._unfinished_recognizers.remove(worker)
+        if worker.recorder:
+            worker.recorder.close()
+
+    def _type_recognized_text(self, text: str) -> str:
+        """
+        Traite le texte reconnu (mots-clés, nombres, accents) et le tape dans la cible.
+
+        Returns:
+            str: Le texte réellement tapé ("" si rien n'a été tapé).
+        """
+        typed_text = ""
         try:
             # Nettoie le texte reçu
             processed_text = text.lower().strip()
@@ -225,7 +485,7 @@ class VoiceToChatApp(QWidget):
                     # On utilise pyautogui ici car il est fiable pour presser une touche unique
                     pyautogui.press('backspace', presses=len(self.last_typed_text), interval=0.05)
                     self.last_typed_text = ""
-                return
+                return typed_text
 
             if processed_text:
                 # --- Conversion des mots-nombres en chiffres ---
@@ -248,6 +508,7 @@ class VoiceToChatApp(QWidget):
 
                 # Mémorise le texte qui a été réellement tapé pour la suppression
                 self.last_typed_text = ascii_text
+                typed_text = ascii_text
             else:
                 self.last_typed_text = ""
 
@@ -261,6 +522,7 @@ class VoiceToChatApp(QWidget):
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur de saisie automatique", f"Impossible de traiter le texte reconnu : {e}")
+        return typed_text
 
     def _start_shortcut_listener(self) -> None:
         """Initialise et démarre le thread d'écoute des raccourcis clavier."""
@@ -278,10 +540,19 @@ class VoiceToChatApp(QWidget):
             self.start_recognition()
 
     def stop_recognition(self) -> None:
-        """Arrête proprement la session de reconnaissance vocale."""
+        """
+        Arrête la session de reconnaissance vocale.
+
+        Le processus audio est attendu (et terminé s'il ne s'arrête pas à temps) :
+        le micro est libéré au retour. Si un appel à l'API est en cours, le thread
+        se termine en arrière-plan (son résultat est ignoré) et une nouvelle
+        session peut démarrer sans l'attendre.
+        """
         if self.recognizer_thread and self.recognizer_thread.is_alive():
             self.recognizer_thread.stop()
-            self.recognizer_thread.join(timeout=1.0)
+            self.recognizer_thread.engine.release(AUDIO_ENGINE_STOP_TIMEOUT_SECONDS)
+            self.recognizer_thread.join(timeout=WORKER_STOP_TIMEOUT_SECONDS)
+        # L'enregistreur est fermé par `on_recognizer_finished`, après les dernières phrases
         self.is_listening = False
         self.update_ui_for_listening_state()
 
@@ -289,25 +560,48 @@ class VoiceToChatApp(QWidget):
         """Met à jour l'interface (boutons, overlay) en fonction de l'état d'écoute."""
         if self.is_listening:
             self.toggle_button.setText(f"Arrêter Reconnaissance ({RECOGNITION_SHORTCUT_STR})")
+            # Affiche l'indicateur sur l'écran où se trouve la cible
+            target = self.config["target"]
+            self.recording_overlay.place_on_screen(target['x'], target['y'])
             self.recording_overlay.show()
             self.status_label.setText("Démarrage de l'écoute...")
         else:
             self.toggle_button.setText(f"Démarrer Reconnaissance ({RECOGNITION_SHORTCUT_STR})")
             self.recording_overlay.hide()
-            QApplication.restoreOverrideCursor()
+            self._set_busy_cursor(False)
             self.status_label.setText("Prêt. Écoute arrêtée.")
 
     def on_error_occurred(self, message: str) -> None:
         """Slot pour afficher les erreurs venant des threads."""
         self.status_label.setText(f"Info : {message}")
-        if "Erreur API" in message:
+
+    def on_worker_event(self, event) -> None:
+        """Slot recevant les événements (déjà fusionnés) du thread de reconnaissance."""
+        if self.recognizer_thread is None or self.sender() is not self.recognizer_thread.events:
+            # Événement tardif du thread d'une session précédente
+            return
+        if isinstance(event, LevelChanged):
+            self.recording_overlay.set_level(event.level)
+            return
+        if not isinstance(event, StateChanged):
+            return
+        if event.state is WorkerState.ERROR:
+            self.status_label.setText(f"Info : {event.detail}")
             self.is_listening = False
             self.update_ui_for_listening_state()
+            return
+        if not self.is_listening:
+            # Événement tardif d'une session déjà arrêtée
+            return
+        self.status_label.setText(event.state.value)
+        self._set_busy_cursor(event.state is WorkerState.RECOGNIZING)
 
-    def on_status_message(self, message: str) -> None:
-        """Slot pour afficher les messages de statut des threads."""
-        self.status_label.setText(message)
-        if "Reconnaissance en cours..." in message and self.is_listening:
+    def _set_busy_cursor(self, busy: bool) -> None:
+        """Applique ou retire le curseur d'attente, uniquement lors d'un changement."""
+        if busy == self._busy_cursor:
+            return
+        self._busy_cursor = busy
+        if busy:
             QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         else:
             QApplication.restoreOverrideCursor()
@@ -323,9 +617,12 @@ class VoiceToChatApp(QWidget):
 
     def _begin_target_selection(self) -> None:
         """Change le curseur et démarre l'écouteur de souris."""
+        if self.mouse_listener and self.mouse_listener.is_alive():
+            # Une sélection est déjà en cours : un seul écouteur à la fois
+            return
         QApplication.setOverrideCursor(Qt.CursorShape.CrossCursor)
-        listener = mouse.Listener(on_click=self._on_mouse_click)
-        listener.start()
+        self.mouse_listener = mouse.Listener(on_click=self._on_mouse_click)
+        self.mouse_listener.start()
 
     def _on_mouse_click(self, x: int, y: int, _button, pressed: bool) -> bool:
         """Callback appelé lors d'un clic de souris pendant la sélection."""
@@ -337,6 +634,11 @@ class VoiceToChatApp(QWidget):
     def on_target_defined(self, x: int, y: int) -> None:
         """Slot appelé une fois la cible définie. Sauvegarde les coordonnées."""
         QApplication.restoreOverrideCursor()
+        # L'écouteur s'arrête de lui-même après le clic (le callback renvoie False) ;
+        # l'arrêt explicite garantit qu'aucun écouteur ne survit à la sélection
+        if self.mouse_listener:
+            self.mouse_listener.stop()
+        self.mouse_listener = None
         self.config["target"] = {'x': x, 'y': y}
         config_manager.save_config(self.config)
         self.target_coords_label.setText(f"Cible définie en X={x}, Y={y}")
@@ -354,10 +656,27 @@ class VoiceToChatApp(QWidget):
     def _cleanup_on_quit(self) -> None:
         """Méthode de nettoyage appelée juste avant la fermeture de l'application."""
         self.stop_recognition()
+        # Livre les phrases déjà reconnues, puis ferme les enregistreurs des threads qui
+        # n'ont pas fini à temps (leur thread d'écriture retiendrait le processus)
+        QApplication.processEvents()
+        for worker in list(self._unfinished_recognizers):
+            if worker.recorder:
+                worker.recorder.close()
         # NOUVEAU : Arrêter proprement l'écouteur de raccourcis.
         # C'est l'étape cruciale pour que le processus se termine.
         if self.shortcut_listener and self.shortcut_listener.is_alive():
             self.shortcut_listener.stop()
+        self.microphone_watcher.stop()
+        self.profiler_socket.stop()
+        # Interrompt les autres travaux éventuellement en cours
+        for worker in (self.calibration_thread, self.probe_thread, self.mouse_listener, self.profiler_thread):
+            if worker and worker.is_alive():
+                worker.stop()
+        # Attend brièvement leur fin : aucun ne doit survivre à la fermeture
+        for worker in (self.shortcut_listener, self.microphone_watcher, self.calibration_thread, self.probe_thread,
+                       self.profiler_socket, self.profiler_thread):
+            if worker and worker.is_alive():
+                worker.join(timeout=WORKER_STOP_TIMEOUT_SECONDS)
 
     def closeEvent(self, event) -> None:
         """Intercepte l'événement de fermeture de la fenêtre (clic sur la croix)."""
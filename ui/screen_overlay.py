@@ -6,35 +6,55 @@ fournir un retour visuel à l'utilisateur.
 
 # Importations nécessaires
 from PyQt6.QtWidgets import QWidget, QApplication  # Composants de base de l'interface
-from PyQt6.QtCore import Qt  # Constantes et types de base de Qt
-from PyQt6.QtGui import QPainter, QColor, QScreen  # Outils de dessin et d'information sur l'écran
+from PyQt6.QtCore import Qt, QTimer, QRect, QPoint  # Constantes et types de base de Qt
+from PyQt6.QtGui import QPainter, QColor  # Outils de dessin
+from constants import SHOW_LEVEL_METER, LEVEL_METER_MAX_FPS, LEVEL_METER_FULL_SCALE
 
 # Constantes pour la taille et la position de l'indicateur
 INDICATOR_SIZE = 25
 INDICATOR_MARGIN = 10
+# Constantes pour la taille du vumètre, dessiné à droite du cercle
+METER_WIDTH = 6
+METER_SPACING = 4
 
 
 class RecordingOverlay(QWidget):
     """
-    Un widget overlay plein écran, mais entièrement transparent, dont le seul
-    rôle est de dessiner un petit indicateur circulaire rouge en haut à gauche.
+    Une petite fenêtre sans bordure, de la taille exacte de l'indicateur, qui
+    dessine un cercle rouge (et optionnellement un vumètre) en haut à gauche
+    de l'écran.
 
-    Cette approche est robuste car l'overlay capture tout l'écran, garantissant
-    qu'il peut dessiner par-dessus n'importe quelle autre application, tout en
-    étant configuré pour laisser passer tous les clics de souris et les
-    frappes de clavier.
+    La fenêtre ne couvre que son propre rectangle : le compositeur n'a plus à
+    mélanger une surface translucide plein écran pendant toute l'écoute. Elle
+    laisse passer les clics et ne prend jamais le focus.
+
+    Attributes:
+        show_level_meter (bool): Indique si le vumètre est affiché.
+        _level (float): Dernier niveau reçu, normalisé entre 0 et 1.
+        _painted_level (float): Niveau actuellement dessiné à l'écran.
+        _repaint_timer (QTimer): Minuterie qui plafonne la fréquence de rafraîchissement.
     """
 
-    def __init__(self):
-        """Initialise l'overlay d'enregistrement."""
+    def __init__(self, show_level_meter: bool = SHOW_LEVEL_METER):
+        """
+        Initialise l'overlay d'enregistrement.
+
+        Args:
+            show_level_meter (bool): Affiche le vumètre du niveau d'entrée.
+        """
         # Appel du constructeur de la classe parente
         super().__init__()
-        # Récupère la géométrie de l'écran principal (résolution, position)
-        screen_geometry = QScreen.availableGeometry(QApplication.primaryScreen())
-        # Définit la géométrie du widget pour qu'elle corresponde à celle de l'écran
-        self.setGeometry(screen_geometry)
+        self.show_level_meter = show_level_meter
+        self._level = 0.0
+        self._painted_level = 0.0
+
+        # La fenêtre a exactement la taille de ce qu'elle dessine
+        width = INDICATOR_SIZE + (METER_SPACING + METER_WIDTH if show_level_meter else 0)
+        self.setFixedSize(width, INDICATOR_SIZE)
+        # Zone du vumètre : seule cette zone est redessinée quand le niveau change
+        self._meter_rect = QRect(INDICATOR_SIZE + METER_SPACING, 0, METER_WIDTH, INDICATOR_SIZE)
 
-        # Configuration des "flags" de la fenêtre. C'est l'étape la plus critique.
+        # Configuration des "flags" de la fenêtre.
         self.setWindowFlags(
             # `SplashScreen` est un type de fenêtre conçu pour être au-dessus de tout.
             Qt.WindowType.SplashScreen |
@@ -45,24 +65,86 @@ class RecordingOverlay(QWidget):
             # Rend la fenêtre complètement transparente aux événements de la souris et du clavier.
             Qt.WindowType.WindowTransparentForInput
         )
-        # Attributs supplémentaires pour la transparence et le comportement.
-        # Active le fond transparent.
+        # Fond transparent autour du cercle (limité à quelques pixels).
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         # Empêche la fenêtre de prendre le focus lorsqu'elle est affichée.
         self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
 
+        # Les niveaux reçus sont seulement mémorisés ; le dessin est cadencé par cette minuterie.
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setInterval(max(1, 1000 // LEVEL_METER_MAX_FPS))
+        self._repaint_timer.timeout.connect(self._flush_level)
+
+        self.place_on_screen()
+
+    def place_on_screen(self, x: int = None, y: int = None) -> None:
+        """
+        Positionne l'indicateur en haut à gauche de l'écran contenant le point (x, y).
+
+        Args:
+            x (int, optional): Abscisse d'un point de référence (ex: la cible).
+            y (int, optional): Ordonnée d'un point de référence.
+                               Sans point, ou si aucun écran ne le contient,
+                               l'écran principal est utilisé.
+        """
+        screen = None
+        if x is not None and y is not None:
+            screen = QApplication.screenAt(QPoint(x, y))
+        if screen is None:
+            screen = QApplication.primaryScreen()
+        geometry = screen.availableGeometry()
+        self.move(geometry.x() + INDICATOR_MARGIN, geometry.y() + INDICATOR_MARGIN)
+
+    def set_level(self, level: int) -> None:
+        """
+        Slot recevant le niveau d'entrée (RMS) du microphone.
+
+        Args:
+            level (int): Niveau RMS décimé, émis par le thread de reconnaissance.
+        """
+        self._level = min(level / LEVEL_METER_FULL_SCALE, 1.0)
+
+    def _flush_level(self) -> None:
+        """Demande le redessin du vumètre seul, et seulement si le niveau affiché a changé."""
+        if self._level != self._painted_level:
+            self.update(self._meter_rect)
+
+    def showEvent(self, event) -> None:
+        """Démarre le rafraîchissement du vumètre à l'affichage."""
+        if self.show_level_meter:
+            self._repaint_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        """Arrête le rafraîchissement et remet le vumètre à zéro quand l'overlay est masqué."""
+        self._repaint_timer.stop()
+        self._level = 0.0
+        self._painted_level = 0.0
+        super().hideEvent(event)
+
     def paintEvent(self, event) -> None:
         """
         Méthode appelée automatiquement chaque fois que le widget a besoin d'être redessiné.
+        Seules les parties comprises dans la zone à redessiner sont peintes.
         """
         # Crée un objet QPainter pour dessiner sur ce widget
         painter = QPainter(self)
         # Active l'antialiasing pour avoir un cercle aux bords lisses
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        # Définit la couleur de remplissage à rouge
-        painter.setBrush(QColor("red"))
         # Indique qu'il ne faut pas dessiner de contour
         painter.setPen(Qt.PenStyle.NoPen)
-        # Dessine une ellipse (un cercle) dans le coin supérieur gauche,
-        # en utilisant les constantes de taille et de marge.
-        painter.drawEllipse(INDICATOR_MARGIN, INDICATOR_MARGIN, INDICATOR_SIZE, INDICATOR_SIZE)
\ No newline at end of file
+
+        if event.rect().intersects(QRect(0, 0, INDICATOR_SIZE, INDICATOR_SIZE)):
+            # Dessine le cercle rouge qui remplit la partie gauche de la fenêtre
+            painter.setBrush(QColor("red"))
+            painter.drawEllipse(0, 0, INDICATOR_SIZE, INDICATOR_SIZE)
+
+        if self.show_level_meter and event.rect().intersects(self._meter_rect):
+            # Fond du vumètre, puis barre remplie depuis le bas selon le niveau
+            painter.setBrush(QColor(0, 0, 0, 120))
+            painter.drawRect(self._meter_rect)
+            filled = round(self._meter_rect.height() * self._level)
+            painter.setBrush(QColor("red"))
+            painter.drawRect(self._meter_rect.x(), self._meter_rect.bottom() + 1 - filled,
+                             self._meter_rect.width(), filled)
+            self._painted_level = self._level
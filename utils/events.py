@@ -0,0 +1,120 @@
+# utils/events.py
+"""
+Ce module définit les événements typés publiés par les threads de travail
+et le bus qui les achemine vers le thread principal de l'interface.
+
+Contrairement aux messages de statut textuels, un événement porte un état
+(énumération) et une charge utile explicites. Le bus fusionne les mises à
+jour redondantes et limite leur livraison à l'UI à une image par budget de
+rafraîchissement.
+"""
+# Importations nécessaires
+import threading  # Pour protéger la file d'événements partagée entre threads
+import time  # Pour mesurer le budget de rafraîchissement
+from enum import Enum  # Pour les états typés
+from typing import Any, Dict, NamedTuple  # Pour l'annotation de type
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal  # Signaux et minuterie Qt
+from constants import UI_FRAME_BUDGET_MS
+
+
+class WorkerState(Enum):
+    """États successifs d'un thread de reconnaissance. La valeur est le libellé affiché."""
+    CALIBRATING = "Calibration audio..."
+    LISTENING = "En écoute..."
+    RECOGNIZING = "Reconnaissance en cours..."
+    STOPPED = "Écoute arrêtée."
+    ERROR = "Erreur"
+
+
+class StateChanged(NamedTuple):
+    """Le thread est passé dans un nouvel état. `detail` précise une erreur, par exemple."""
+    state: WorkerState
+    detail: str = ""
+
+
+class LevelChanged(NamedTuple):
+    """Nouveau niveau d'entrée (RMS) du microphone, déjà décimé."""
+    level: int
+
+
+class EventBus(QObject):
+    """
+    Bus d'événements typés entre un thread de travail et l'interface.
+
+    `publish` peut être appelé depuis n'importe quel thread. Seul le dernier
+    événement de chaque type est conservé jusqu'à la prochaine livraison, et
+    un événement identique au précédent de même type est ignoré. Les
+    événements sont livrés sur le thread de l'interface via le signal `event`,
+    au plus une fois par `frame_budget_ms`.
+
+    L'objet doit être créé sur le thread de l'interface (par exemple dans le
+    constructeur du thread de travail) pour que la livraison s'y fasse.
+    """
+    # Signal émis sur le thread de l'interface pour chaque événement livré.
+    event = pyqtSignal(object)
+
+    # Signal interne : réveille le thread de l'interface quand la file devient non vide.
+    _wake = pyqtSignal()
+
+    def __init__(self, frame_budget_ms: int = UI_FRAME_BUDGET_MS):
+        """
+        Initialise le bus.
+
+        Args:
+            frame_budget_ms (int): Intervalle minimal (en ms) entre deux livraisons.
+        """
+        super().__init__()
+        self.frame_budget_ms = frame_budget_ms
+        self._lock = threading.Lock()
+        # Événements en attente, un seul par type (le plus récent)
+        self._pending: Dict[type, Any] = {}
+        # Dernier événement publié par type, pour ignorer les répétitions à la source
+        self._last_published: Dict[type, Any] = {}
+        # Dernier événement livré par type (utilisé uniquement sur le thread de l'UI)
+        self._last_delivered: Dict[type, Any] = {}
+        self._last_flush = 0.0
+        self._flush_scheduled = False
+        # Connexion inter-threads : le slot s'exécute sur le thread de l'interface
+        self._wake.connect(self._schedule_flush)
+
+    def publish(self, event) -> None:
+        """
+        Publie un événement. Appelable depuis n'importe quel thread.
+
+        Args:
+            event: Un événement typé (`StateChanged`, `LevelChanged`...).
+        """
+        key = type(event)
+        with self._lock:
+            if self._last_published.get(key) == event:
+                return
+            self._last_published[key] = event
+            wake = not self._pending
+            # Retire puis réinsère pour conserver l'ordre de la dernière publication
+            self._pending.pop(key, None)
+            self._pending[key] = event
+        if wake:
+            self._wake.emit()
+
+    def _schedule_flush(self) -> None:
+        """Planifie la prochaine livraison en respectant le budget de rafraîchissement."""
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        elapsed_ms = (time.monotonic() - self._last_flush) * 1000
+        delay_ms = max(0, int(self.frame_budget_ms - elapsed_ms))
+        QTimer.singleShot(delay_ms, self._flush)
+
+    def _flush(self) -> None:
+        """Livre les événements en attente qui diffèrent de ceux déjà livrés."""
+        with self._lock:
+            events = list(self._pending.values())
+            self._pending.clear()
+        self._flush_scheduled = False
+        self._last_flush = time.monotonic()
+        for event in events:
+            key = type(event)
+            if self._last_delivered.get(key) == event:
+                continue
+            self._last_delivered[key] = event
+            self.event.emit(event)
@@ -19,14 +19,18 @@ class WorkerSignals(QObject):
     cette classe est généralement créée dans chaque thread travailleur.
     """
     # Signal émis lorsqu'une phrase a été reconnue avec succès.
-    # Le `str` indique que le signal transportera une chaîne de caractères.
-    recognized_text = pyqtSignal(str)
+    # Transporte le texte reconnu et l'`Utterance` correspondante (audio, latence...).
+    recognized_text = pyqtSignal(str, object)
+
+    # Signal émis par le VoiceRecognizerThread à la toute fin de son exécution,
+    # après son dernier `recognized_text` (l'enregistreur de session peut être fermé).
+    recognition_finished = pyqtSignal()
 
     # Signal émis lorsqu'une erreur non bloquante se produit.
     error_occurred = pyqtSignal(str)
 
-    # Signal pour envoyer des messages de statut à afficher dans l'UI.
-    status_message = pyqtSignal(str)
+    # Les changements d'état et le niveau audio du thread de reconnaissance ne
+    # passent pas par ces signaux mais par un `EventBus` (voir utils/events.py).
 
     # Signal émis après qu'un utilisateur a cliqué pour définir une cible.
     # Transporte les coordonnées X et Y du clic.
@@ -40,4 +44,20 @@ class WorkerSignals(QObject):
 
     # Signal émis par le CalibrationThread lorsque le calibrage est terminé.
     # Transporte la valeur de sensibilité (seuil d'énergie) calculée.
-    calibration_complete = pyqtSignal(int)
\ No newline at end of file
+    calibration_complete = pyqtSignal(int)
+
+    # Signal émis par le MicrophoneProbeThread à la fin du sondage des micros.
+    # Transporte la liste des profils (`DeviceProfile`) mesurés.
+    microphones_probed = pyqtSignal(list)
+
+    # Signal émis par le MicrophoneWatcherThread quand la liste des micros change
+    # (branchement ou débranchement). Transporte la liste des périphériques (`PyAudioDevice`).
+    microphones_changed = pyqtSignal(list)
+
+    # Signal émis par le ProfilerSocketThread lorsqu'un client demande un profilage.
+    # Transporte la durée demandée (secondes) et la file où l'UI dépose ses réponses.
+    profile_requested = pyqtSignal(float, object)
+
+    # Signal émis par le ProfilerThread une fois le profil écrit.
+    # Transporte le dossier contenant les fichiers.
+    profile_complete = pyqtSignal(str)